@@ -1,8 +1,14 @@
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt #type:ignore
 import seaborn as sns #type:ignore
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'DataIO'))
+from ingest import read_dataset  # noqa: E402
+
 def main():
     # Creating Data Structures
 
@@ -77,7 +83,7 @@ def main():
 
     # Reading from CSV file
     print("Reading from CSV file:")
-    csv_df = pd.read_csv('/home/gilbert/MyCodes/DataScience data/Spotify2024.csv', encoding='latin1')
+    csv_df = read_dataset('/home/gilbert/MyCodes/DataScience data/Spotify2024.csv', 'spotify', report=True)
     print(csv_df)
     print()
 
@@ -1,8 +1,14 @@
+import os
+import sys
+
 import numpy as np
 import scipy as sp
 from scipy import stats, optimize, integrate, interpolate, linalg
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'EDA'))
+from mode_estimation import discrete_mode  # noqa: E402
+
 # Set the backend to a non-interactive one
 plt.switch_backend('Agg')
 
@@ -10,7 +16,7 @@ plt.switch_backend('Agg')
 data = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
 print("Mean:", np.mean(data))
 print("Median:", np.median(data))
-print("Mode:", stats.mode(data))
+print("Mode:", discrete_mode(data))  # hash count, no sort
 print("Standard Deviation:", np.std(data))
 print("Variance:", np.var(data))
 print("Skewness:", stats.skew(data))
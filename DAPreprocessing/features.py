@@ -0,0 +1,116 @@
+import numpy as np
+
+# Fused per-column kernel for Steps 2, 4, 5, 6 and 8 of preprocess.py.
+# A numeric column is filled, scaled and outlier-replaced in a single pass
+# into a preallocated output, and the same pass can emit log(value + 1) and
+# the int8 bin codes behind pd.cut's categorical, so no intermediate Series
+# is built per step.
+#
+# The fastest installed backend is used: a numba-compiled loop, then
+# numexpr, then plain numpy writing into the same out= buffers. numba and
+# numexpr are optional (requirements-optional.txt); tests/test_features.py
+# checks every installed backend against the numpy one.
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+BACKEND = 'numba' if numba is not None else 'numexpr' if numexpr is not None else 'numpy'
+BACKENDS = [name for name, module in (('numba', numba), ('numexpr', numexpr)) if module is not None] + ['numpy']
+
+# Expressions evaluated by the numexpr backend (x != x is true for NaN)
+VALUE_EXPR = '(where(x != x, fill, x) - shift) / scale'
+REPLACE_EXPR = 'where(abs(v - z_mean) / z_std > threshold, replacement, v)'
+LOG_EXPR = 'log(v + 1)'
+
+
+def bin_codes(values, bins, out=None):
+    # Codes pd.cut(values, bins) would give: k when bins[k] < x <= bins[k + 1],
+    # -1 for missing values and values outside the bins
+    codes = np.searchsorted(bins, values, side='left') - 1
+    codes[(codes >= len(bins) - 1) | np.isnan(values)] = -1
+    if out is None:
+        out = np.empty(len(codes), dtype='int8')
+    out[:] = codes
+    return out
+
+
+if numba is not None:
+    @numba.njit(cache=True, nogil=True)
+    def _fused_loop(x, fill, shift, scale, replace, z_mean, z_std, threshold, replacement,
+                    bins, out, log_out, codes_out):
+        n_bins = len(bins)
+        for i in range(len(x)):
+            v = x[i]
+            if v != v:
+                v = fill
+            v = (v - shift) / scale
+            if replace and abs(v - z_mean) / z_std > threshold:
+                v = replacement
+            out[i] = v
+            if len(log_out):
+                log_out[i] = np.log(v + 1)
+            if len(codes_out):
+                code = -1
+                for k in range(n_bins - 1):
+                    if bins[k] < v <= bins[k + 1]:
+                        code = k
+                        break
+                codes_out[i] = code
+
+
+def fused_column(x, fill=np.nan, shift=0.0, scale=1.0, outliers=None, log=False, bins=None, backend=None):
+    # Missing values become fill, then (value - shift) / scale. outliers is
+    # (z_mean, z_std, threshold, replacement): values whose z-score exceeds
+    # threshold are replaced. Returns (values, log values or None, int8 bin
+    # codes or None). backend overrides BACKEND (one of BACKENDS).
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend {backend!r} is not available (installed: {BACKENDS})")
+    x = np.ascontiguousarray(x, dtype='float64')
+    n = len(x)
+    out = np.empty(n, dtype='float64')
+    log_out = np.empty(n, dtype='float64') if log else None
+    codes_out = np.empty(n, dtype='int8') if bins is not None else None
+    bins = np.asarray(bins if bins is not None else [], dtype='float64')
+
+    if backend == 'numba':
+        z_mean, z_std, threshold, replacement = outliers or (0.0, 1.0, np.inf, 0.0)
+        _fused_loop(x, float(fill), float(shift), float(scale), outliers is not None,
+                    float(z_mean), float(z_std), float(threshold), float(replacement), bins, out,
+                    log_out if log else np.empty(0), codes_out if codes_out is not None else np.empty(0, dtype='int8'))
+        return out, log_out, codes_out
+
+    if backend == 'numexpr':
+        numexpr.evaluate(VALUE_EXPR, local_dict={'x': x, 'fill': fill, 'shift': shift, 'scale': scale}, out=out)
+        if outliers is not None:
+            z_mean, z_std, threshold, replacement = outliers
+            numexpr.evaluate(REPLACE_EXPR, local_dict={'v': out, 'z_mean': z_mean, 'z_std': z_std,
+                                                       'threshold': threshold, 'replacement': replacement}, out=out)
+        if log:
+            numexpr.evaluate(LOG_EXPR, local_dict={'v': out}, out=log_out)
+    else:
+        np.copyto(out, x)
+        out[np.isnan(x)] = fill
+        out -= shift
+        out /= scale
+        if outliers is not None:
+            z_mean, z_std, threshold, replacement = outliers
+            z_scores = np.subtract(out, z_mean, out=np.empty(n))
+            np.abs(z_scores, out=z_scores)
+            z_scores /= z_std
+            out[z_scores > threshold] = replacement
+        if log:
+            np.add(out, 1, out=log_out)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                np.log(log_out, out=log_out)
+
+    if codes_out is not None:
+        bin_codes(out, bins, out=codes_out)
+    return out, log_out, codes_out
@@ -0,0 +1,118 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataCleaning'))
+from streaming_stats import RunningMoments  # noqa: E402
+
+# Out-of-core versions of Step 3 (get_dummies) and Step 4 (StandardScaler).
+# Both learn from a stream of chunks with partial_fit() and then transform
+# chunk by chunk, so memory is bounded by the chunk size.
+
+
+class IncrementalStandardScaler:
+    # Same result as StandardScaler().fit(all_rows): population std, and
+    # columns with zero variance are left unscaled
+
+    def __init__(self, dtype='float64'):
+        self.dtype = dtype
+        self.moments = RunningMoments()
+
+    def partial_fit(self, values):
+        self.moments.update(np.asarray(values, dtype='float64'))
+        return self
+
+    @property
+    def mean_(self):
+        return np.atleast_1d(self.moments.mean)
+
+    @property
+    def scale_(self):
+        std = np.atleast_1d(self.moments.std())
+        return np.where(std > 0, std, 1.0)
+
+    @property
+    def n_samples_seen_(self):
+        return self.moments.count
+
+    def transform(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+        return ((values - self.mean_.astype(self.dtype)) / self.scale_.astype(self.dtype)).astype(self.dtype, copy=False)
+
+
+def category_label(value):
+    # String form of a category. Whole numbers are written without a decimal
+    # part, so 1, 1.0 and np.int8(1) (the same value read as int in one chunk
+    # and float in another) are one category.
+    if isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_)):
+        if float(value).is_integer():
+            return str(int(value))
+    return str(value)
+
+
+class IncrementalOneHotEncoder:
+    # Learns each column's categories from a stream, then encodes chunks as
+    # a uint8 matrix (scipy.sparse CSR by default) instead of the dense
+    # bool columns pd.get_dummies builds. Categories are sorted like
+    # get_dummies and stored as strings (category_label), so chunks read as
+    # int, float, str or category all encode the same way; unseen values
+    # encode as all zeros.
+
+    def __init__(self, columns, drop_first=False):
+        self.columns = list(columns)
+        self.drop_first = drop_first
+        self.seen_ = {column: set() for column in self.columns}
+        self.categories_ = None
+
+    def partial_fit(self, df):
+        for column in self.columns:
+            self.seen_[column].update(pd.unique(df[column].dropna()))
+        self.categories_ = None
+        return self
+
+    def learned_categories(self):
+        if self.categories_ is None:
+            self.categories_ = {}
+            for column, values in self.seen_.items():
+                try:
+                    values = sorted(values)
+                except TypeError:
+                    values = sorted(values, key=str)
+                self.categories_[column] = list(dict.fromkeys(category_label(value) for value in values))
+        return self.categories_
+
+    def feature_names_out(self):
+        names = []
+        for column, categories in self.learned_categories().items():
+            kept = categories[1:] if self.drop_first else categories
+            names.extend(f'{column}_{category}' for category in kept)
+        return names
+
+    def codes(self, series, categories):
+        # Position of each value in categories; -1 for missing or unseen.
+        # Only the distinct values are converted to strings.
+        codes, uniques = pd.factorize(series)
+        lookup = pd.Index(categories).get_indexer([category_label(value) for value in uniques])
+        return np.where(codes >= 0, lookup[codes], -1) if len(uniques) else codes.astype('int64')
+
+    def transform(self, df, dense=False):
+        blocks = []
+        for column, categories in self.learned_categories().items():
+            codes = self.codes(df[column], categories)
+            if self.drop_first:
+                codes = codes - 1
+                width = len(categories) - 1
+            else:
+                width = len(categories)
+            rows = np.flatnonzero(codes >= 0)
+            block = sparse.csr_matrix(
+                (np.ones(len(rows), dtype='uint8'), (rows, codes[rows])),
+                shape=(len(df), max(width, 0)),
+                dtype='uint8',
+            )
+            blocks.append(block)
+        matrix = sparse.hstack(blocks, format='csr', dtype='uint8')
+        return matrix.toarray() if dense else matrix
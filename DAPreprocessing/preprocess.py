@@ -1,107 +1,132 @@
-import pandas as pd
-import numpy as np
-from scipy import stats
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-
-# Step 1: Loading the Dataset
-file_path = '/home/gilbert/MyCodes/DataScience data/diabetes.csv'  # Replace with actual path
-df = pd.read_csv(file_path)
-
-# Display the first few rows of the dataset
-print("Step 1: Loading the Dataset")
-print(df.head())
-print()
-
-# Step 2: Handling Missing Data
-print("Step 2: Handling Missing Data")
-print("Before handling missing data:")
-print(df.isnull().sum())
-
-# Impute missing values (e.g., using mean or median)
-df['BMI'] = df['BMI'].fillna(df['BMI'].median())
-df['Glucose'] = df['Glucose'].fillna(df['Glucose'].mean())
-
-print("After handling missing data:")
-print(df.isnull().sum())
-print()
-
-# Step 3: Handling Categorical Data
-print("Step 3: Handling Categorical Data")
-print("Before handling categorical data:")
-print(df.head())
-
-# Convert categorical variable into dummy/indicator variables
-df = pd.get_dummies(df, columns=['Outcome'], drop_first=True)
-
-print("After handling categorical data:")
-print(df.head())
-print()
-
-# Step 4: Data Scaling and Normalization
-print("Step 4: Data Scaling and Normalization")
-print("Before scaling and normalization:")
-print(df.head())
-
-# Example: Standardization (Z-score normalization)
-scaler = StandardScaler()
-scaled_data = scaler.fit_transform(df[['Pregnancies', 'Glucose', 'BloodPressure']])
-df[['Pregnancies', 'Glucose', 'BloodPressure']] = scaled_data
-
-print("After scaling and normalization:")
-print(df.head())
-print()
+import os
+import sys
 
-# Step 5: Handling Outliers
-print("Step 5: Handling Outliers")
-print("Before handling outliers:")
-print(df.describe())
-
-# Detect outliers using Z-score
-z_scores = np.abs(stats.zscore(df['BMI']))
-outliers = (z_scores > 3)
-df.loc[outliers, 'BMI'] = df['BMI'].median()
-
-print("After handling outliers:")
-print(df.describe())
-print()
-
-# Step 6: Feature Engineering
-print("Step 6: Feature Engineering")
-print("Before feature engineering:")
-print(df.head())
-
-# Example: Creating new feature (e.g., BMI category)
-df['BMI_category'] = pd.cut(df['BMI'], bins=[0, 18.5, 24.9, 29.9, 100], labels=['Underweight', 'Normal', 'Overweight', 'Obese'])
-
-print("After feature engineering:")
-print(df.head())
-print()
-
-# Step 7: Splitting the Dataset
-print("Step 7: Splitting the Dataset")
-
-X = df.drop('Outcome_1', axis=1)  # Features
-y = df['Outcome_1']  # Target variable
-
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-print("X_train shape:", X_train.shape)
-print("X_test shape:", X_test.shape)
-print()
-
-# Step 8: Data Integration and Transformation
-print("Step 8: Data Integration and Transformation")
-print("Before data integration and transformation:")
-print(df.head())
-
-# Ensure all values are positive and non-zero before log transformation
-df['Glucose_log'] = np.log(df['Glucose'] + 1)  # Adding 1 to avoid log(0)
+import pandas as pd
 
-print("After data integration and transformation:")
-print(df.head())
-print()
+from preprocessing_pipeline import DiabetesPreprocessor
+from splitting import feature_columns, split_chunks, train_test_indices
 
-# Optionally, you can save the preprocessed data to a new CSV file
-df.to_csv('/home/gilbert/MyCodes/DataScience data/processed_diabetes.csv', index=False)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from cache import ChunkWriter, cache_key, cache_path, format_of, publish, write_frame, read_frame  # noqa: E402
+from ingest import read_dataset, read_options  # noqa: E402
 
+file_path = '/home/gilbert/MyCodes/DataScience data/diabetes.csv'  # Replace with actual path
+# .parquet, .feather or .csv
+output_path = '/home/gilbert/MyCodes/DataScience data/processed_diabetes.parquet'
+# Fitted parameters, reused by transform() on new scoring batches
+params_path = '/home/gilbert/MyCodes/DataScience data/diabetes_preprocessor.json'
+
+# Set to a number of rows (e.g. 1_000_000) to fit and transform the file chunk
+# by chunk: one pass learns the parameters, a second writes the output.
+chunk_size = None
+
+# Step 7: share of rows held out of fitting. The in-memory split is
+# stratified on Outcome with random_state; the chunked split hashes each row,
+# so it is stable across runs and chunk sizes without loading the file.
+test_size = 0.2
+random_state = 42
+
+# Print head()/describe() before and after the steps
+verbose = False
+
+
+def process_in_chunks(preprocessor, cached_output):
+    def chunks():
+        return pd.read_csv(file_path, chunksize=chunk_size, **read_options('diabetes', chunked=True))
+
+    # Step 7: fit on the rows the hash assigns to the training split
+    counts = {'train': 0, 'test': 0}
+
+    def train_chunks():
+        for chunk, test_mask in split_chunks(chunks(), test_size, seed=random_state):
+            counts['test'] += int(test_mask.sum())
+            counts['train'] += len(chunk) - int(test_mask.sum())
+            yield chunk[~test_mask]
+
+    preprocessor.fit_chunks(train_chunks())
+    print(f"Fitted on {counts['train']} training rows ({counts['test']} test rows held out)")
+    preprocessor.save(params_path)
+    print(f"Fitted parameters saved to {params_path}")
+
+    root, ext = os.path.splitext(cached_output)
+    partial = root + '.partial' + ext
+    writer = ChunkWriter(partial)
+    for chunk in chunks():
+        writer.write(preprocessor.transform(chunk))
+    writer.close()
+    os.replace(partial, cached_output)
+
+
+def main():
+    preprocessor = DiabetesPreprocessor()
+
+    if chunk_size:
+        # Steps 2-6 and 8 over a file that does not fit in memory
+        print(f"Preprocessing {file_path} in chunks of {chunk_size} rows")
+        config = {'preprocessor': preprocessor.config(), 'chunked': True, 'test_size': test_size, 'seed': random_state}
+        options = read_options('diabetes', chunked=True)
+        cached_output = cache_path(cache_key(file_path, config, 'diabetes', options), format_of(output_path))
+        os.makedirs(os.path.dirname(cached_output), exist_ok=True)
+        if os.path.exists(cached_output) and os.path.exists(params_path):
+            print(f"Input unchanged, reusing {cached_output}")
+        else:
+            process_in_chunks(preprocessor, cached_output)
+        publish(cached_output, output_path)
+        print(f"Output: {output_path}")
+        return
+
+    # Step 1: Loading the Dataset
+    print("Step 1: Loading the Dataset")
+    df = read_dataset(file_path, 'diabetes', report=True)
+    if verbose:
+        print(df.head())
+        print()
+        print("Missing values:")
+        print(df.isnull().sum())
+        print()
+
+    # Step 7: Splitting the Dataset
+    # The split comes first so the parameters below are learned from the
+    # training rows only and never see the test rows. Only row positions are
+    # kept, so no X/y copies of the frame are made.
+    print("Step 7: Splitting the Dataset")
+    train_idx, test_idx = train_test_indices(len(df), test_size, random_state, stratify=df['Outcome'])
+
+    # Steps 2-6 and 8: impute, encode, scale, handle outliers and add features.
+    # fit() learns the BMI median, Glucose mean, scaler moments and BMI
+    # outlier bounds once; transform() applies them in one pass.
+    config = {'preprocessor': preprocessor.config(), 'test_size': test_size, 'random_state': random_state,
+              'stratify': 'Outcome'}
+    cached_output = cache_path(cache_key(file_path, config, 'diabetes', read_options('diabetes')),
+                               format_of(output_path))
+
+    if os.path.exists(cached_output) and os.path.exists(params_path):
+        print(f"Input unchanged, reusing {cached_output}")
+        processed = read_frame(cached_output)
+    else:
+        preprocessor.fit(df.iloc[train_idx])
+        preprocessor.save(params_path)
+        print(f"Fitted parameters saved to {params_path}")
+        processed = preprocessor.transform(df)
+        os.makedirs(os.path.dirname(cached_output), exist_ok=True)
+        write_frame(processed, cached_output)
+
+    n_features = len(feature_columns(processed, 'Outcome_1'))
+    print("X_train shape:", (len(train_idx), n_features))
+    print("X_test shape:", (len(test_idx), n_features))
+    print()
+
+    if verbose:
+        print("After preprocessing:")
+        print(processed.head())
+        print()
+        print(processed.describe())
+        print()
+
+    # Save the preprocessed data
+    publish(cached_output, output_path)
+    print(f"Output: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from features import fused_column
+from incremental import IncrementalOneHotEncoder
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataCleaning'))
+from streaming_stats import RunningMoments, ValueCounts  # noqa: E402
+
+# Fit/transform version of the steps in preprocess.py. fit() learns every
+# parameter once (fill values, scaler moments, BMI outlier bounds); transform()
+# applies them to any batch with one fused pass per column (features.py), so
+# scoring new rows never refits on the full history. fit_chunks() learns the same parameters
+# from a stream of chunks in one bounded-memory pass.
+
+SCALE_COLUMNS = ['Pregnancies', 'Glucose', 'BloodPressure']
+BMI_BINS = [0, 18.5, 24.9, 29.9, 100]
+BMI_LABELS = ['Underweight', 'Normal', 'Overweight', 'Obese']
+
+
+def with_fill(moments, rows, value):
+    # Moments of a column after its missing values are replaced by value
+    missing = RunningMoments()
+    missing.count = rows - moments.count
+    missing.mean_ = value
+    return RunningMoments().merge(moments).merge(missing)
+
+
+class DiabetesPreprocessor:
+    def __init__(self, scale_columns=None, outlier_threshold=3.0, bmi_bins=None, bmi_labels=None):
+        self.scale_columns = list(scale_columns or SCALE_COLUMNS)
+        self.outlier_threshold = outlier_threshold
+        self.bmi_bins = list(bmi_bins or BMI_BINS)
+        self.bmi_labels = list(bmi_labels or BMI_LABELS)
+        self.params_ = None
+
+    def fit(self, df):
+        return self.fit_chunks([df])
+
+    def fit_chunks(self, chunks):
+        rows = 0
+        bmi_counts = ValueCounts()
+        moments = {column: RunningMoments() for column in set(self.scale_columns) | {'BMI', 'Glucose'}}
+        encoder = IncrementalOneHotEncoder(['Outcome'], drop_first=True)
+        for chunk in chunks:
+            rows += len(chunk)
+            bmi_counts.update(chunk['BMI'].to_numpy(dtype='float64'))
+            for column, column_moments in moments.items():
+                column_moments.update(chunk[column].to_numpy(dtype='float64'))
+            if 'Outcome' in chunk.columns:
+                encoder.partial_fit(chunk)
+
+        # Step 2: fill values
+        fill = {'BMI': float(bmi_counts.median()), 'Glucose': float(moments['Glucose'].mean)}
+
+        # Moments after imputation: every missing value becomes the fill value
+        for column, value in fill.items():
+            moments[column] = with_fill(moments[column], rows, value)
+        bmi_counts.counts = bmi_counts.counts.add(pd.Series({fill['BMI']: rows - bmi_counts.counts.sum()}), fill_value=0)
+
+        # Step 4: StandardScaler moments (population std, as sklearn uses)
+        scale = {}
+        for column in self.scale_columns:
+            std = float(moments[column].std())
+            scale[column] = [float(moments[column].mean), std if std > 0 else 1.0]
+
+        # Step 5: Z-score bounds for BMI outliers and their replacement value
+        self.params_ = {
+            'fill': fill,
+            'scale': scale,
+            'bmi_mean': float(moments['BMI'].mean),
+            'bmi_std': float(moments['BMI'].std()) or 1.0,
+            'bmi_replacement': float(bmi_counts.median()),
+            # Step 3: category vocabulary for the one-hot columns
+            'categories': encoder.learned_categories(),
+        }
+        return self
+
+    def _check_fitted(self):
+        if self.params_ is None:
+            raise RuntimeError("DiabetesPreprocessor is not fitted yet; call fit() or load() first")
+
+    def transform(self, df):
+        self._check_fitted()
+        params = self.params_
+        columns = {}
+        derived = {}
+        for column in df.columns:
+            if column in params['categories']:
+                continue
+            if column not in params['fill'] and column not in params['scale'] and column != 'BMI':
+                columns[column] = df[column]
+                continue
+            # Fill, scale, outlier replacement and the derived feature of
+            # each column in one fused pass
+            mean, std = params['scale'].get(column, (0.0, 1.0))
+            outliers = None
+            if column == 'BMI':
+                outliers = (params['bmi_mean'], params['bmi_std'], self.outlier_threshold, params['bmi_replacement'])
+            values, log_values, codes = fused_column(
+                df[column].to_numpy(dtype='float64', na_value=np.nan),
+                fill=params['fill'].get(column, np.nan),
+                shift=mean,
+                scale=std,
+                outliers=outliers,
+                log=column == 'Glucose',
+                bins=self.bmi_bins if column == 'BMI' else None,
+            )
+            columns[column] = values
+            if codes is not None:
+                # Step 6: int8 codes wrapped as the categorical pd.cut builds
+                derived['BMI_category'] = pd.Categorical.from_codes(codes, categories=self.bmi_labels, ordered=True)
+            if log_values is not None:
+                # Step 8: log of the (scaled) Glucose column
+                derived['Glucose_log'] = log_values
+
+        # Step 3: uint8 one-hot columns from the learned vocabulary, named as
+        # get_dummies(drop_first=True) names them
+        encoded = [c for c in params['categories'] if c in df.columns]
+        if encoded:
+            encoder = IncrementalOneHotEncoder(encoded, drop_first=True)
+            encoder.categories_ = {c: params['categories'][c] for c in encoded}
+            matrix = encoder.transform(df, dense=True)
+            for j, name in enumerate(encoder.feature_names_out()):
+                columns[name] = matrix[:, j]
+
+        # Step 6 and Step 8: derived features, in the original column order
+        for name in ('BMI_category', 'Glucose_log'):
+            if name in derived:
+                columns[name] = derived[name]
+        return pd.DataFrame(columns, index=df.index)
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+    def config(self):
+        return {
+            'scale_columns': self.scale_columns,
+            'outlier_threshold': self.outlier_threshold,
+            'bmi_bins': self.bmi_bins,
+            'bmi_labels': self.bmi_labels,
+        }
+
+    def save(self, path):
+        self._check_fitted()
+        with open(path, 'w') as f:
+            json.dump({'config': self.config(), 'params': self.params_}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            state = json.load(f)
+        preprocessor = cls(**state['config'])
+        preprocessor.params_ = state['params']
+        return preprocessor
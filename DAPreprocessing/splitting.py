@@ -0,0 +1,51 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataCleaning'))
+from dedup import row_fingerprints  # noqa: E402
+
+# Step 7 without copying the data. Splits are returned as row positions (or
+# boolean masks), so X_train/X_test are only materialised when a model needs
+# them, instead of df.drop() plus train_test_split() each copying the frame.
+#
+# hash_split_mask() assigns each row to a split from a hash of its contents,
+# so a row lands in the same split on every run and in every chunking of the
+# file, and the split can be made while streaming.
+
+
+def train_test_indices(n_rows, test_size=0.2, random_state=None, stratify=None):
+    # Returns (train positions, test positions). stratify is an array of
+    # labels (e.g. df['Outcome']) whose class proportions both splits keep.
+    positions = np.arange(n_rows)
+    if stratify is not None:
+        stratify = np.asarray(stratify)
+    train_idx, test_idx = train_test_split(positions, test_size=test_size, random_state=random_state, stratify=stratify)
+    return np.sort(train_idx), np.sort(test_idx)
+
+
+def hash_split_mask(df, test_size=0.2, seed=0, key_columns=None):
+    # True for rows in the test split. The key is the row's content (or just
+    # key_columns, e.g. an id); every chunk must be read with the same dtypes
+    # for the hashes to agree. Because the hash ignores the label, each class
+    # is split in the same proportion on average (stratified in expectation).
+    fingerprints = row_fingerprints(df, key_columns)
+    mixed = pd.util.hash_array(fingerprints ^ np.uint64(seed))
+    # Top 53 bits as a uniform number in [0, 1)
+    uniform = (mixed >> np.uint64(11)).astype('float64') * 2.0 ** -53
+    return uniform < test_size
+
+
+def split_chunks(chunks, test_size=0.2, seed=0, key_columns=None):
+    # Yields (chunk, test mask) for a stream of chunks
+    for chunk in chunks:
+        yield chunk, hash_split_mask(chunk, test_size, seed, key_columns)
+
+
+def feature_columns(df, target):
+    # Column names of X; select with df.iloc[idx][names] only when needed
+    # rather than df.drop(target, axis=1), which copies every column
+    return df.columns.drop(target)
@@ -1,8 +1,14 @@
+import os
+import sys
+
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-# Load example dataset
-tips = sns.load_dataset('tips')
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from datasets import load_dataset  # noqa: E402
+
+# Load example dataset from the local registry (no network)
+tips = load_dataset('tips')
 
 # Exclude non-numeric columns for correlation calculation
 numeric_columns = tips.select_dtypes(include=['float64', 'int64'])
@@ -1,79 +1,88 @@
-import pandas as pd
-import numpy as np
+import os
+import sys
 
-# Step 1: Loading the Dataset
-file_path = '/home/gilbert/MyCodes/DataScience data/titanic.csv'  # Replace with actual path
-df = pd.read_csv(file_path)
-
-# Step 2: Inspecting the Data
-print("Step 2: Inspecting the Data")
-print(df.head())
-print()
-print(df.info())
-print()
-print(df.describe())
-print()
-
-# Step 3: Handling Missing Values
-print("Step 3: Handling Missing Values")
-
-# Check for missing values
-print("Missing values before handling:")
-print(df.isnull().sum())
-print()
-
-# Handling missing values
-# Fill missing Age values with median
-df['Age'] = df['Age'].fillna(df['Age'].median())
-
-# Fill missing Embarked values with the most frequent value (mode)
-df['Embarked'] = df['Embarked'].fillna(df['Embarked'].mode()[0])
-
-# Drop Cabin column due to a high number of missing values
-df = df.drop(columns=['Cabin'])
-
-# Check for missing values after handling
-print("Missing values after handling:")
-print(df.isnull().sum())
-print()
-
-# Step 4: Removing Duplicates
-print("Step 4: Removing Duplicates")
+from pipeline import Pipeline, impute, drop_columns, dedup, normalize_case
 
-# Check for duplicates
-print("Duplicates before removing:")
-print(df.duplicated().sum())
-print()
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from cache import cache_key, cache_path, format_of, publish, write_frame  # noqa: E402
+from ingest import SCHEMAS, read_dataset, read_options  # noqa: E402
 
-# Remove duplicates
-df = df.drop_duplicates()
-
-# Check for duplicates after removing
-print("Duplicates after removing:")
-print(df.duplicated().sum())
-print()
-
-# Step 5: Correcting Errors
-print("Step 5: Correcting Errors")
-
-# Check for unique values in categorical columns
-print("Unique values in Embarked column:")
-print(df['Embarked'].unique())
-print()
-
-# Correct any incorrect values if found (in this case, there are no incorrect values)
-
-# Step 6: Ensuring Consistency
-print("Step 6: Ensuring Consistency")
-
-# Convert all categorical columns to consistent format (e.g., title case)
-df['Name'] = df['Name'].str.title()
-df['Sex'] = df['Sex'].str.lower()
-df['Embarked'] = df['Embarked'].str.upper()
-
-print("Data after ensuring consistency:")
-print(df.head())
-print()
-
-# Optionally, you can save the cleaned data to a new CSV file
-df.to_csv('/home/gilbert/MyCodes/DataScience data/cleaned_titanic.csv', index=False)
+file_path = '/home/gilbert/MyCodes/DataScience data/titanic.csv'  # Replace with actual path
+# .parquet, .feather or .csv. Results are cached by input contents and
+# pipeline config, so rerunning on an unchanged file skips the cleaning.
+output_path = '/home/gilbert/MyCodes/DataScience data/cleaned_titanic.parquet'
+
+# Set to a number of rows (e.g. 100_000) to clean the file in streaming mode.
+# Peak memory then stays bounded by the chunk size instead of the file size.
+chunk_size = None
+
+# Streaming mode remembers one 64-bit fingerprint per row to find duplicates
+# across chunks. Point this at a file to keep them on disk instead of in RAM.
+dedup_store = ':memory:'
+# Streaming mode only: keep those fingerprints between runs, so a rerun
+# (e.g. on a file that was appended to) only writes rows not written before.
+# The output then depends on earlier runs, so the result cache is bypassed.
+persist_dedup = False
+
+# Print head()/info()/describe() between steps. Each of these scans the whole
+# frame, so keep it off for large files.
+verbose = False
+
+
+def titanic_pipeline(verbose=False):
+    return Pipeline([
+        # Step 3: Handling Missing Values
+        # Fill Age with the median and Embarked with the most frequent value,
+        # drop Cabin due to a high number of missing values
+        impute({'Age': 'median', 'Embarked': 'mode'}),
+        drop_columns(['Cabin']),
+        # Step 4: Removing Duplicates
+        dedup(),
+        # Step 6: Ensuring Consistency
+        normalize_case({'Name': 'title', 'Sex': 'lower', 'Embarked': 'upper'}),
+    ], verbose=verbose)
+
+
+def main():
+    pipeline = titanic_pipeline(verbose=verbose)
+    # Cabin is dropped anyway, so it is never read
+    columns = [c for c in SCHEMAS['titanic']['columns'] if c != 'Cabin']
+
+    config = {'pipeline': repr(pipeline.steps), 'columns': columns, 'chunked': bool(chunk_size),
+              'persist_dedup': persist_dedup}
+    options = read_options('titanic', columns, chunked=bool(chunk_size))
+    cached_output = cache_path(cache_key(file_path, config, 'titanic', options), format_of(output_path))
+    rows_written = None
+
+    if os.path.exists(cached_output) and not persist_dedup:
+        print(f"Input and pipeline unchanged, reusing {cached_output}")
+    elif chunk_size:
+        print(f"Cleaning {file_path} in chunks of {chunk_size} rows")
+        os.makedirs(os.path.dirname(cached_output), exist_ok=True)
+        # Write under a temporary name so an interrupted run is never reused
+        root, ext = os.path.splitext(cached_output)
+        partial = root + '.partial' + ext
+        rows_written = pipeline.run_chunked(file_path, partial, chunk_size, dedup_store=dedup_store,
+                                            persist_dedup=persist_dedup,
+                                            **options)
+        os.replace(partial, cached_output)
+    else:
+        # Step 1: Loading the Dataset
+        df = read_dataset(file_path, 'titanic', columns, report=True)
+        df = pipeline.run(df)
+        os.makedirs(os.path.dirname(cached_output), exist_ok=True)
+        write_frame(df, cached_output)
+        rows_written = len(df)
+
+    publish(cached_output, output_path)
+
+    for (_, column), value in pipeline.statistics_.items():
+        print(f"Filled missing {column} values with {value}")
+    if rows_written is not None:
+        print(f"Duplicates removed: {sum(pipeline.removed_.values())}")
+        print(f"Rows written: {rows_written}")
+    print(f"Output: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import sqlite3
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# Duplicate detection from one 64-bit fingerprint per row. Rows are hashed
+# once; the duplicate count and the rows to keep both come from that single
+# uint64 array instead of three duplicated()/drop_duplicates() passes.
+
+
+def row_fingerprints(df, subset=None):
+    if subset is not None:
+        df = df[subset]
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def duplicate_mask(fingerprints):
+    # True for every repeat of an earlier fingerprint (keep='first'),
+    # found with a hash table over the uint64 array
+    return pd.Series(fingerprints, copy=False).duplicated().to_numpy(copy=True)
+
+
+def drop_duplicates(df, subset=None):
+    # Returns (deduplicated frame, number of duplicates removed)
+    mask = duplicate_mask(row_fingerprints(df, subset))
+    return df[~mask], int(mask.sum())
+
+
+class FingerprintStore:
+    # Set of fingerprints seen so far, kept in SQLite so it can grow past RAM.
+    # Each store uses its own table in the file. By default the table is
+    # private to this store (a unique name, dropped on close), so stores for
+    # different runs or different dedup steps never see each other's rows.
+    # persist=True opens the named table as it is and keeps it on close, so
+    # rows seen by earlier runs count as duplicates. Use ':memory:' for a
+    # throwaway store.
+
+    def __init__(self, path=':memory:', table=None, persist=False):
+        if table is None:
+            if persist:
+                raise ValueError("A persistent store needs a table name")
+            table = 'seen_' + uuid.uuid4().hex
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}")
+        self.table = table
+        self.persist = persist
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            if not persist:
+                self.connection.execute(f'DROP TABLE IF EXISTS {table}')
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} (fp INTEGER PRIMARY KEY) WITHOUT ROWID')
+        self.connection.execute('CREATE TEMP TABLE batch (pos INTEGER PRIMARY KEY, fp INTEGER)')
+
+    def __len__(self):
+        return self.connection.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def add(self, fingerprints):
+        # Record a batch of fingerprints and return a mask of the ones that
+        # were already seen, either earlier in the batch or in the store.
+        mask = duplicate_mask(fingerprints)
+        # SQLite integers are signed 64-bit
+        signed = fingerprints.view('int64')
+        new_positions = np.flatnonzero(~mask)
+        with self.connection:
+            self.connection.execute('DELETE FROM batch')
+            self.connection.executemany(
+                'INSERT INTO batch VALUES (?, ?)',
+                zip(new_positions.tolist(), signed[new_positions].tolist()),
+            )
+            seen = [row[0] for row in self.connection.execute(
+                f'SELECT batch.pos FROM batch JOIN {self.table} AS seen ON seen.fp = batch.fp'
+            )]
+            self.connection.execute(f'INSERT OR IGNORE INTO {self.table} SELECT fp FROM batch')
+        mask[seen] = True
+        return mask
+
+    def close(self):
+        if not self.persist:
+            with self.connection:
+                self.connection.execute(f'DROP TABLE IF EXISTS {self.table}')
+        self.connection.close()
+
+
+def drop_duplicates_chunked(chunks, store=None, subset=None):
+    # Yields (chunk without duplicates, duplicates removed from it) for an
+    # iterable of DataFrames, comparing every row against all earlier chunks.
+    # A store passed in is left open for the caller; one created here is
+    # closed when the chunks run out.
+    owned = store is None
+    if owned:
+        store = FingerprintStore()
+    try:
+        for chunk in chunks:
+            mask = store.add(row_fingerprints(chunk, subset))
+            yield chunk[~mask], int(mask.sum())
+    finally:
+        if owned:
+            store.close()
@@ -0,0 +1,173 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# Per-column imputation engine. Every float column that has a strategy is
+# written into one shared (n_rows, n_columns) output buffer, one column per
+# task, so there is no intermediate copy of the frame per strategy.
+#
+# Strategies (the same ones shown in missing_data.py):
+#   'drop'              drop rows where this column is missing
+#   ('constant', value) fill with a fixed value
+#   'mean', 'median', 'mode'
+#   'ffill', 'bfill'
+#   'interpolate'       linear interpolation (ffill + bfill for text columns)
+
+STRATEGIES = ('drop', 'mean', 'median', 'mode', 'ffill', 'bfill', 'interpolate')
+
+
+def check_strategy(column, strategy):
+    if isinstance(strategy, tuple) and len(strategy) == 2 and strategy[0] == 'constant':
+        return
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown imputation strategy {strategy!r} for column {column!r}")
+
+
+def forward_fill_index(missing):
+    # Index of the last non-missing value at or before each position
+    idx = np.where(missing, 0, np.arange(len(missing)))
+    np.maximum.accumulate(idx, out=idx)
+    return idx
+
+
+def fill_float_column(x, out, strategy):
+    # Fill one float column x into out (a column view of the output buffer)
+    missing = np.isnan(x)
+    out[:] = x
+    if strategy == 'drop' or not missing.any():
+        return
+    if isinstance(strategy, tuple):
+        out[missing] = strategy[1]
+    elif strategy == 'mean':
+        out[missing] = np.nanmean(x)
+    elif strategy == 'median':
+        out[missing] = np.nanmedian(x)
+    elif strategy == 'mode':
+        values, counts = np.unique(x[~missing], return_counts=True)
+        if len(values):
+            out[missing] = values[np.argmax(counts)]
+    elif strategy == 'ffill':
+        np.take(x, forward_fill_index(missing), out=out)
+    elif strategy == 'bfill':
+        reversed_out = out[::-1]
+        np.take(x[::-1], forward_fill_index(missing[::-1]), out=reversed_out)
+    elif strategy == 'interpolate':
+        # Same as Series.interpolate(): leading gaps stay missing,
+        # trailing gaps take the last valid value
+        positions = np.flatnonzero(~missing)
+        if len(positions):
+            gaps = np.flatnonzero(missing)
+            gaps = gaps[gaps > positions[0]]
+            out[gaps] = np.interp(gaps, positions, x[positions])
+
+
+def fill_other_column(series, strategy):
+    # Non-float columns go through pandas; they cannot live in a float buffer
+    if strategy == 'drop':
+        return series
+    if isinstance(strategy, tuple):
+        return series.fillna(strategy[1])
+    if strategy == 'mean':
+        return series.fillna(series.mean())
+    if strategy == 'median':
+        return series.fillna(series.median())
+    if strategy == 'mode':
+        mode = series.mode()
+        return series.fillna(mode[0]) if len(mode) else series
+    if strategy == 'ffill':
+        return series.ffill()
+    if strategy == 'bfill':
+        return series.bfill()
+    if pd.api.types.is_numeric_dtype(series):
+        return series.interpolate()
+    return series.ffill().bfill()
+
+
+def _fill_shared(task):
+    # Worker for the process backend: attach to the shared input and output
+    # buffers by name and fill one column in place
+    in_name, out_name, shape, j, strategy = task
+    shm_in = shm_out = source = target = None
+    try:
+        shm_in = shared_memory.SharedMemory(name=in_name)
+        shm_out = shared_memory.SharedMemory(name=out_name)
+        source = np.ndarray(shape, dtype='float64', buffer=shm_in.buf, order='F')
+        target = np.ndarray(shape, dtype='float64', buffer=shm_out.buf, order='F')
+        fill_float_column(source[:, j], target[:, j], strategy)
+    finally:
+        # Views must go before close(), or it raises BufferError
+        source = target = None
+        for shm in (shm_in, shm_out):
+            if shm is not None:
+                shm.close()
+    return j
+
+
+def impute_columns(df, strategies, n_jobs=None, backend='thread'):
+    # Apply a per-column strategy map. Columns without a strategy are passed
+    # through untouched. backend is 'thread' (default, numpy releases the GIL
+    # in the fill kernels) or 'process' (shared-memory buffers).
+    if backend not in ('thread', 'process'):
+        raise ValueError(f"Unknown backend {backend!r}")
+    missing = set(strategies) - set(df.columns)
+    if missing:
+        raise KeyError(f"Columns not found: {sorted(missing)}")
+    for column, strategy in strategies.items():
+        check_strategy(column, strategy)
+
+    float_columns = [c for c in strategies if pd.api.types.is_float_dtype(df[c].dtype)]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    shape = (len(df), len(float_columns))
+
+    if float_columns and backend == 'process':
+        nbytes = max(shape[0] * shape[1] * 8, 1)
+        shm_in = shared_memory.SharedMemory(create=True, size=nbytes)
+        shm_out = shared_memory.SharedMemory(create=True, size=nbytes)
+        source = None
+        try:
+            source = np.ndarray(shape, dtype='float64', buffer=shm_in.buf, order='F')
+            for j, column in enumerate(float_columns):
+                source[:, j] = df[column].to_numpy(dtype='float64')
+            tasks = [(shm_in.name, shm_out.name, shape, j, strategies[c]) for j, c in enumerate(float_columns)]
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                list(pool.map(_fill_shared, tasks))
+            # One copy out of shared memory so the result outlives the segments
+            out = np.array(np.ndarray(shape, dtype='float64', buffer=shm_out.buf, order='F'), order='F')
+        finally:
+            # Release the view on error paths too, before close()
+            source = None
+            shm_in.close()
+            shm_in.unlink()
+            shm_out.close()
+            shm_out.unlink()
+    else:
+        out = np.empty(shape, dtype='float64', order='F')
+        if float_columns:
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                list(pool.map(
+                    lambda j: fill_float_column(df[float_columns[j]].to_numpy(dtype='float64'), out[:, j], strategies[float_columns[j]]),
+                    range(len(float_columns)),
+                ))
+
+    filled = {c: out[:, j] for j, c in enumerate(float_columns)}
+    other_columns = [c for c in strategies if c not in filled]
+    if other_columns:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            results = pool.map(lambda c: fill_other_column(df[c], strategies[c]), other_columns)
+            filled.update(zip(other_columns, results))
+
+    # pandas consolidates the float columns into one block here, so they are
+    # copied once out of the output buffer
+    result = pd.DataFrame(
+        {c: filled.get(c, df[c]) for c in df.columns},
+        index=df.index,
+        copy=False,
+    )
+
+    drop_columns = [c for c, s in strategies.items() if s == 'drop']
+    if drop_columns:
+        result = result[result[drop_columns].notna().all(axis=1)]
+    return result
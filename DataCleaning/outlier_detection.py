@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+from streaming_stats import QuantileSketch, RunningMoments
+
+# Outlier detectors. Each works on all columns at once and returns a boolean
+# mask shaped like the input (rows x columns); NaNs are never outliers.
+#
+#   zscore_mask            |x - mean| / std > threshold
+#   modified_zscore_mask   0.6745 |x - median| / MAD > threshold (robust)
+#   iqr_mask               outside [Q1 - k IQR, Q3 + k IQR]
+#
+# The Streaming* classes keep running statistics instead, so each new chunk
+# is scored without going back over earlier data.
+
+
+def as_array(values):
+    if isinstance(values, (pd.DataFrame, pd.Series)):
+        values = values.to_numpy(dtype='float64')
+    return np.asarray(values, dtype='float64')
+
+
+def divide(numerator, denominator):
+    # Constant columns (zero spread) have no outliers
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), 0.0)
+
+
+def zscore_scores(values):
+    # |z| of every value (NaN stays NaN), like abs(scipy.stats.zscore) with
+    # NaNs ignored in the mean and std
+    values = as_array(values)
+    return divide(np.abs(values - np.nanmean(values, axis=0)), np.nanstd(values, axis=0))
+
+
+def zscore_mask(values, threshold=3.0):
+    return zscore_scores(values) > threshold
+
+
+def modified_zscore_mask(values, threshold=3.5):
+    values = as_array(values)
+    deviation = np.abs(values - np.nanmedian(values, axis=0))
+    mad = np.nanmedian(deviation, axis=0)
+    return 0.6745 * divide(deviation, mad) > threshold
+
+
+def iqr_mask(values, k=1.5):
+    values = as_array(values)
+    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    return (values < q1 - k * iqr) | (values > q3 + k * iqr)
+
+
+DETECTORS = {
+    'zscore': zscore_mask,
+    'modified_zscore': modified_zscore_mask,
+    'iqr': iqr_mask,
+}
+
+
+def detect(df, method='zscore', columns=None, **params):
+    # Mask over the numeric columns (or the given ones) of a DataFrame
+    if method not in DETECTORS:
+        raise ValueError(f"Unknown outlier method {method!r}")
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns
+    return DETECTORS[method](df[columns], **params)
+
+
+def outlier_rows(mask):
+    # Positions of rows with an outlier in any column
+    return np.flatnonzero(np.asarray(mask).reshape(len(mask), -1).any(axis=1))
+
+
+def outlier_positions(mask):
+    # (row positions, column positions) of every flagged cell
+    return np.nonzero(np.asarray(mask).reshape(len(mask), -1))
+
+
+def outlier_cells(df, method='zscore', columns=None, **params):
+    # One row (Row, Column, Value) per flagged cell. The mask covers the
+    # numeric columns only, so its positions index that subset, not df.
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns
+    subset = df[columns]
+    rows, cols = outlier_positions(detect(subset, method, **params))
+    return pd.DataFrame({
+        'Row': subset.index[rows],
+        'Column': subset.columns[cols],
+        'Value': subset.to_numpy()[rows, cols],
+    })
+
+
+class StreamingZScoreDetector:
+    def __init__(self, threshold=3.0):
+        self.threshold = threshold
+        self.moments = RunningMoments()
+
+    def update(self, values):
+        # Fold the chunk into the running mean / std, then score it
+        values = as_array(values)
+        self.moments.update(values)
+        return divide(np.abs(values - self.moments.mean), self.moments.std()) > self.threshold
+
+
+class StreamingIQRDetector:
+    def __init__(self, k=1.5, sketch_size=200):
+        self.k = k
+        self.sketch_size = sketch_size
+        self.sketches = None
+
+    def _quantiles(self, values, q):
+        if self.sketches is None:
+            self.sketches = [QuantileSketch(self.sketch_size) for _ in range(values.shape[1])]
+        for sketch, column in zip(self.sketches, values.T):
+            sketch.update(column)
+        return np.array([sketch.quantile(q) for sketch in self.sketches]).T
+
+    def update(self, values):
+        values = as_array(values).reshape(len(values), -1)
+        q1, q3 = self._quantiles(values, [0.25, 0.75])
+        iqr = q3 - q1
+        return (values < q1 - self.k * iqr) | (values > q3 + self.k * iqr)
+
+
+class StreamingMADDetector:
+    # The MAD is tracked with a second sketch of deviations from the running
+    # median at the time each chunk arrived, so it is an approximation that
+    # settles once the median stabilises.
+
+    def __init__(self, threshold=3.5, sketch_size=200):
+        self.threshold = threshold
+        self.sketch_size = sketch_size
+        self.medians = None
+        self.deviations = None
+
+    def update(self, values):
+        values = as_array(values).reshape(len(values), -1)
+        if self.medians is None:
+            self.medians = [QuantileSketch(self.sketch_size) for _ in range(values.shape[1])]
+            self.deviations = [QuantileSketch(self.sketch_size) for _ in range(values.shape[1])]
+        median = np.empty(values.shape[1])
+        mad = np.empty(values.shape[1])
+        for j, column in enumerate(values.T):
+            median[j] = self.medians[j].update(column).median()
+            mad[j] = self.deviations[j].update(np.abs(column - median[j])).median()
+        return 0.6745 * divide(np.abs(values - median), mad) > self.threshold
+
+
+def box_stats(df, whis=1.5, columns=None):
+    # Box plot statistics for every numeric column from one quantile call.
+    # Returns one dict per column in the format matplotlib's Axes.bxp takes.
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns
+    values = as_array(df[columns])
+    q1, median, q3 = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+    iqr = q3 - q1
+    low, high = q1 - whis * iqr, q3 + whis * iqr
+    inside = (values >= low) & (values <= high)
+    whislo = np.nanmin(np.where(inside, values, np.nan), axis=0)
+    whishi = np.nanmax(np.where(inside, values, np.nan), axis=0)
+    outside = ~inside & ~np.isnan(values)
+    stats = []
+    for j, column in enumerate(columns):
+        stats.append({
+            'label': column,
+            'q1': q1[j],
+            'med': median[j],
+            'q3': q3[j],
+            'whislo': whislo[j],
+            'whishi': whishi[j],
+            'fliers': values[outside[:, j], j],
+        })
+    return stats
+
+
+def render_boxplot(stats, path, title=None, figsize=(8, 6)):
+    # Draw from precomputed box_stats() output instead of the raw data. The
+    # figure has its own Agg canvas, so the caller's pyplot backend and
+    # figure state are left alone.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.bxp(stats)
+    if title:
+        ax.set_title(title)
+    fig.savefig(path)
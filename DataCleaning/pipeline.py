@@ -0,0 +1,254 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from dedup import FingerprintStore, drop_duplicates, row_fingerprints
+from outlier_detection import zscore_scores
+from streaming_stats import make_accumulator, result
+from text_normalize import CASES, normalize_case as normalize_series_case
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from cache import ChunkWriter  # noqa: E402
+
+# Steps that only touch one column at a time. Consecutive steps of these kinds
+# are fused and applied in a single pass over the columns.
+COLUMN_STEPS = ('impute', 'drop_columns', 'normalize_case')
+
+
+class Step:
+    def __init__(self, kind, **params):
+        self.kind = kind
+        self.params = params
+
+    def __repr__(self):
+        return f"Step({self.kind!r}, {self.params!r})"
+
+
+# Declarative step constructors
+
+def impute(strategies):
+    # strategies maps column -> 'median' | 'mean' | 'mode' | ('constant', value)
+    return Step('impute', strategies=dict(strategies))
+
+
+def drop_columns(columns):
+    return Step('drop_columns', columns=list(columns))
+
+
+def dedup(subset=None):
+    return Step('dedup', subset=subset)
+
+
+def normalize_case(cases, convert_dtypes=False):
+    # cases maps column -> 'title' | 'lower' | 'upper'. Columns keep their
+    # dtype; convert_dtypes=True returns them as category (low-cardinality
+    # columns) or string[pyarrow] instead.
+    for column, case in cases.items():
+        if case not in CASES:
+            raise ValueError(f"Unknown case {case!r} for column {column!r}")
+    return Step('normalize_case', cases=dict(cases), convert_dtypes=convert_dtypes)
+
+
+def zscore_filter(columns=None, threshold=3.0):
+    return Step('zscore_filter', columns=columns, threshold=threshold)
+
+
+def fill_value(series, strategy):
+    if isinstance(strategy, tuple) and strategy[0] == 'constant':
+        return strategy[1]
+    if strategy == 'median':
+        return series.median()
+    if strategy == 'mean':
+        return series.mean()
+    if strategy == 'mode':
+        return series.mode()[0]
+    raise ValueError(f"Unknown imputation strategy {strategy!r}")
+
+
+def common_dtype(a, b):
+    # Chunks can infer different dtypes for the same column (e.g. int64 in a
+    # chunk without missing values, float64 in one with them)
+    if a == b:
+        return a
+    if pd.api.types.is_numeric_dtype(a) and pd.api.types.is_numeric_dtype(b):
+        return np.result_type(a, b)
+    return np.dtype(object)
+
+
+class Pipeline:
+    def __init__(self, steps, verbose=False):
+        self.steps = list(steps)
+        self.verbose = verbose
+        # (step index, column) -> fill value learned by the last run
+        self.statistics_ = {}
+        # step index -> number of rows removed by the last run
+        self.removed_ = {}
+
+    def _stages(self):
+        # Group consecutive column steps into one fused stage; row steps
+        # (dedup, zscore_filter) each form their own stage.
+        stage = []
+        for i, step in enumerate(self.steps):
+            if step.kind in COLUMN_STEPS:
+                stage.append((i, step))
+                continue
+            if stage:
+                yield stage
+                stage = []
+            yield [(i, step)]
+        if stage:
+            yield stage
+
+    def _log(self, title, df):
+        if self.verbose:
+            print(title)
+            print(df.head())
+            print()
+
+    def run(self, df, statistics=None, state=None):
+        # statistics: precomputed fill values (used by run_chunked)
+        # state: per-step state carried across chunks (fingerprint stores)
+        if self.verbose:
+            print("Input data:")
+            print(df.head())
+            print()
+            df.info()
+            print()
+            print(df.describe())
+            print()
+            print("Missing values:")
+            print(df.isnull().sum())
+            print()
+
+        for stage in self._stages():
+            if stage[0][1].kind in COLUMN_STEPS:
+                df = self._apply_columns(df, stage, statistics)
+                self._log("After " + ", ".join(step.kind for _, step in stage) + ":", df)
+            else:
+                i, step = stage[0]
+                before = len(df)
+                if step.kind == 'dedup':
+                    df = self._apply_dedup(df, step, None if state is None else state.get(i))
+                else:
+                    df = self._apply_zscore(df, step)
+                self.removed_[i] = before - len(df)
+                self._log(f"After {step.kind} ({self.removed_[i]} rows removed):", df)
+        return df
+
+    def _apply_columns(self, df, stage, statistics):
+        # Collect every operation per column first, then walk the columns once
+        ops = {}
+        dropped = set()
+        for i, step in stage:
+            if step.kind == 'impute':
+                for column, strategy in step.params['strategies'].items():
+                    ops.setdefault(column, []).append(('impute', i, strategy))
+            elif step.kind == 'normalize_case':
+                for column, case in step.params['cases'].items():
+                    ops.setdefault(column, []).append(('case', i, (case, step.params['convert_dtypes'])))
+            else:
+                for column in step.params['columns']:
+                    ops.setdefault(column, []).append(('drop', i, None))
+
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            for op, i, arg in ops.get(column, ()):
+                if op == 'drop':
+                    dropped.add(column)
+                    break
+                if op == 'impute':
+                    key = (i, column)
+                    if statistics is not None and key in statistics:
+                        value = statistics[key]
+                    else:
+                        value = fill_value(series, arg)
+                    self.statistics_[key] = value
+                    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+                        series = series.cat.add_categories([value])
+                    series = series.fillna(value)
+                else:
+                    series = normalize_series_case(series, *arg)
+            if column not in dropped:
+                columns[column] = series
+
+        # Dropping a column that was never read is fine
+        missing = {c for c, column_ops in ops.items() if column_ops[0][0] != 'drop'} - set(df.columns)
+        if missing:
+            raise KeyError(f"Columns not found: {sorted(missing)}")
+        return pd.DataFrame(columns, index=df.index)
+
+    def _apply_dedup(self, df, step, store):
+        subset = step.params['subset']
+        if store is None:
+            return drop_duplicates(df, subset)[0]
+        # Streaming: compare against the fingerprints of all earlier chunks
+        return df[~store.add(row_fingerprints(df, subset))]
+
+    def _apply_zscore(self, df, step):
+        columns = step.params['columns']
+        if columns is None:
+            columns = df.select_dtypes(include='number').columns
+        # Same rule as the original script: keep rows whose every |z| is below
+        # the threshold, so rows with a missing value are dropped too
+        with np.errstate(invalid='ignore'):
+            keep = (zscore_scores(df[columns]) < step.params['threshold']).all(axis=1)
+        return df[keep]
+
+    def run_chunked(self, file_path, output_path, chunk_size, exact=True, dedup_store=':memory:',
+                    persist_dedup=False, **read_kwargs):
+        # Two passes over the file: the first computes global fill values,
+        # the second cleans each chunk and appends it to output_path (CSV, or
+        # Parquet if the path ends in .parquet).
+        # Fill values are taken from the raw input columns, so impute steps
+        # should come before steps that change those columns. With
+        # exact=False medians and modes come from fixed-size sketches instead
+        # of per-value counts (see streaming_stats.py). Row fingerprints for
+        # dedup steps live in SQLite at dedup_store, so a file path keeps
+        # them on disk instead of in memory. Each dedup step gets its own
+        # table, private to this run, unless persist_dedup is set: then step
+        # i keeps its fingerprints in table seen_step{i} across runs, and
+        # rows already written by an earlier run are dropped as duplicates.
+        if any(step.kind == 'zscore_filter' for step in self.steps):
+            raise ValueError("zscore_filter needs the whole frame and is not supported in chunked mode")
+
+        wanted = {}
+        for i, step in enumerate(self.steps):
+            if step.kind == 'impute':
+                for column, strategy in step.params['strategies'].items():
+                    if not isinstance(strategy, tuple):
+                        wanted[(i, column)] = strategy
+
+        accumulators = {key: make_accumulator(strategy, exact) for key, strategy in wanted.items()}
+        dtypes = {}
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size, **read_kwargs):
+            for (_, column), accumulator in accumulators.items():
+                accumulator.update(chunk[column])
+            for column, dtype in chunk.dtypes.items():
+                dtypes[column] = common_dtype(dtypes.get(column, dtype), dtype)
+
+        statistics = {key: result(accumulators[key], strategy) for key, strategy in wanted.items()}
+
+        state = {
+            i: FingerprintStore(dedup_store, f'seen_step{i}', persist=True) if persist_dedup
+            else FingerprintStore(dedup_store)
+            for i, step in enumerate(self.steps) if step.kind == 'dedup'
+        }
+        removed = {}
+        rows_written = 0
+        writer = ChunkWriter(output_path)
+        read_kwargs = dict(read_kwargs, dtype=dict(dtypes, **read_kwargs.get('dtype', {})))
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size, **read_kwargs):
+            chunk = self.run(chunk, statistics=statistics, state=state)
+            for i, n in self.removed_.items():
+                removed[i] = removed.get(i, 0) + n
+            writer.write(chunk)
+            rows_written += len(chunk)
+
+        writer.close()
+        for store in state.values():
+            store.close()
+        self.removed_ = removed
+        return rows_written
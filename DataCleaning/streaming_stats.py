@@ -0,0 +1,267 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Streaming statistics for computing fill values without holding a column in
+# memory. Every accumulator has update(values) for the next chunk and
+# merge(other) to combine accumulators built on other chunks or workers.
+#
+#   RunningMoments  exact mean / variance (Welford, merged with Chan's formula)
+#   ValueCounts     exact median and mode, memory bounded by the number of
+#                   distinct values (fine for Age, Embarked, Glucose, ...)
+#   QuantileSketch  approximate quantiles in O(k log n) memory (KLL-style)
+#   HeavyHitters    approximate mode in O(capacity) memory (Misra-Gries)
+
+
+class RunningMoments:
+    def __init__(self):
+        self.count = 0
+        self.mean_ = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        safe_total = np.where(total == 0, 1, total)
+        delta = mean - self.mean_
+        self.mean_ = self.mean_ + delta * count / safe_total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / safe_total
+        self.count = total
+
+    def update(self, values):
+        # values is 1-D (one column) or 2-D (rows x columns); NaNs are skipped
+        values = np.asarray(values, dtype='float64')
+        present = ~np.isnan(values)
+        count = present.sum(axis=0)
+        safe_count = np.where(count == 0, 1, count)
+        mean = np.where(present, values, 0).sum(axis=0) / safe_count
+        m2 = np.where(present, (values - mean) ** 2, 0).sum(axis=0)
+        self._combine(count, mean, m2)
+        return self
+
+    def merge(self, other):
+        self._combine(other.count, other.mean_, other.m2)
+        return self
+
+    @property
+    def mean(self):
+        return np.where(self.count == 0, np.nan, self.mean_)[()]
+
+    def variance(self, ddof=0):
+        dof = self.count - ddof
+        return np.where(dof > 0, self.m2 / np.where(dof > 0, dof, 1), np.nan)[()]
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
+
+
+class ValueCounts:
+    def __init__(self):
+        self.counts = pd.Series(dtype='float64')
+
+    def update(self, values):
+        self.counts = self.counts.add(pd.Series(values).value_counts(), fill_value=0)
+        return self
+
+    def merge(self, other):
+        self.counts = self.counts.add(other.counts, fill_value=0)
+        return self
+
+    def median(self):
+        # Same result as Series.median() on the full column
+        counts = self.counts.sort_index()
+        total = counts.sum()
+        if total == 0:
+            return np.nan
+        cumulative = counts.cumsum().to_numpy()
+        values = counts.index.to_numpy()
+        lower = values[np.searchsorted(cumulative, (total + 1) // 2)]
+        upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+        return (lower + upper) / 2
+
+    def mode(self):
+        # Ties are broken the same way as Series.mode()[0]: smallest value first
+        if self.counts.empty:
+            return np.nan
+        return self.counts[self.counts == self.counts.max()].sort_index().index[0]
+
+    def mean(self):
+        total = self.counts.sum()
+        if total == 0:
+            return np.nan
+        return (self.counts.index.to_numpy(dtype='float64') * self.counts.to_numpy()).sum() / total
+
+
+class QuantileSketch:
+    # KLL-style compactor hierarchy. Level h holds items of weight 2**h; a
+    # full level is sorted and every other item (random offset) is promoted.
+    # Rank error is roughly 1.7 / k of the stream length.
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self.rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd item out stays on this level
+            keep = items[:len(items) % 2]
+            paired = items[len(items) % 2:]
+            promoted = paired[self.rng.integers(2)::2]
+            self.levels[level] = keep
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64').ravel()
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        if self.count == 0:
+            return np.nan
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(q) * cumulative[-1]
+        positions = np.minimum(np.searchsorted(cumulative, ranks), len(items) - 1)
+        return items[order][positions][()]
+
+    def median(self):
+        return self.quantile(0.5)
+
+
+class HeavyHitters:
+    # Misra-Gries summary: any value with frequency above n / (capacity + 1)
+    # is kept, and each kept count is low by at most `error`. While the
+    # number of distinct values stays within capacity the counts are exact.
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.counts = pd.Series(dtype='float64')
+        self.error = 0.0
+
+    def _add(self, counts):
+        counts = self.counts.add(counts, fill_value=0)
+        if len(counts) > self.capacity:
+            cut = counts.nlargest(self.capacity + 1).iloc[-1]
+            counts = counts - cut
+            counts = counts[counts > 0]
+            self.error += cut
+        self.counts = counts
+
+    def update(self, values):
+        self._add(pd.Series(values).value_counts())
+        return self
+
+    def merge(self, other):
+        self.error += other.error
+        self._add(other.counts)
+        return self
+
+    @property
+    def exact(self):
+        return self.error == 0
+
+    def mode(self):
+        if self.counts.empty:
+            return np.nan
+        return self.counts[self.counts == self.counts.max()].sort_index().index[0]
+
+    def top(self, n=10):
+        return self.counts.nlargest(n)
+
+
+def make_accumulator(strategy, exact=True):
+    if strategy == 'mean':
+        return RunningMoments()
+    if strategy in ('median', 'mode'):
+        if exact:
+            return ValueCounts()
+        return QuantileSketch() if strategy == 'median' else HeavyHitters()
+    raise ValueError(f"Unknown imputation strategy {strategy!r}")
+
+
+def result(accumulator, strategy):
+    if strategy == 'mean':
+        return float(accumulator.mean)
+    if strategy == 'median':
+        return accumulator.median()
+    return accumulator.mode()
+
+
+def accumulate(chunks, strategies, exact=True):
+    # One pass over an iterable of DataFrames (e.g. read_csv(chunksize=...)).
+    # Returns column -> accumulator so results can still be merged.
+    accumulators = {c: make_accumulator(s, exact) for c, s in strategies.items()}
+    for chunk in chunks:
+        for column, accumulator in accumulators.items():
+            accumulator.update(chunk[column].to_numpy() if strategies[column] != 'mode' else chunk[column])
+    return accumulators
+
+
+def fill_values(chunks, strategies, exact=True):
+    # strategies maps column -> 'mean' | 'median' | 'mode'
+    accumulators = accumulate(chunks, strategies, exact)
+    return {c: result(a, strategies[c]) for c, a in accumulators.items()}
+
+
+def _accumulate_file(task):
+    path, strategies, exact, chunk_size, read_kwargs = task
+    # Only the accumulated columns are parsed, plus any the caller's usecols
+    # lists (read_options() adds the index column there, for one)
+    read_kwargs = dict(read_kwargs)
+    extra = read_kwargs.pop('usecols', None)
+    if callable(extra):
+        wanted = set(strategies)
+
+        def columns(column):
+            return column in wanted or extra(column)
+    else:
+        columns = list(strategies)
+        columns += [c for c in extra or () if c not in columns]
+    chunks = pd.read_csv(path, usecols=columns, chunksize=chunk_size, **read_kwargs)
+    return accumulate(chunks, strategies, exact)
+
+
+def partitioned_fill_values(paths, strategies, exact=True, chunk_size=100_000, n_jobs=None, **read_kwargs):
+    # Accumulate each partition file in its own process, then merge
+    tasks = [(path, strategies, exact, chunk_size, read_kwargs) for path in paths]
+    merged = None
+    with ProcessPoolExecutor(max_workers=n_jobs or os.cpu_count()) as pool:
+        for accumulators in pool.map(_accumulate_file, tasks):
+            if merged is None:
+                merged = accumulators
+            else:
+                for column, accumulator in accumulators.items():
+                    merged[column].merge(accumulator)
+    if merged is None:
+        return {}
+    return {c: result(a, strategies[c]) for c, a in merged.items()}
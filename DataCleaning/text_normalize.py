@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    ARROW_STRING = 'string[pyarrow]'
+except ImportError:
+    ARROW_STRING = None
+
+CASES = ('title', 'lower', 'upper')
+
+# Columns whose sample has at most this share of distinct values are treated
+# as low-cardinality (Sex, Embarked, ...)
+CATEGORY_RATIO = 0.5
+SAMPLE_SIZE = 10_000
+
+
+def apply_case(strings, case):
+    return getattr(strings.str, case)()
+
+
+def is_low_cardinality(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return True
+    sample = series.iloc[:SAMPLE_SIZE]
+    return sample.nunique() <= CATEGORY_RATIO * max(len(sample), 1)
+
+
+def normalize_categories(series, case):
+    # Transform each distinct value once and remap the codes. Values that
+    # collide after the transform ('male' / 'MALE') share one category.
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes, uniques = series.cat.codes.to_numpy(), pd.Series(series.cat.categories)
+    else:
+        codes, uniques = pd.factorize(series)
+        uniques = pd.Series(uniques)
+    new_codes, new_uniques = pd.factorize(apply_case(uniques.astype(object), case))
+    # An all-missing series (or chunk) has no uniques at all
+    remapped = np.full(len(codes), -1, dtype=new_codes.dtype)
+    present = codes >= 0
+    remapped[present] = new_codes[codes[present]]
+    return pd.Series(pd.Categorical.from_codes(remapped, categories=new_uniques), index=series.index, name=series.name)
+
+
+def normalize_case(series, case, convert_dtype=False):
+    # Low-cardinality columns are transformed per category; high-cardinality
+    # columns use Arrow string kernels when pyarrow is installed. The result
+    # keeps the input dtype (missing values unchanged) unless convert_dtype
+    # is set: then it is returned as category or string[pyarrow], which
+    # skips the cast back and keeps the smaller representation.
+    if case not in CASES:
+        raise ValueError(f"Unknown case {case!r}")
+    if is_low_cardinality(series):
+        result = normalize_categories(series, case)
+    elif ARROW_STRING is not None and series.dtype != ARROW_STRING:
+        result = apply_case(series.astype(ARROW_STRING), case)
+    else:
+        result = apply_case(series, case)
+    # A categorical input stays categorical, with the merged categories
+    if convert_dtype or result.dtype == series.dtype or isinstance(series.dtype, pd.CategoricalDtype):
+        return result
+    return result.astype(series.dtype).where(series.notna(), series)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from ingest import SCHEMAS
+
+# Columnar cache for cleaned/processed frames. Entries are keyed by a hash
+# of the input file's contents plus the pipeline config, so a rerun with the
+# same inputs reads the cached frame instead of recomputing it.
+#
+# Feather files are written uncompressed so they can be memory-mapped and
+# read without copying; Parquet is smaller on disk and better for sharing.
+
+CACHE_DIR = os.environ.get('DA_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+
+FORMATS = ('feather', 'parquet', 'csv')
+
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(input_path, config, schema=None, options=None):
+    # config is anything JSON-serialisable (non-JSON values fall back to
+    # repr). schema names the ingest.SCHEMAS entry the input is read with and
+    # options are the read_csv arguments; both are hashed with the config, so
+    # editing a schema or a read option invalidates the old entries.
+    payload = {'config': config}
+    if schema is not None:
+        payload['schema'] = SCHEMAS[schema]
+    if options is not None:
+        payload['options'] = options
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(file_digest(input_path).encode())
+    digest.update(json.dumps(payload, sort_keys=True, default=repr).encode())
+    return digest.hexdigest()
+
+
+def cache_path(key, fmt='feather', cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, f'{key}.{fmt}')
+
+
+def format_of(path):
+    fmt = os.path.splitext(path)[1].lstrip('.')
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported output format {fmt!r} (expected one of {FORMATS})")
+    return fmt
+
+
+def write_frame(df, path):
+    # Format follows the file extension. The write goes to a temporary file
+    # first so a crash never leaves a truncated cache entry behind.
+    fmt = format_of(path)
+    tmp_path = path + '.tmp'
+    if fmt == 'csv':
+        df.to_csv(tmp_path, index=False)
+    else:
+        table = pa.Table.from_pandas(df)
+        if fmt == 'feather':
+            feather.write_feather(table, tmp_path, compression='uncompressed')
+        else:
+            pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_table(path):
+    # Arrow table backed by a memory map of the file (zero-copy for Feather)
+    if format_of(path) == 'feather':
+        return feather.read_table(path, memory_map=True)
+    return pq.read_table(path, memory_map=True)
+
+
+def read_frame(path):
+    if format_of(path) == 'csv':
+        return pd.read_csv(path)
+    # split_blocks lets numeric columns without nulls stay views of the map
+    return read_table(path).to_pandas(split_blocks=True)
+
+
+def cached(input_path, config, compute, fmt='feather', cache_dir=None):
+    # Returns (frame, hit). compute() is only called on a cache miss.
+    path = cache_path(cache_key(input_path, config), fmt, cache_dir)
+    if os.path.exists(path):
+        return read_frame(path), True
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = compute()
+    write_frame(df, path)
+    return df, False
+
+
+def chunk_schema(table):
+    # Arrow schema for every chunk of a chunked write, from the first one. A
+    # column that is all missing in that chunk comes out as the null type,
+    # which no later value can be cast to; read_csv only leaves such a
+    # column as object when other chunks hold strings, so it is written as
+    # string.
+    fields = [field.with_type(pa.string()) if pa.types.is_null(field.type) else field for field in table.schema]
+    return pa.schema(fields, metadata=table.schema.metadata)
+
+
+class ChunkWriter:
+    # Appends chunks to a CSV, Parquet or Feather file, the format following
+    # the extension as in write_frame(). Parquet and Feather chunks are cast
+    # to schema, by default chunk_schema() of the first chunk; Feather is
+    # written uncompressed through the Arrow IPC file writer (Feather v2 is
+    # that format). Closing a writer that got no chunks still writes the
+    # file, empty, with the columns of schema when it is known.
+
+    def __init__(self, output_path, schema=None):
+        self.output_path = output_path
+        self.format = format_of(output_path)
+        self.writer = None
+        self.schema = schema
+        self.header = True
+
+    def _open(self):
+        if self.format == 'parquet':
+            self.writer = pq.ParquetWriter(self.output_path, self.schema)
+        else:
+            self.writer = ipc.new_file(self.output_path, self.schema)
+
+    def write(self, chunk):
+        if self.format == 'csv':
+            chunk.to_csv(self.output_path, mode='w' if self.header else 'a', header=self.header, index=False)
+            self.header = False
+            return
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if self.writer is None:
+            if self.schema is None:
+                self.schema = chunk_schema(table)
+            self._open()
+        if not table.schema.equals(self.schema):
+            table = table.cast(self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.format == 'csv':
+            if self.header:
+                names = [] if self.schema is None else self.schema.names
+                pd.DataFrame(columns=names).to_csv(self.output_path, index=False)
+                self.header = False
+            return
+        if self.writer is None:
+            if self.schema is None:
+                self.schema = pa.schema([])
+            self._open()
+        self.writer.close()
+
+
+def publish(source, target):
+    # Copy a cache entry to target. A copy, not a hard link, so editing the
+    # output in place can never change the cached entry. The copy goes to a
+    # temporary file first, so target is never left half-written.
+    if os.path.abspath(source) == os.path.abspath(target):
+        return
+    tmp_path = target + '.tmp'
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, target)
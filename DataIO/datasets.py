@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sys
+import warnings
+
+import pandas as pd
+
+from cache import file_digest, read_frame, write_frame
+from ingest import memory_report, read_dataset
+
+# Local registry for the example datasets the scripts load by name
+# (airline passengers, iris, tips). Each dataset is stored once as an
+# uncompressed Feather file and listed in a manifest with its checksums, so
+# load_dataset() is a memory-mapped read with no network access at all.
+#
+# fetch_dataset() is the only function that may download anything. It is
+# run once (e.g. `python DataIO/datasets.py` on a connected machine, or with
+# source= pointing at a local copy of the CSV) to seed the registry; the
+# data directory can then be copied into an air-gapped environment. On a
+# fresh checkout the registry is empty (DataIO/data is not committed), and
+# load_dataset() raises until the dataset has been fetched; it only
+# downloads when called with fetch=True.
+#
+# A REGISTRY entry can pin the SHA-256 of its source CSV ('sha256', as
+# printed by sha256sum); every fetch, the first included, is checked
+# against it. For an entry without a pin the digest of the source is
+# recorded the first time it is fetched (trust on first use, with a
+# warning). Either way a fetch whose content differs is refused unless
+# force=True.
+
+DATA_DIR = os.environ.get('DA_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+
+SEABORN_DATA = 'https://raw.githubusercontent.com/mwaskom/seaborn-data/master'
+
+REGISTRY = {
+    'airline': {
+        'url': 'https://raw.githubusercontent.com/jbrownlee/Datasets/master/airline-passengers.csv',
+        'sha256': None,
+        'schema': 'airline',
+    },
+    'iris': {
+        'url': f'{SEABORN_DATA}/iris.csv',
+        'sha256': None,
+    },
+    'tips': {
+        'url': f'{SEABORN_DATA}/tips.csv',
+        'sha256': None,
+        # Category order sns.load_dataset('tips') uses
+        'categories': {
+            'sex': ['Male', 'Female'],
+            'smoker': ['Yes', 'No'],
+            'day': ['Thur', 'Fri', 'Sat', 'Sun'],
+            'time': ['Lunch', 'Dinner'],
+        },
+    },
+}
+
+
+def manifest_path(data_dir=None):
+    return os.path.join(data_dir or DATA_DIR, 'manifest.json')
+
+
+def read_manifest(data_dir=None):
+    path = manifest_path(data_dir)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, data_dir=None):
+    path = manifest_path(data_dir)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def source_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def seaborn_cache(name):
+    # Copy left behind by an earlier sns.load_dataset(name, cache=True)
+    try:
+        import seaborn as sns
+    except ImportError:
+        return None
+    path = os.path.join(sns.get_data_home(), f'{name}.csv')
+    return path if os.path.exists(path) else None
+
+
+def parse_source(name, source):
+    entry = REGISTRY[name]
+    if 'schema' in entry:
+        df = read_dataset(source, entry['schema'])
+    else:
+        df = pd.read_csv(source)
+    for column, categories in entry.get('categories', {}).items():
+        df[column] = pd.Categorical(df[column], categories=categories)
+    return df
+
+
+def fetch_dataset(name, source=None, force=False, data_dir=None):
+    # Seed (or refresh) one dataset in the registry. source is a local CSV
+    # path or URL; by default a seaborn cache copy is used when present,
+    # otherwise the registry URL is downloaded.
+    if name not in REGISTRY:
+        raise KeyError(f"Unknown dataset {name!r} (registered: {sorted(REGISTRY)})")
+    data_dir = data_dir or DATA_DIR
+    os.makedirs(data_dir, exist_ok=True)
+    source = source or seaborn_cache(name) or REGISTRY[name]['url']
+
+    raw_path = os.path.join(data_dir, f'{name}.csv.tmp')
+    if os.path.exists(source):
+        with open(source, 'rb') as src, open(raw_path, 'wb') as dst:
+            dst.write(src.read())
+    else:
+        from urllib.request import urlopen
+        with urlopen(source, timeout=30) as response, open(raw_path, 'wb') as dst:
+            dst.write(response.read())
+
+    try:
+        manifest = read_manifest(data_dir)
+        source_digest = file_digest(raw_path)
+        pinned = REGISTRY[name].get('sha256')
+        known = manifest.get(name, {}).get('source_digest')
+        if pinned is not None:
+            sha256 = source_sha256(raw_path)
+            if sha256 != pinned and not force:
+                raise ValueError(f"Source for {name!r} does not match the checksum pinned in REGISTRY "
+                                 f"({sha256} != {pinned}); pass force=True to accept it")
+        elif known is None:
+            warnings.warn(f"No checksum is pinned for {name!r}; trusting {source} and recording its digest")
+        elif known != source_digest and not force:
+            raise ValueError(f"Source for {name!r} does not match the checksum recorded on first fetch "
+                             f"({source_digest} != {known}); pass force=True to accept it")
+        df = parse_source(name, raw_path)
+    finally:
+        os.remove(raw_path)
+
+    path = os.path.join(data_dir, f'{name}.feather')
+    write_frame(df, path)
+    manifest[name] = {
+        'file': os.path.basename(path),
+        'digest': file_digest(path),
+        'source': source,
+        'source_digest': source_digest,
+        'rows': len(df),
+    }
+    write_manifest(manifest, data_dir)
+    return df
+
+
+def load_dataset(name, verify=True, report=False, data_dir=None, fetch=False):
+    # Read a registered dataset from the local store. A dataset that has not
+    # been stored yet raises FileNotFoundError, unless fetch=True fetches it
+    # once; a stored one never touches the network.
+    entry = read_manifest(data_dir).get(name)
+    if entry is None:
+        if name not in REGISTRY:
+            raise KeyError(f"Unknown dataset {name!r} (registered: {sorted(REGISTRY)})")
+        hint = (f"seed it with fetch_dataset({name!r}) or fetch_dataset({name!r}, source='<local {name} CSV>'), "
+                f"run `python DataIO/datasets.py` on a connected machine and copy {data_dir or DATA_DIR} here, "
+                f"or point DA_DATA_DIR at an existing registry")
+        if not fetch:
+            raise FileNotFoundError(f"Dataset {name!r} is not in the local registry at {data_dir or DATA_DIR}; {hint}")
+        try:
+            fetch_dataset(name, data_dir=data_dir)
+        except OSError as error:
+            raise FileNotFoundError(f"Dataset {name!r} is not in the local registry at {data_dir or DATA_DIR} "
+                                    f"and could not be downloaded ({error}); {hint}") from error
+        entry = read_manifest(data_dir)[name]
+    path = os.path.join(data_dir or DATA_DIR, entry['file'])
+    if verify and file_digest(path) != entry['digest']:
+        raise ValueError(f"Checksum mismatch for {path}; re-seed it with fetch_dataset({name!r}, force=True)")
+    df = read_frame(path)
+    if report:
+        stats = memory_report(df)
+        print(f"Loaded {name}: {len(df)} rows, {stats['bytes'] / 1e6:.2f} MB")
+    return df
+
+
+def main():
+    # Seed every registered dataset that is not stored yet
+    names = sys.argv[1:] or list(REGISTRY)
+    manifest = read_manifest()
+    for name in names:
+        if name in manifest:
+            print(f"{name}: already stored")
+            continue
+        df = fetch_dataset(name)
+        print(f"{name}: stored {len(df)} rows")
+
+
+if __name__ == "__main__":
+    main()
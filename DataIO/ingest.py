@@ -0,0 +1,128 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+# Per-dataset schemas for the CSV files used across the course. Low
+# cardinality text becomes category, small integers int8/int16/int32 and
+# measurements float32 (all of these have far fewer than 7 significant
+# digits). Columns that can be missing are never given an integer dtype.
+SCHEMAS = {
+    'titanic': {
+        'columns': ['PassengerId', 'Survived', 'Pclass', 'Name', 'Sex', 'Age', 'SibSp',
+                    'Parch', 'Ticket', 'Fare', 'Cabin', 'Embarked'],
+        'dtype': {
+            'PassengerId': 'int32',
+            'Survived': 'int8',
+            'Pclass': 'int8',
+            'Sex': 'category',
+            'Age': 'float32',
+            'SibSp': 'int8',
+            'Parch': 'int8',
+            'Fare': 'float32',
+            'Embarked': 'category',
+        },
+    },
+    'diabetes': {
+        'columns': ['Pregnancies', 'Glucose', 'BloodPressure', 'SkinThickness', 'Insulin',
+                    'BMI', 'DiabetesPedigreeFunction', 'Age', 'Outcome'],
+        'dtype': {
+            'Pregnancies': 'int8',
+            'Glucose': 'float32',
+            'BloodPressure': 'float32',
+            'SkinThickness': 'float32',
+            'Insulin': 'float32',
+            'BMI': 'float32',
+            'DiabetesPedigreeFunction': 'float32',
+            'Age': 'int8',
+            'Outcome': 'category',
+        },
+    },
+    'spotify': {
+        'dtype': {
+            'Artist': 'category',
+            'Track Score': 'float32',
+            'Explicit Track': 'category',
+        },
+        'parse_dates': ['Release Date'],
+        # Stream and playlist counts are written as "390,470,936"
+        'options': {'encoding': 'latin1', 'thousands': ','},
+    },
+    'airline': {
+        'columns': ['Month', 'Passengers'],
+        'dtype': {'Passengers': 'int32'},
+        'parse_dates': ['Month'],
+        'index': 'Month',
+    },
+}
+
+# read_csv options the pyarrow engine does not support
+PYARROW_UNSUPPORTED = ('thousands', 'chunksize', 'skipfooter', 'nrows', 'low_memory')
+
+
+def read_options(name, columns=None, chunked=False):
+    # Keyword arguments for pd.read_csv that apply the schema. columns limits
+    # the read to the columns that are actually needed.
+    schema = SCHEMAS[name]
+    options = dict(schema.get('options', {}))
+    usecols = list(columns) if columns is not None else None
+    index = schema.get('index')
+    if usecols is not None and index is not None and index not in usecols:
+        usecols.append(index)
+    dtype = schema.get('dtype', {})
+    if usecols is not None:
+        dtype = {c: t for c, t in dtype.items() if c in usecols}
+        options['usecols'] = usecols
+    options['dtype'] = dtype
+    parse_dates = [c for c in schema.get('parse_dates', []) if usecols is None or c in usecols]
+    if parse_dates:
+        options['parse_dates'] = parse_dates
+    use_pyarrow = HAVE_PYARROW and not chunked and not any(o in options for o in PYARROW_UNSUPPORTED)
+    options['engine'] = 'pyarrow' if use_pyarrow else 'c'
+    return options
+
+
+def default_nbytes(series):
+    # What the column would take with read_csv's default inference:
+    # 8 bytes per number/date, a Python str object per text value
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if pd.api.types.is_numeric_dtype(categories.dtype):
+            return len(series) * 8
+        sizes = np.array([sys.getsizeof(str(c)) for c in categories] + [0])
+        codes = series.cat.codes.to_numpy()
+        return len(series) * 8 + int(sizes[codes].sum())
+    if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return len(series) * 8
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def memory_report(df):
+    used = int(df.memory_usage(index=True, deep=True).sum())
+    default = int(df.index.memory_usage(deep=True)) + sum(default_nbytes(df[c]) for c in df.columns)
+    return {
+        'bytes': used,
+        'default_bytes': default,
+        'saved_bytes': default - used,
+        'saved_ratio': (default - used) / default if default else 0.0,
+    }
+
+
+def read_dataset(path, name, columns=None, report=False):
+    # Read a CSV with the dataset's schema, using the pyarrow engine when the
+    # options allow it
+    df = pd.read_csv(path, **read_options(name, columns))
+    index = SCHEMAS[name].get('index')
+    if index is not None:
+        df = df.set_index(index)
+    if report:
+        stats = memory_report(df)
+        print(f"Loaded {name}: {len(df)} rows, {stats['bytes'] / 1e6:.2f} MB "
+              f"({stats['saved_bytes'] / 1e6:.2f} MB, {stats['saved_ratio']:.0%} less than default dtypes)")
+    return df
@@ -0,0 +1,116 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+# KMeans for tables too large for a full-batch fit.
+#
+# fit_kmeans() takes float32 features (half the memory of a float64 frame).
+# If the data fits in one chunk it runs the full-batch KMeans as before.
+# Otherwise MiniBatchKMeans.partial_fit is fed one chunk at a time, either
+# from an in-memory array or from an iterator such as
+# pd.read_csv(chunksize=...), so the table never has to be loaded at once.
+# predict_labels() assigns labels chunk by chunk into a preallocated array.
+#
+# sweep_k() helps choose k. It fits every candidate k on a single random
+# sample, with the candidates spread over a process pool, and reports the
+# inertia (for the elbow) and a silhouette score. The silhouette is computed
+# on a smaller sub-sample, since the exact score is O(n^2).
+
+CHUNK_SIZE = 100_000
+
+
+def features(data, columns=None):
+    # float32 feature matrix of a frame or array (no copy if it already is one)
+    if isinstance(data, pd.DataFrame):
+        data = data[columns] if columns is not None else data.select_dtypes(include='number')
+        return data.to_numpy(dtype='float32')
+    return np.ascontiguousarray(data, dtype='float32')
+
+
+def iter_chunks(data, columns=None, chunk_size=CHUNK_SIZE):
+    # Feature chunks from an in-memory table or from an iterator of frames
+    if isinstance(data, (pd.DataFrame, np.ndarray)):
+        X = features(data, columns)
+        for start in range(0, len(X), chunk_size):
+            yield X[start:start + chunk_size]
+    else:
+        for chunk in data:
+            yield features(chunk, columns)
+
+
+def fit_kmeans(data, n_clusters=3, columns=None, chunk_size=CHUNK_SIZE, n_passes=1, random_state=0):
+    # Fitted KMeans (data within one chunk) or MiniBatchKMeans. n_passes
+    # repeats the pass over in-memory data; an iterator is read once.
+    if isinstance(data, (pd.DataFrame, np.ndarray)) and len(data) <= chunk_size:
+        return KMeans(n_clusters=n_clusters, random_state=random_state).fit(features(data, columns))
+    model = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, batch_size=min(chunk_size, 4096))
+    in_memory = isinstance(data, (pd.DataFrame, np.ndarray))
+    for _ in range(n_passes if in_memory else 1):
+        for chunk in iter_chunks(data, columns, chunk_size):
+            model.partial_fit(chunk)
+    return model
+
+
+def predict_labels(model, data, columns=None, chunk_size=CHUNK_SIZE):
+    # Cluster of every row of an in-memory table, one chunk at a time
+    X = features(data, columns)
+    labels = np.empty(len(X), dtype='int32')
+    for start in range(0, len(X), chunk_size):
+        labels[start:start + chunk_size] = model.predict(X[start:start + chunk_size])
+    return labels
+
+
+def sample_rows(X, size, random_state=0):
+    if size is None or len(X) <= size:
+        return X
+    rng = np.random.default_rng(random_state)
+    return X[np.sort(rng.choice(len(X), size=size, replace=False))]
+
+
+def _score_k(task):
+    X, k, silhouette_size, random_state = task
+    model = fit_kmeans(X, n_clusters=k, chunk_size=len(X), random_state=random_state)
+    silhouette = np.nan
+    if silhouette_size:
+        silhouette = silhouette_score(X, model.labels_, sample_size=min(silhouette_size, len(X)),
+                                      random_state=random_state)
+    return {'k': k, 'inertia': model.inertia_, 'silhouette': silhouette}
+
+
+def sweep_k(data, ks=range(2, 11), columns=None, sample_size=100_000, silhouette_size=10_000,
+            n_jobs=None, random_state=0):
+    # Inertia and sampled silhouette for every k in ks, one row per k.
+    # n_jobs=1 runs in this process.
+    X = sample_rows(features(data, columns), sample_size, random_state)
+    tasks = [(X, k, silhouette_size, random_state) for k in ks]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(tasks))
+    if n_jobs == 1:
+        rows = [_score_k(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            rows = list(pool.map(_score_k, tasks))
+    return pd.DataFrame(rows).set_index('k')
+
+
+def elbow_k(sweep):
+    # k at the elbow of the inertia curve: the point farthest below the
+    # straight line from the first to the last k (both axes scaled to [0, 1])
+    k = sweep.index.to_numpy(dtype='float64')
+    inertia = sweep['inertia'].to_numpy(dtype='float64')
+    if len(k) < 3:
+        return int(k[0])
+    x = (k - k[0]) / (k[-1] - k[0])
+    y = (inertia - inertia[-1]) / ((inertia[0] - inertia[-1]) or 1.0)
+    return int(k[np.argmax((1 - x) - y)])
+
+
+def best_k(sweep, criterion='silhouette'):
+    if criterion == 'silhouette':
+        return int(sweep['silhouette'].idxmax())
+    if criterion == 'elbow':
+        return elbow_k(sweep)
+    raise ValueError(f"Unknown criterion {criterion!r}")
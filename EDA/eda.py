@@ -1,17 +1,31 @@
+import os
+import sys
+
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 from scipy import stats
-from scipy.stats import skew, kurtosis, f_oneway
-from sklearn.cluster import KMeans
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from datasets import load_dataset  # noqa: E402
+from profiler import profile  # noqa: E402
+from mode_estimation import estimate_mode  # noqa: E402
+from clustering import fit_kmeans, predict_labels, sweep_k, best_k  # noqa: E402
+from large_plots import density_scatter, histogram_pairgrid  # noqa: E402
+
+# Above this many rows, scatter and pair plots show binned counts (drawing
+# time set by the bins, not the rows) and the pair plot uses a stratified
+# sample of plot_sample_size rows
+large_frame_rows = 50_000
+plot_sample_size = 1_000_000
 
 # Generate example data
 np.random.seed(0)
 data_univariate = np.random.normal(loc=0, scale=1, size=1000)
 data_bivariate_x = np.random.normal(loc=0, scale=1, size=100)
 data_bivariate_y = 2 * data_bivariate_x + np.random.normal(loc=0, scale=1, size=100)
-iris = sns.load_dataset('iris')
+iris = load_dataset('iris')  # local registry, no network
 
 # Univariate Data Analysis
 plt.figure(figsize=(10, 6))
@@ -20,14 +34,23 @@ plt.title('Histogram (Univariate)')
 plt.savefig('histogram_univariate.png')
 plt.close()
 
-mean = np.mean(data_univariate)
-median = np.median(data_univariate)
-mode = float(stats.mode(data_univariate)[0])
+# Moments, extremes and quartiles of the sample in one pass (profile()
+# takes a whole DataFrame; the sections below read from this row)
+summary = profile(pd.DataFrame({'value': data_univariate})).loc['value']
+
+mean = summary['mean']
+median = summary['median']
+# The sample is continuous (every value unique), so the mode is the peak
+# of its density estimate rather than the most repeated value
+mode = estimate_mode(data_univariate)
 print(f"Mean: {mean}, Median: {median}, Mode: {mode}")
 
 # Bivariate Data Analysis
 plt.figure(figsize=(10, 6))
-plt.scatter(data_bivariate_x, data_bivariate_y)
+if len(data_bivariate_x) > large_frame_rows:
+    density_scatter(plt.gca(), data_bivariate_x, data_bivariate_y)
+else:
+    plt.scatter(data_bivariate_x, data_bivariate_y)
 plt.title('Scatter Plot (Bivariate)')
 plt.xlabel('X')
 plt.ylabel('Y')
@@ -38,33 +61,41 @@ correlation = np.corrcoef(data_bivariate_x, data_bivariate_y)[0, 1]
 print(f"Correlation coefficient: {correlation}")
 
 # Multivariate Data Analysis
-sns.pairplot(iris, hue='species')
-plt.suptitle('Pair Plot (Multivariate)', y=1.02)
-plt.savefig('pairplot_multivariate.png')
-plt.close()
+if len(iris) > large_frame_rows:
+    fig = histogram_pairgrid(iris, hue='species', sample_size=plot_sample_size)
+    fig.suptitle('Pair Plot (Multivariate)', y=1.02)
+    fig.savefig('pairplot_multivariate.png', bbox_inches='tight')
+    plt.close(fig)
+else:
+    sns.pairplot(iris, hue='species')
+    plt.suptitle('Pair Plot (Multivariate)', y=1.02)
+    plt.savefig('pairplot_multivariate.png')
+    plt.close()
 
+# float32 features; tables larger than one chunk are fitted with mini-batch
+# KMeans chunk by chunk. k is checked with an elbow/silhouette sweep on a sample.
 X = iris[['sepal_length', 'sepal_width', 'petal_length', 'petal_width']]
-kmeans = KMeans(n_clusters=3, random_state=0).fit(X)
-iris['cluster'] = kmeans.labels_
+sweep = sweep_k(X, ks=range(2, 7), n_jobs=1)
+print("Cluster count sweep:")
+print(sweep)
+print(f"Best k by silhouette: {best_k(sweep)}, by elbow: {best_k(sweep, 'elbow')}")
+kmeans = fit_kmeans(X, n_clusters=3)
+iris['cluster'] = predict_labels(kmeans, X)
 print("Cluster centers:")
 print(kmeans.cluster_centers_)
 
 # Measures of Central Tendency
-mean = np.mean(data_univariate)
-median = np.median(data_univariate)
-mode = float(stats.mode(data_univariate)[0])
 print(f"Mean: {mean}, Median: {median}, Mode: {mode}")
 
 # Measures of Spread
-data_range = np.max(data_univariate) - np.min(data_univariate)
-variance = np.var(data_univariate)
-std_deviation = np.std(data_univariate)
+data_range = summary['range']
+variance = summary['variance']
+std_deviation = summary['std']
 print(f"Range: {data_range}, Variance: {variance}, Standard Deviation: {std_deviation}")
 
 # Interquartile Range and Quartile Deviation
-q75, q25 = np.percentile(data_univariate, [75, 25])
-iqr = q75 - q25
-quartile_deviation = iqr / 2
+iqr = summary['iqr']
+quartile_deviation = summary['quartile_deviation']
 print(f"IQR: {iqr}, Quartile Deviation: {quartile_deviation}")
 
 # ANOVA (Analysis of Variance)
@@ -75,6 +106,6 @@ f_statistic, p_value = stats.f_oneway(group1, group2, group3)
 print(f"F-statistic: {f_statistic}, p-value: {p_value}")
 
 # Skewness and Kurtosis
-skewness = skew(data_univariate)
-kurt = kurtosis(data_univariate)
+skewness = summary['skew']
+kurt = summary['kurtosis']
 print(f"Skewness: {skewness}, Kurtosis: {kurt}")
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+# Pair plots and scatter plots for frames too large to draw point by point.
+#
+# Every column is binned once: bin_index() turns it into integer bin numbers
+# on a fixed grid over the column's limits, by default the range between the
+# ROBUST_PERCENTILES, so a few extreme values do not squeeze the rest of the
+# data into one bin (values outside the limits are left out, as in
+# np.histogram2d with range=). The 2-D histogram of any pair of columns is then a single
+# np.bincount of (i * bins + j), and with hue the class code becomes a third
+# index of the same bincount. Each panel is drawn as one image of
+# bins x bins cells, so render time depends on the bin count, not the row
+# count.
+#
+# With hue, every cell takes the average colour of its classes weighted by
+# their counts, and its opacity comes from the log of the total count, so
+# both the class mix and the density stay visible. sample_size draws a
+# stratified sample first (the same fraction of every hue class).
+
+BINS = 64
+ROBUST_PERCENTILES = (0.5, 99.5)
+
+
+def bin_index(values, bins=BINS, limits=None):
+    # Bin number of every value on bins equal-width bins over limits
+    # (default: the ROBUST_PERCENTILES range of the column); -1 for NaN and
+    # out-of-range values
+    values = np.asarray(values, dtype='float64')
+    if limits is None:
+        finite = values[np.isfinite(values)]
+        limits = tuple(np.percentile(finite, ROBUST_PERCENTILES)) if len(finite) else (0.0, 1.0)
+    low, high = limits
+    if high <= low:
+        high = low + 1.0
+    with np.errstate(invalid='ignore'):
+        index = np.floor((values - low) / (high - low) * bins)
+    index[values == high] = bins - 1
+    valid = (index >= 0) & (index < bins)
+    return np.where(valid, index, -1).astype('int32'), np.linspace(low, high, bins + 1)
+
+
+def stratified_sample(df, hue, sample_size, random_state=0):
+    # About sample_size rows, the same fraction from every hue class
+    if sample_size is None or len(df) <= sample_size:
+        return df
+    frac = sample_size / len(df)
+    if hue is None:
+        return df.sample(frac=frac, random_state=random_state)
+    return df.groupby(hue, observed=True, group_keys=False).sample(frac=frac, random_state=random_state)
+
+
+def pair_counts(i, j, bins, classes=None, n_classes=1):
+    # (n_classes, bins, bins) counts of the pairs (i, j) with one bincount
+    valid = (i >= 0) & (j >= 0)
+    key = i.astype('int64') * bins + j
+    if classes is not None:
+        valid &= classes >= 0
+        key += classes.astype('int64') * bins * bins
+    counts = np.bincount(key[valid], minlength=n_classes * bins * bins)
+    return counts.reshape(n_classes, bins, bins)
+
+
+def colour_image(counts, colours):
+    # RGBA image of (n_classes, ny, nx) counts: class colours mixed by their
+    # counts, opacity from the log total
+    total = counts.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(total > 0, counts / total, 0.0)
+    image = np.empty(total.shape + (4,))
+    image[..., :3] = np.tensordot(share, colours, axes=(0, 0))
+    peak = np.log1p(total.max()) or 1.0
+    image[..., 3] = np.log1p(total) / peak
+    return image
+
+
+def draw_counts(ax, counts, x_edges, y_edges, colours):
+    # counts are indexed [class, x bin, y bin]; the image wants rows of y
+    ax.imshow(colour_image(counts.transpose(0, 2, 1), colours), origin='lower', aspect='auto',
+              interpolation='nearest', extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+
+
+def palette(n):
+    import matplotlib
+    cmap = matplotlib.colormaps['tab10']
+    return np.array([cmap(k % 10)[:3] for k in range(n)])
+
+
+def hue_codes(df, hue):
+    if hue is None:
+        return None, [None]
+    codes, classes = pd.factorize(df[hue], sort=True)
+    return codes.astype('int32'), list(classes)
+
+
+def density_scatter(ax, x, y, bins=BINS, hue=None, x_limits=None, y_limits=None):
+    # Drop-in for ax.scatter(x, y) on many points: one 2-D histogram image
+    i, x_edges = bin_index(x, bins, x_limits)
+    j, y_edges = bin_index(y, bins, y_limits)
+    classes, names = (None, [None]) if hue is None else pd.factorize(np.asarray(hue), sort=True)
+    counts = pair_counts(i, j, bins, classes, len(names))
+    draw_counts(ax, counts, x_edges, y_edges, palette(len(names)))
+    return ax
+
+
+def histogram_pairgrid(df, columns=None, hue=None, bins=BINS, sample_size=None, height=2.5,
+                       output_path=None, random_state=0, limits=None):
+    # Pair plot of binned counts: 2-D histograms off the diagonal, per-class
+    # histograms on it. limits maps columns to (low, high); the others use
+    # their robust range. Returns the figure (saved and closed if
+    # output_path is given).
+    import matplotlib.pyplot as plt
+
+    df = stratified_sample(df, hue, sample_size, random_state)
+    if columns is None:
+        columns = [c for c in df.select_dtypes(include='number').columns if c != hue]
+    classes, names = hue_codes(df, hue)
+    colours = palette(len(names))
+    limits = limits or {}
+    binned = [bin_index(df[c].to_numpy(dtype='float64', na_value=np.nan), bins, limits.get(c)) for c in columns]
+
+    k = len(columns)
+    fig, axes = plt.subplots(k, k, figsize=(height * k, height * k), squeeze=False)
+    for row in range(k):
+        j, y_edges = binned[row]
+        for col in range(k):
+            ax = axes[row, col]
+            i, x_edges = binned[col]
+            if row == col:
+                counts = pair_counts(np.zeros_like(i), i, bins, classes, len(names))[:, 0, :]
+                for colour, class_counts in zip(colours, counts):
+                    ax.stairs(class_counts, x_edges, color=colour)
+            else:
+                draw_counts(ax, pair_counts(i, j, bins, classes, len(names)), x_edges, y_edges, colours)
+            if row == k - 1:
+                ax.set_xlabel(columns[col])
+            if col == 0:
+                ax.set_ylabel(columns[row])
+    if hue is not None:
+        handles = [plt.Line2D([], [], color=colour, lw=4) for colour in colours]
+        fig.legend(handles, [str(name) for name in names], title=hue, loc='center left', bbox_to_anchor=(1, 0.5))
+    fig.tight_layout()
+    if output_path is not None:
+        fig.savefig(output_path, bbox_inches='tight')
+        plt.close(fig)
+    return fig
@@ -0,0 +1,218 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+from scipy.ndimage import gaussian_filter1d
+
+# Mode of a sample without sorting it.
+#
+# Discrete and categorical data: values are hash-counted (pd.factorize and
+# np.bincount), O(n). Ties go to the smallest value, as with stats.mode.
+#
+# Continuous data: every value is unique, so counting values is meaningless
+# (stats.mode just returns the minimum). Instead the values are counted into
+# fixed-width bins, O(n), and the mode is the peak of the histogram or of its
+# Gaussian-smoothed version (a binned KDE), refined by a parabola through the
+# peak bin and its neighbours. The bins cover limits, by default the robust
+# range ROBUST_PERCENTILES of the data, so a single outlier cannot stretch
+# the grid; HistogramMode never holds more than MAX_BINS bins.
+#
+# ModeCounter and HistogramMode accumulate chunk by chunk (e.g. from
+# pd.read_csv(chunksize=...)). ModeCounter gives exactly the whole-array
+# result; HistogramMode fixes its bin width from the first chunk, so its
+# estimate can differ slightly from kde_mode on the whole array.
+
+ModeResult = namedtuple('ModeResult', ['mode', 'count'])
+
+MAX_BINS = 2 ** 16
+ROBUST_PERCENTILES = (0.5, 99.5)
+
+
+def value_counts(values):
+    # Distinct values (first-seen order) and their counts, missing values dropped
+    if not hasattr(values, 'dtype'):
+        values = pd.Series(values)
+    codes, uniques = pd.factorize(values)
+    return uniques, np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+
+def pick_mode(uniques, counts):
+    if len(counts) == 0 or counts.max() == 0:
+        return ModeResult(np.nan, 0)
+    top = counts.max()
+    tied = uniques[counts == top]
+    try:
+        mode = tied.min()
+    except TypeError:
+        # Unordered categories or mixed types: first seen wins
+        mode = tied[0]
+    return ModeResult(mode, int(top))
+
+
+def discrete_mode(values):
+    # Most frequent value of integer, boolean, string or categorical data
+    return pick_mode(*value_counts(values))
+
+
+class ModeCounter:
+    # Running value counts of discrete data, fed one chunk at a time
+
+    def __init__(self):
+        self.counts = pd.Series(dtype='int64')
+
+    def update(self, values):
+        uniques, counts = value_counts(values)
+        chunk = pd.Series(counts, index=np.asarray(uniques))
+        self.counts = chunk if self.counts.empty else self.counts.add(chunk, fill_value=0).astype('int64')
+        return self
+
+    def result(self):
+        return pick_mode(self.counts.index, self.counts.to_numpy())
+
+
+def finite(values):
+    x = np.asarray(values, dtype='float64').ravel()
+    return x[np.isfinite(x)]
+
+
+def robust_limits(x, percentiles=ROBUST_PERCENTILES):
+    # Range holding all but the extreme tails of x (percentiles by selection)
+    low, high = np.percentile(x, percentiles)
+    return float(low), float(high)
+
+
+def bin_width(x):
+    # Freedman-Diaconis width (quartiles by selection, not a sort), with a
+    # standard-deviation fallback for samples with a zero IQR
+    q25, q75 = np.percentile(x, [25, 75])
+    width = 2 * (q75 - q25) * len(x) ** (-1 / 3)
+    if width <= 0:
+        width = 3.49 * np.std(x) * len(x) ** (-1 / 3)
+    return width if width > 0 else 1.0
+
+
+def peak(counts):
+    # Position of the maximum in bin units, refined by a parabola through
+    # the peak and its two neighbours
+    i = int(np.argmax(counts))
+    if 0 < i < len(counts) - 1:
+        y0, y1, y2 = counts[i - 1:i + 2]
+        curvature = y0 - 2 * y1 + y2
+        if curvature < 0:
+            return i + 0.5 * (y0 - y2) / curvature
+    return float(i)
+
+
+def histogram_mode(values, bins='auto', limits=None):
+    # Mode from a single histogram over limits (bins as in np.histogram)
+    x = finite(values)
+    if len(x) == 0:
+        return np.nan
+    counts, edges = np.histogram(x, bins=bins, range=limits or robust_limits(x))
+    width = edges[1] - edges[0]
+    return edges[0] + (peak(counts.astype('float64')) + 0.5) * width
+
+
+class HistogramMode:
+    # Streaming histogram on a grid of fixed-width bins. The width is fixed by
+    # the first chunk (a fraction 1/oversample of its Freedman-Diaconis
+    # width) unless given. The grid covers limits if given, otherwise it
+    # grows to the robust range of every chunk, by at most its current span
+    # on each side per chunk (the tails of a small chunk are its outliers).
+    # Values off the grid are only tallied in below/above, so they cost no
+    # memory and cannot be the peak. Beyond max_bins, neighbouring bins are
+    # merged and the width doubles.
+
+    def __init__(self, width=None, oversample=10, limits=None, max_bins=MAX_BINS):
+        self.width = width
+        self.oversample = oversample
+        self.limits = limits
+        self.max_bins = max_bins
+        self.origin = None
+        self.counts = np.zeros(0, dtype='int64')
+        self.below = self.above = 0
+
+    def merge_bins(self):
+        # Halve the bin count: bins 2k and 2k + 1 become bin k
+        if len(self.counts) % 2:
+            self.counts = np.append(self.counts, 0)
+        self.counts = self.counts.reshape(-1, 2).sum(axis=1)
+        self.width *= 2
+
+    def cover(self, low, high):
+        # Extend the grid to [low, high]
+        if self.origin is None:
+            self.origin = np.floor(low / self.width) * self.width
+        while True:
+            start = min(np.floor((low - self.origin) / self.width), 0)
+            stop = max(np.floor((high - self.origin) / self.width) + 1, len(self.counts))
+            if stop - start <= self.max_bins:
+                break
+            self.merge_bins()
+        start, stop = int(start), int(stop)
+        if start < 0:
+            self.counts = np.concatenate([np.zeros(-start, dtype='int64'), self.counts])
+            self.origin += start * self.width
+            stop -= start
+        if stop > len(self.counts):
+            self.counts = np.concatenate([self.counts, np.zeros(stop - len(self.counts), dtype='int64')])
+
+    def update(self, values):
+        x = finite(values)
+        if len(x) == 0:
+            return self
+        if self.width is None:
+            self.width = bin_width(x) / self.oversample
+        low, high = self.limits or robust_limits(x)
+        if self.limits is None and self.origin is not None:
+            span = len(self.counts) * self.width
+            low = max(low, self.origin - span)
+            high = min(high, self.origin + 2 * span)
+        self.cover(low, high)
+        index = np.floor((x - self.origin) / self.width)
+        below, above = index < 0, index >= len(self.counts)
+        self.below += int(below.sum())
+        self.above += int(above.sum())
+        inside = index[~(below | above)].astype('int64')
+        self.counts += np.bincount(inside, minlength=len(self.counts))
+        return self
+
+    def bandwidth(self):
+        # Silverman's rule of thumb, with the spread read off the histogram
+        n = self.counts.sum()
+        centres = self.origin + (np.arange(len(self.counts)) + 0.5) * self.width
+        mean = (self.counts * centres).sum() / n
+        std = np.sqrt((self.counts * (centres - mean) ** 2).sum() / n)
+        cumulative = np.cumsum(self.counts)
+        q25, q75 = centres[np.searchsorted(cumulative, [0.25 * n, 0.75 * n])]
+        spread = min(std, (q75 - q25) / 1.34) or std
+        return 0.9 * spread * n ** -0.2
+
+    def mode(self, bandwidth='silverman'):
+        # bandwidth in data units; 0 takes the peak of the raw histogram
+        if self.counts.sum() == 0:
+            return np.nan
+        if bandwidth == 'silverman':
+            bandwidth = self.bandwidth()
+        counts = self.counts.astype('float64')
+        if bandwidth:
+            counts = gaussian_filter1d(counts, bandwidth / self.width, mode='constant')
+        return self.origin + (peak(counts) + 0.5) * self.width
+
+
+def kde_mode(values, bandwidth='silverman', oversample=10, limits=None):
+    # Peak of a binned Gaussian KDE of a continuous sample
+    return HistogramMode(oversample=oversample, limits=limits).update(values).mode(bandwidth)
+
+
+def estimate_mode(values, kind='auto'):
+    # kind 'discrete' counts values, 'continuous' uses the KDE peak; 'auto'
+    # decides from the dtype (floats are continuous)
+    if kind == 'auto':
+        dtype = values.dtype if hasattr(values, 'dtype') else np.asarray(values).dtype
+        kind = 'continuous' if pd.api.types.is_float_dtype(dtype) else 'discrete'
+    if kind == 'continuous':
+        return kde_mode(values)
+    if kind == 'discrete':
+        return discrete_mode(values).mode
+    raise ValueError(f"Unknown kind {kind!r}")
@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Univariate profile of every numeric column of a DataFrame: count, missing,
+# mean, variance, std, min, max, range, skewness, kurtosis and quantiles
+# (with IQR and quartile deviation when both quartiles are requested).
+#
+# Each column is handled in one pass over its values: the central moments
+# come from one set of deviations, and min, max and all quantiles come from
+# a single np.partition call (O(n), no full sort). Columns are independent,
+# so wide tables can be profiled on a thread pool; numpy releases the GIL in
+# the heavy parts.
+#
+# Conventions follow eda.py: population variance (np.var), biased skewness
+# and Fisher kurtosis (scipy.stats defaults), linearly interpolated
+# quantiles (np.percentile).
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+def quantile_positions(n, quantiles):
+    # Lower/upper order statistics and weights for linear interpolation
+    positions = np.asarray(quantiles, dtype='float64') * (n - 1)
+    lower = np.floor(positions).astype('int64')
+    upper = np.minimum(lower + 1, n - 1)
+    return lower, upper, positions - lower
+
+
+def column_profile(values, quantiles=QUANTILES):
+    values = np.asarray(values, dtype='float64')
+    missing = np.isnan(values)
+    x = values[~missing] if missing.any() else values.copy()
+    n = len(x)
+    row = {'count': n, 'missing': int(missing.sum())}
+    if n == 0:
+        nan_fields = ['mean', 'variance', 'std', 'min', 'max', 'range', 'skew', 'kurtosis']
+        row.update(dict.fromkeys(nan_fields + [quantile_name(q) for q in quantiles], np.nan))
+        return row
+
+    # Moments from one array of deviations
+    mean = x.sum() / n
+    d = x - mean
+    d2 = d * d
+    m2 = d2.sum() / n
+    m3 = (d2 * d).sum() / n
+    m4 = (d2 * d2).sum() / n
+
+    # One selection for min, max and every quantile
+    lower, upper, weight = quantile_positions(n, quantiles)
+    kth = np.unique(np.concatenate([[0, n - 1], lower, upper]))
+    x.partition(kth)
+    picked = x[lower] + weight * (x[upper] - x[lower])
+
+    row.update({
+        'mean': mean,
+        'variance': m2,
+        'std': np.sqrt(m2),
+        'min': x[0],
+        'max': x[n - 1],
+        'range': x[n - 1] - x[0],
+        'skew': m3 / m2 ** 1.5 if m2 > 0 else np.nan,
+        'kurtosis': m4 / m2 ** 2 - 3.0 if m2 > 0 else np.nan,
+    })
+    for q, value in zip(quantiles, picked):
+        row[quantile_name(q)] = value
+    return row
+
+
+def quantile_name(q):
+    return 'median' if q == 0.5 else f'q{q * 100:g}'
+
+
+def profile(df, quantiles=QUANTILES, columns=None, n_jobs=1):
+    # One row per numeric column. n_jobs > 1 (or None for all cores)
+    # profiles columns on a thread pool.
+    if columns is None:
+        columns = df.select_dtypes(include='number').columns
+    quantiles = tuple(quantiles)
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    def run(column):
+        return column_profile(df[column].to_numpy(dtype='float64', na_value=np.nan), quantiles)
+
+    if n_jobs == 1:
+        rows = [run(column) for column in columns]
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+            rows = list(pool.map(run, columns))
+
+    result = pd.DataFrame(rows, index=pd.Index(columns, name='column'))
+    if 0.25 in quantiles and 0.75 in quantiles:
+        result['iqr'] = result['q75'] - result['q25']
+        result['quartile_deviation'] = result['iqr'] / 2
+    result['count'] = result['count'].astype('int64')
+    result['missing'] = result['missing'].astype('int64')
+    return result
@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.stattools import adfuller
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from cache import CACHE_DIR  # noqa: E402
+
+# Automatic ARIMA(p, d, q) order selection for time_series.py.
+#
+# d is the number of differences the ADF test needs to call the series
+# stationary. (p, q) is then searched level by level (p + q = 0, 1, 2, ...):
+# each level is fitted in parallel, every candidate starts from the
+# parameters of an already fitted neighbour (one AR or MA term fewer), and
+# only candidates within prune_aic of the best AIC so far are expanded, so
+# most of a large grid is never fitted.
+#
+# Every fitted order is cached as its AIC and parameters only, in one JSON
+# file per series named by a hash of the series, along with the winning
+# order. A rerun on an unchanged series rebuilds the winning results with
+# model.filter(params) (no optimisation, no pickles) instead of searching
+# again; only series whose data changed are refitted. The least recently
+# used files beyond ARIMA_CACHE_SIZE series are deleted. Several processes
+# may share the cache directory: a file another process evicts is simply
+# read as a miss.
+
+ARIMA_CACHE_DIR = os.path.join(CACHE_DIR, 'arima')
+ARIMA_CACHE_SIZE = 1000
+
+
+def series_digest(series):
+    # Covers the values and, for a Series, its index
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(series, dtype='float64').tobytes())
+    if isinstance(series, pd.Series):
+        digest.update(pd.util.hash_pandas_object(series.index).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def choose_d(values, max_d=2, alpha=0.05):
+    # Smallest number of differences whose ADF p-value is below alpha
+    values = np.asarray(values, dtype='float64')
+    values = values[~np.isnan(values)]
+    for d in range(max_d + 1):
+        if len(values) < 10 or adfuller(values)[1] < alpha:
+            return d
+        values = np.diff(values)
+    return max_d
+
+
+def cache_path(digest, cache_dir):
+    return os.path.join(cache_dir, f'{digest}.json')
+
+
+def fit_key(order, trend):
+    p, d, q = order
+    return f'{p}_{d}_{q}_{trend}'
+
+
+def read_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'fits': {}, 'best': None}
+
+
+def write_cache(cache, path):
+    # The temporary file is per process, so concurrent writers never share it
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+def evict(cache_dir=None, keep=None):
+    # Delete the least recently used series files beyond keep (default
+    # ARIMA_CACHE_SIZE). Files removed meanwhile by another process are
+    # skipped.
+    cache_dir = cache_dir or ARIMA_CACHE_DIR
+    keep = ARIMA_CACHE_SIZE if keep is None else keep
+    try:
+        names = os.listdir(cache_dir)
+    except FileNotFoundError:
+        return
+    entries = []
+    for name in names:
+        if name.endswith('.json'):
+            path = os.path.join(cache_dir, name)
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except FileNotFoundError:
+                continue
+    entries.sort(reverse=True)
+    for _, path in entries[keep:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def rebuild_results(series, order, trend, params):
+    # Results of a cached fit: the Kalman filter run at the stored parameters
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = ARIMA(series, order=order, trend=trend)
+        return model.filter(np.array([params[name] for name in model.param_names]))
+
+
+def warm_start(model, neighbour_params):
+    # Neighbour's parameters by name; the added AR/MA lag starts at 0
+    if neighbour_params is None:
+        return None
+    return np.array([neighbour_params.get(name, 0.0) for name in model.param_names])
+
+
+def near_unit_root(results, tol=1e-3):
+    # AR or MA roots on the unit circle: a degenerate fit whose AIC cannot be
+    # trusted (as auto.arima rejects them)
+    roots = np.concatenate([np.atleast_1d(results.arroots), np.atleast_1d(results.maroots)])
+    return bool(len(roots)) and np.abs(roots).min() < 1 + tol
+
+
+def fit_order(task):
+    # Fit one order and return (order, aic, params, cacheable). params is a
+    # {name: value} dict, or the reason the fit is unusable; failed fits
+    # are not cached, rejected ones are.
+    series, order, trend, neighbour_params = task
+    warnings.filterwarnings('ignore')
+    try:
+        model = ARIMA(series, order=order, trend=trend)
+        results = model.fit(start_params=warm_start(model, neighbour_params))
+        if near_unit_root(results):
+            return order, np.inf, 'rejected: AR/MA root on the unit circle', True
+        return order, float(results.aic), dict(zip(model.param_names, map(float, results.params))), True
+    except Exception as exc:
+        return order, np.inf, f'{type(exc).__name__}: {exc}', False
+
+
+def search_order(series, max_p=3, max_q=3, d=None, max_d=2, trend=None, prune_aic=2.0,
+                 n_jobs=None, cache_dir=None, verbose=False, evict_cache=True):
+    # Returns {'order', 'aic', 'results', 'candidates', 'cached'}. series is a
+    # pd.Series (its index is kept for forecasting) or a 1-D array.
+    # evict_cache=False skips the eviction after a new search, for callers
+    # that search many series and evict once per batch themselves.
+    cache_dir = cache_dir or ARIMA_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = series_digest(series)
+    if d is None:
+        d = choose_d(series, max_d)
+    # Constant only for undifferenced series, as ARIMA does by default
+    trend = trend or ('c' if d == 0 else 'n')
+
+    path = cache_path(digest, cache_dir)
+    cache = read_cache(path)
+    config = {'max_p': max_p, 'max_q': max_q, 'd': d, 'trend': trend, 'prune_aic': prune_aic}
+    best = cache['best']
+    if best is not None and best['config'] == config:
+        order = tuple(best['order'])
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        candidates = pd.DataFrame(best['candidates'])
+        candidates['order'] = candidates['order'].map(tuple)
+        return {'order': order, 'aic': best['aic'],
+                'results': rebuild_results(series, order, trend, cache['fits'][fit_key(order, trend)]['params']),
+                'candidates': candidates, 'cached': True}
+
+    fitted = {}  # (p, q) -> (aic, params)
+    candidates = []
+    best_aic = np.inf
+    level = [(0, 0)]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    # n_jobs=1 fits in this process
+    pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    mapper = pool.map if pool is not None else map
+    try:
+        while level:
+            tasks = []
+            done = []
+            for p, q in level:
+                entry = cache['fits'].get(fit_key((p, d, q), trend))
+                if entry is not None:
+                    done.append(((p, d, q), entry['aic'], entry['params'] or entry['error'], False))
+                    continue
+                # Warm start from the better fitted neighbour
+                neighbours = [fitted[k] for k in ((p - 1, q), (p, q - 1)) if k in fitted and isinstance(fitted[k][1], dict)]
+                start = min(neighbours, key=lambda item: item[0])[1] if neighbours else None
+                tasks.append((series, (p, d, q), trend, start))
+            for order, aic, params, cacheable in done + list(mapper(fit_order, tasks)):
+                if cacheable:
+                    cache['fits'][fit_key(order, trend)] = {
+                        'aic': aic,
+                        'params': params if isinstance(params, dict) else None,
+                        'error': params if isinstance(params, str) else '',
+                    }
+                fitted[(order[0], order[2])] = (aic, params)
+                candidates.append({'order': order, 'aic': aic, 'error': params if isinstance(params, str) else ''})
+                if verbose:
+                    print(f"ARIMA{order}: AIC {aic:.2f}")
+            best_aic = min(best_aic, min(fitted[(p, q)][0] for p, q in level))
+
+            # Expand only candidates close enough to the best AIC so far
+            survivors = [k for k in level if fitted[k][0] <= best_aic + prune_aic]
+            level = sorted({
+                child for p, q in survivors for child in ((p + 1, q), (p, q + 1))
+                if child[0] <= max_p and child[1] <= max_q and child not in fitted
+            })
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    (p, q), (aic, _) = min(fitted.items(), key=lambda item: item[1][0])
+    if not np.isfinite(aic):
+        raise RuntimeError(f"No ARIMA order could be fitted: {candidates[0]['error']}")
+    order = (p, d, q)
+    results = rebuild_results(series, order, trend, fitted[(p, q)][1])
+    candidates = pd.DataFrame(candidates).sort_values('aic', ignore_index=True)
+
+    cache['best'] = {'order': order, 'aic': aic, 'config': config,
+                     'candidates': candidates.assign(order=candidates['order'].map(list)).to_dict('list')}
+    write_cache(cache, path)
+    if evict_cache:
+        evict(cache_dir)
+    return {'order': order, 'aic': aic, 'results': results, 'candidates': candidates, 'cached': False}
@@ -0,0 +1,217 @@
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.stattools import adfuller
+
+import arima_search
+from arima_search import evict, search_order
+from decomposition import decompose
+
+# time_series.py (decomposition, ADF test, ARIMA fit and forecast) applied to
+# many series at once. Input is a long-format frame with one row per
+# (series_id, timestamp, value); output is one row of results per series plus
+# a long frame of forecasts.
+#
+# Series are sent to a process pool in batches, so the per-task overhead is
+# paid once per batch rather than once per series. Every stage of every
+# series runs in its own try/except: a failure is recorded in the 'error'
+# column and the remaining stages and series carry on.
+
+# Long-format CSV with series_id, timestamp and value columns
+file_path = '/home/gilbert/MyCodes/DataScience data/sku_sales.csv'  # Replace with actual path
+output_path = 'batch_results.csv'
+forecast_path = 'batch_forecasts.csv'
+
+RESULT_COLUMNS = [
+    'series_id', 'n_obs', 'trend_strength', 'seasonal_strength',
+    'adf_statistic', 'adf_pvalue', 'aic', 'bic', 'status', 'error',
+]
+
+
+def split_series(df, id_col='series_id', time_col='timestamp', value_col='value'):
+    # Yields (series_id, timestamps, values) per series, sorted by time. One
+    # stable sort of the whole frame replaces a groupby per series.
+    codes, ids = pd.factorize(df[id_col], sort=True)
+    timestamps = pd.to_datetime(df[time_col]).to_numpy()
+    order = np.lexsort((timestamps, codes))
+    codes = codes[order]
+    timestamps = timestamps[order]
+    values = df[value_col].to_numpy(dtype='float64')[order]
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.concatenate([[0], bounds])
+    ends = np.concatenate([bounds, [len(codes)]])
+    for start, end in zip(starts, ends):
+        if end > start:
+            yield ids[codes[start]], timestamps[start:end], values[start:end]
+
+
+def strength(component, resid):
+    # Strength of a trend or seasonal component (Hyndman & Athanasopoulos):
+    # 1 - Var(resid) / Var(component + resid), clipped at 0
+    ok = ~(np.isnan(component) | np.isnan(resid))
+    if ok.sum() < 3:
+        return np.nan
+    total = np.var(component[ok] + resid[ok])
+    return max(0.0, 1.0 - np.var(resid[ok]) / total) if total > 0 else np.nan
+
+
+def forecast_timestamps(timestamps, steps, freq):
+    freq = freq or (pd.infer_freq(pd.DatetimeIndex(timestamps)) if len(timestamps) >= 3 else None)
+    if freq is None:
+        return np.full(steps, np.datetime64('NaT'), dtype='datetime64[ns]')
+    return pd.date_range(start=timestamps[-1], periods=steps + 1, freq=freq)[1:].to_numpy()
+
+
+def analyze_series(series_id, timestamps, values, period=12, model='additive', order=(1, 1, 1), steps=12, freq=None):
+    # Returns (result row, forecast values or None)
+    row = dict.fromkeys(RESULT_COLUMNS, np.nan)
+    row.update(series_id=series_id, n_obs=len(values), status='ok', error='')
+    errors = []
+    forecast = None
+
+    if len(values) >= 2 * period:
+        try:
+            decomposition = decompose(values, period, model)
+            trend, seasonal, resid = decomposition.trend, decomposition.seasonal, decomposition.resid
+            if model == 'multiplicative':
+                # Compare components on the log scale, where they add up
+                trend, seasonal, resid = np.log(trend), np.log(seasonal), np.log(resid)
+            row['trend_strength'] = strength(trend, resid)
+            row['seasonal_strength'] = strength(seasonal, resid)
+        except Exception as exc:
+            errors.append(f'decompose: {type(exc).__name__}: {exc}')
+    else:
+        errors.append(f'decompose: needs {2 * period} observations, got {len(values)}')
+
+    try:
+        adf = adfuller(values)
+        row['adf_statistic'], row['adf_pvalue'] = adf[0], adf[1]
+    except Exception as exc:
+        errors.append(f'adf: {type(exc).__name__}: {exc}')
+
+    try:
+        if order == 'auto':
+            # Searched per series; unchanged series reuse their cached model.
+            # run_batch evicts old cache entries once per batch.
+            fit = search_order(values, n_jobs=1, evict_cache=False)['results']
+        else:
+            fit = ARIMA(values, order=order).fit()
+        row['aic'], row['bic'] = fit.aic, fit.bic
+        forecast = (forecast_timestamps(timestamps, steps, freq), np.asarray(fit.forecast(steps=steps)))
+    except Exception as exc:
+        errors.append(f'arima: {type(exc).__name__}: {exc}')
+
+    if errors:
+        # 'failed' when no stage produced a result
+        produced = any(not pd.isna(row[c]) for c in ('trend_strength', 'adf_statistic', 'aic'))
+        row['status'] = 'partial' if produced else 'failed'
+        row['error'] = '; '.join(errors)
+    return row, forecast
+
+
+def _run_batch(task):
+    series, params = task
+    warnings.filterwarnings('ignore')
+    results = []
+    for series_id, timestamps, values in series:
+        try:
+            results.append(analyze_series(series_id, timestamps, values, **params))
+        except Exception as exc:
+            # Anything analyze_series did not catch still only loses this series
+            row = dict.fromkeys(RESULT_COLUMNS, np.nan)
+            row.update(series_id=series_id, n_obs=len(values), status='failed', error=f'{type(exc).__name__}: {exc}')
+            results.append((row, None))
+    return results
+
+
+def batches(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def run_batch(df, period=12, model='additive', order=(1, 1, 1), steps=12, freq=None,
+              id_col='series_id', time_col='timestamp', value_col='value',
+              n_jobs=None, batch_size=64, progress=True, cache_size=None):
+    # Returns (results, forecasts). results has one row per series (see
+    # RESULT_COLUMNS); forecasts is long format (series_id, step, timestamp,
+    # forecast). order='auto' selects each series' order with arima_search;
+    # its cache then keeps the cache_size most recently used series (by
+    # default at least one entry per series of df), evicted after each
+    # batch. n_jobs=1 runs in this process, which is easier to debug.
+    order = order if order == 'auto' else tuple(order)
+    params = {'period': period, 'model': model, 'order': order, 'steps': steps, 'freq': freq}
+    tasks = [(batch, params) for batch in batches(split_series(df, id_col, time_col, value_col), batch_size)]
+    n_series = sum(len(batch) for batch, _ in tasks)
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if cache_size is None:
+        cache_size = max(arima_search.ARIMA_CACHE_SIZE, n_series)
+
+    rows, forecasts = [], []
+    done = failed = 0
+    started = time.perf_counter()
+    next_report = 0.0
+
+    def collect(results):
+        nonlocal done, failed, next_report
+        for row, forecast in results:
+            rows.append(row)
+            failed += row['status'] == 'failed'
+            if forecast is not None:
+                forecasts.append((row['series_id'], forecast))
+        done += len(results)
+        if order == 'auto':
+            evict(keep=cache_size)
+        elapsed = time.perf_counter() - started
+        if progress and (elapsed >= next_report or done == n_series):
+            print(f"Processed {done}/{n_series} series ({failed} failed) in {elapsed:.1f}s", file=sys.stderr, flush=True)
+            next_report = elapsed + 5.0
+
+    if n_jobs == 1:
+        for task in tasks:
+            collect(_run_batch(task))
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            for future in as_completed([pool.submit(_run_batch, task) for task in tasks]):
+                collect(future.result())
+
+    results = pd.DataFrame(rows, columns=RESULT_COLUMNS)
+    results['n_obs'] = results['n_obs'].astype('int32')
+    results['status'] = pd.Categorical(results['status'], categories=['ok', 'partial', 'failed'])
+    results = results.sort_values('series_id', ignore_index=True)
+
+    if forecasts:
+        forecast_frame = pd.DataFrame({
+            id_col: np.repeat([series_id for series_id, _ in forecasts], steps),
+            'step': np.tile(np.arange(1, steps + 1, dtype='int16'), len(forecasts)),
+            'timestamp': np.concatenate([timestamps for _, (timestamps, _) in forecasts]),
+            'forecast': np.concatenate([values for _, (_, values) in forecasts]),
+        }).sort_values([id_col, 'step'], ignore_index=True)
+    else:
+        forecast_frame = pd.DataFrame(columns=[id_col, 'step', 'timestamp', 'forecast'])
+    return results.rename(columns={'series_id': id_col}), forecast_frame
+
+
+def main():
+    df = pd.read_csv(file_path)
+    results, forecasts = run_batch(df, period=12, model='multiplicative', order=(1, 1, 1), steps=12)
+    print(results['status'].value_counts())
+    results.to_csv(output_path, index=False)
+    forecasts.to_csv(forecast_path, index=False)
+    print(f"Results: {output_path}")
+    print(f"Forecasts: {forecast_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+
+# Seasonal decomposition for time_series.py and for many series at once.
+#
+# decompose() is classical decomposition (as seasonal_decompose) computed on
+# a 2-D (n_series, n_obs) array in one pass: the centred moving average is a
+# difference of cumulative sums, the seasonal means are one reshape, and the
+# trend is extrapolated linearly at both ends so there are no NaN edges.
+# A single series (array or pd.Series) works the same way.
+#
+# multi_seasonal_decompose() removes several seasonal periods in turn, as
+# MSTL does, with the batched classical step in place of STL; method='stl'
+# uses statsmodels' STL/MSTL instead (one series at a time).
+#
+# OnlineDecomposer updates level, slope and seasonal estimates as each new
+# observation arrives (Holt-Winters smoothing), for all series at once,
+# without keeping the history.
+
+
+class Decomposition:
+    def __init__(self, observed, trend, seasonal, resid):
+        self.observed = observed
+        self.trend = trend
+        self.seasonal = seasonal
+        self.resid = resid
+
+
+def as_2d(values):
+    values = np.asarray(values, dtype='float64')
+    return values[np.newaxis, :] if values.ndim == 1 else values
+
+
+def wrap(observed, trend, seasonal, resid, like):
+    # Same shape and type as the input: 1-D arrays or Series for one series
+    if isinstance(like, pd.Series):
+        parts = [pd.Series(x[0], index=like.index, name=like.name) for x in (observed, trend, seasonal, resid)]
+        return Decomposition(*parts)
+    if np.ndim(like) == 1:
+        return Decomposition(observed[0], trend[0], seasonal[0], resid[0])
+    return Decomposition(observed, trend, seasonal, resid)
+
+
+def moving_average(Y, period):
+    # Centred moving average along axis 1 (2 x period MA for even periods),
+    # NaN where the window does not fit, as seasonal_decompose computes it
+    n = Y.shape[1]
+    c = np.concatenate([np.zeros((Y.shape[0], 1)), np.cumsum(Y, axis=1)], axis=1)
+    trend = np.full(Y.shape, np.nan)
+    if period % 2:
+        half = period // 2
+        if n >= period:
+            trend[:, half:n - half] = (c[:, period:] - c[:, :n - period + 1]) / period
+    else:
+        half = period // 2
+        if n > period:
+            sums = c[:, period:] - c[:, :n - period + 1]
+            trend[:, half:n - half] = (sums[:, :-1] + sums[:, 1:]) / (2 * period)
+    return trend
+
+
+def extrapolate(trend, npoints):
+    # Fill the NaN ends by a least-squares line through the npoints nearest
+    # trend values at each end (seasonal_decompose's extrapolate_trend)
+    valid = np.flatnonzero(~np.isnan(trend[0]))
+    if len(valid) < 2:
+        return trend
+    front, back = valid[0], valid[-1]
+
+    def line(x):
+        y = trend[:, x]
+        xm = x.mean()
+        slope = ((x - xm) * (y - y.mean(axis=1, keepdims=True))).sum(axis=1) / ((x - xm) ** 2).sum()
+        return slope[:, np.newaxis], (y.mean(axis=1) - slope * xm)[:, np.newaxis]
+
+    slope, intercept = line(np.arange(front, min(front + npoints, back)))
+    trend[:, :front] = slope * np.arange(front) + intercept
+    slope, intercept = line(np.arange(max(front, back - npoints), back))
+    trend[:, back + 1:] = slope * np.arange(back + 1, trend.shape[1]) + intercept
+    return trend
+
+
+def seasonal_means(detrended, period):
+    # Mean of every phase of the cycle, one reshape for all series
+    n_series, n = detrended.shape
+    cycles = -(-n // period)
+    padded = np.full((n_series, cycles * period), np.nan)
+    padded[:, :n] = detrended
+    return np.nanmean(padded.reshape(n_series, cycles, period), axis=1)
+
+
+def _classical(Y, period, model, extrapolate_trend=True):
+    if model == 'multiplicative' and (Y <= 0).any():
+        raise ValueError("Multiplicative seasonality is not appropriate for zero and negative values")
+    trend = moving_average(Y, period)
+    if extrapolate_trend:
+        trend = extrapolate(trend, period)
+    if model == 'multiplicative':
+        means = seasonal_means(Y / trend, period)
+        means /= means.mean(axis=1, keepdims=True)
+    else:
+        means = seasonal_means(Y - trend, period)
+        means -= means.mean(axis=1, keepdims=True)
+    seasonal = np.tile(means, -(-Y.shape[1] // period))[:, :Y.shape[1]]
+    resid = Y / (trend * seasonal) if model == 'multiplicative' else Y - trend - seasonal
+    return trend, seasonal, resid
+
+
+def decompose(values, period, model='additive', extrapolate_trend=True):
+    # Classical decomposition of one series or of every row of a 2-D array.
+    # Series must not contain NaN.
+    if model not in ('additive', 'multiplicative'):
+        raise ValueError(f"Unknown model {model!r}")
+    Y = as_2d(values)
+    if Y.shape[1] < 2 * period:
+        raise ValueError(f"Need at least {2 * period} observations, got {Y.shape[1]}")
+    if np.isnan(Y).any():
+        raise ValueError("Classical decomposition does not handle missing values; fill them first")
+    trend, seasonal, resid = _classical(Y, period, model, extrapolate_trend)
+    return wrap(Y, trend, seasonal, resid, values)
+
+
+def multi_seasonal_decompose(values, periods, iterations=2, method='classical'):
+    # Additive decomposition with several seasonal periods (e.g. (24, 168)
+    # for hourly data). Returns a Decomposition whose seasonal attribute is a
+    # dict {period: component}.
+    periods = sorted(periods)
+    Y = as_2d(values)
+    if method == 'stl':
+        from statsmodels.tsa.seasonal import MSTL, STL
+        trend, resid = np.empty_like(Y), np.empty_like(Y)
+        seasonal = {p: np.empty_like(Y) for p in periods}
+        for i, row in enumerate(Y):
+            fit = (STL(row, period=periods[0]) if len(periods) == 1 else MSTL(row, periods=periods)).fit()
+            trend[i], resid[i] = fit.trend, fit.resid
+            components = np.asarray(fit.seasonal).reshape(len(row), -1)
+            for j, p in enumerate(periods):
+                seasonal[p][i] = components[:, j]
+    elif method == 'classical':
+        seasonal = {p: np.zeros_like(Y) for p in periods}
+        for _ in range(iterations):
+            for p in periods:
+                # Re-estimate this period's component with the others removed
+                others = sum(seasonal[q] for q in periods if q != p)
+                _, seasonal[p], _ = _classical(Y - others, p, 'additive')
+        deseasonalised = Y - sum(seasonal.values())
+        trend = extrapolate(moving_average(deseasonalised, periods[-1]), periods[-1])
+        resid = deseasonalised - trend
+    else:
+        raise ValueError(f"Unknown method {method!r}")
+
+    if isinstance(values, pd.Series) or np.ndim(values) == 1:
+        result = wrap(Y, trend, np.zeros_like(Y), resid, values)
+        result.seasonal = {p: wrap(Y, trend, s, resid, values).seasonal for p, s in seasonal.items()}
+        return result
+    return Decomposition(Y, trend, seasonal, resid)
+
+
+class OnlineDecomposer:
+    # Holt-Winters style decomposition that is updated one observation (or
+    # one block) at a time for n_series series in parallel. State is the
+    # current level, slope and the last seasonal value of each phase.
+
+    def __init__(self, period, model='additive', alpha=0.2, beta=0.05, gamma=0.1):
+        if model not in ('additive', 'multiplicative'):
+            raise ValueError(f"Unknown model {model!r}")
+        self.period = period
+        self.model = model
+        self.alpha, self.beta, self.gamma = alpha, beta, gamma
+        self.level = self.slope = self.seasonal = None
+        self.phase = 0
+
+    def initialize(self, values):
+        # Seed the state from a classical decomposition of an initial window
+        # (at least two full periods)
+        Y = as_2d(values)
+        trend, seasonal, _ = _classical(Y, self.period, self.model)
+        self.level = trend[:, -1].copy()
+        self.slope = (trend[:, -1] - trend[:, -1 - self.period]) / self.period
+        # Column k holds the seasonal value of phase k (t % period == k)
+        self.seasonal = seasonal[:, :self.period].copy()
+        self.phase = Y.shape[1] % self.period
+        return self
+
+    def update(self, values):
+        # values: one observation per series (shape (n_series,)), or a block
+        # (n_series, k). Returns the Decomposition of the new points.
+        if self.level is None:
+            raise RuntimeError("OnlineDecomposer is not initialized; call initialize() first")
+        block = np.asarray(values, dtype='float64')
+        block = block.reshape(len(self.level), -1)
+        trend, seasonal, resid = (np.empty_like(block) for _ in range(3))
+        a, b, g = self.alpha, self.beta, self.gamma
+        for t in range(block.shape[1]):
+            y = block[:, t]
+            s = self.seasonal[:, self.phase]
+            previous = self.level
+            if self.model == 'multiplicative':
+                self.level = a * y / s + (1 - a) * (previous + self.slope)
+                self.slope = b * (self.level - previous) + (1 - b) * self.slope
+                s = g * y / self.level + (1 - g) * s
+                resid[:, t] = y / (self.level * s)
+            else:
+                self.level = a * (y - s) + (1 - a) * (previous + self.slope)
+                self.slope = b * (self.level - previous) + (1 - b) * self.slope
+                s = g * (y - self.level) + (1 - g) * s
+                resid[:, t] = y - self.level - s
+            self.seasonal[:, self.phase] = s
+            trend[:, t], seasonal[:, t] = self.level, s
+            self.phase = (self.phase + 1) % self.period
+        if np.ndim(values) == 1 and len(self.level) == 1:
+            return Decomposition(block[0], trend[0], seasonal[0], resid[0])
+        return Decomposition(block, trend, seasonal, resid)
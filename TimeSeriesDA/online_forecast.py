@@ -0,0 +1,163 @@
+import json
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.arima.model import ARIMA
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from ingest import read_dataset  # noqa: E402
+
+# Incremental forecast updates for a fitted ARIMA model. Instead of re-reading
+# the full history and refitting, the Kalman filter state at the end of the
+# last update is stored (a few numbers per series) and new observations are
+# filtered forward from it with the fitted parameters, as statsmodels'
+# results.extend() does. An update costs O(new observations) and a forecast
+# O(steps), whatever the length of the history.
+#
+# Parameters are kept fixed between updates; refit periodically (e.g. with
+# arima_search.py) and start a new state from the refitted results.
+
+# Stored state and the new observations for the monthly refresh
+state_path = 'arima_state.json'
+new_data_path = '/home/gilbert/MyCodes/DataScience data/airline-passengers-new.csv'  # Replace with actual path
+
+
+class OnlineForecaster:
+    def __init__(self, order, trend, params, state, state_cov, nobs, last_timestamp=None, freq=None):
+        if trend not in ('n', 'c'):
+            # Time trends make the state space time-varying
+            raise ValueError(f"Only trend='n' or trend='c' can be updated online, got {trend!r}")
+        self.order = tuple(order)
+        self.trend = trend
+        self.params = np.asarray(params, dtype='float64')
+        self.state = np.asarray(state, dtype='float64')
+        self.state_cov = np.asarray(state_cov, dtype='float64')
+        self.nobs = int(nobs)
+        self.last_timestamp = pd.Timestamp(last_timestamp) if last_timestamp is not None else None
+        self.freq = freq
+        self._matrices = None
+
+    @classmethod
+    def from_results(cls, results):
+        # Start from fitted ARIMA results (e.g. time_series.py's model_fit)
+        model = results.model
+        index = model._index
+        if not isinstance(index, pd.DatetimeIndex) or index.freq is None:
+            index = None
+        return cls(
+            order=model.order,
+            trend=model.trend,
+            params=results.params,
+            state=results.predicted_state[:, -1],
+            state_cov=results.predicted_state_cov[:, :, -1],
+            nobs=results.nobs,
+            last_timestamp=index[-1] if index is not None else None,
+            freq=index.freqstr if index is not None else None,
+        )
+
+    @classmethod
+    def fit(cls, series, order=(1, 1, 1), trend=None):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return cls.from_results(ARIMA(series, order=order, trend=trend).fit())
+
+    def _model(self, endog):
+        model = ARIMA(endog, order=self.order, trend=self.trend)
+        model.ssm.initialize_known(self.state, self.state_cov)
+        return model
+
+    def update(self, new_values):
+        # Filter the new observations forward from the stored state
+        values = np.asarray(new_values, dtype='float64')
+        if len(values) == 0:
+            return self
+        if isinstance(new_values, pd.Series) and isinstance(new_values.index, pd.DatetimeIndex):
+            self.last_timestamp = new_values.index[-1]
+        elif self.last_timestamp is not None:
+            self.last_timestamp += len(values) * pd.tseries.frequencies.to_offset(self.freq)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            results = self._model(values).filter(self.params)
+        self.state = results.predicted_state[:, -1]
+        self.state_cov = results.predicted_state_cov[:, :, -1]
+        self.nobs += len(values)
+        return self
+
+    def matrices(self):
+        # Time-invariant state space matrices for the fitted parameters
+        if self._matrices is None:
+            model = ARIMA(np.zeros(2), order=self.order, trend=self.trend)
+            model.update(self.params)
+            ssm = model.ssm
+
+            def first(name, ndim):
+                # Time-varying matrices carry a trailing time axis
+                matrix = ssm[name]
+                return matrix[..., 0] if matrix.ndim > ndim else matrix
+
+            self._matrices = {
+                'design': first('design', 2),
+                'obs_intercept': first('obs_intercept', 1),
+                'obs_cov': first('obs_cov', 2),
+                'transition': first('transition', 2),
+                'state_intercept': first('state_intercept', 1),
+                'selected_cov': first('selection', 2) @ first('state_cov', 2) @ first('selection', 2).T,
+            }
+        return self._matrices
+
+    def forecast(self, steps=12, return_var=False):
+        # Propagate the stored state steps ahead without touching the history
+        m = self.matrices()
+        state, cov = self.state.copy(), self.state_cov.copy()
+        mean = np.empty(steps)
+        var = np.empty(steps)
+        for h in range(steps):
+            mean[h] = (m['design'] @ state + m['obs_intercept'])[0]
+            var[h] = (m['design'] @ cov @ m['design'].T + m['obs_cov'])[0, 0]
+            state = m['transition'] @ state + m['state_intercept']
+            cov = m['transition'] @ cov @ m['transition'].T + m['selected_cov']
+        index = None
+        if self.last_timestamp is not None and self.freq is not None:
+            index = pd.date_range(self.last_timestamp, periods=steps + 1, freq=self.freq)[1:]
+        forecast = pd.Series(mean, index=index, name='predicted_mean')
+        return (forecast, pd.Series(var, index=index, name='variance')) if return_var else forecast
+
+    def save(self, path):
+        state = {
+            'order': list(self.order),
+            'trend': self.trend,
+            'params': self.params.tolist(),
+            'state': self.state.tolist(),
+            'state_cov': self.state_cov.tolist(),
+            'nobs': self.nobs,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp is not None else None,
+            'freq': self.freq,
+        }
+        with open(path + '.tmp', 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls(**json.load(f))
+
+
+def main():
+    # Monthly refresh: filter the new months into the stored state and
+    # forecast the next 12, without reading the history again
+    forecaster = OnlineForecaster.load(state_path)
+    new = read_dataset(new_data_path, 'airline')['Passengers']
+    if forecaster.last_timestamp is not None:
+        new = new[new.index > forecaster.last_timestamp]
+    forecaster.update(new)
+    forecaster.save(state_path)
+    print(f"Added {len(new)} observations ({forecaster.nobs} in total)")
+    print(forecaster.forecast(steps=12))
+
+
+if __name__ == "__main__":
+    main()
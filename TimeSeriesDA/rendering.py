@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Headless rendering of the time_series.py plots for one or many series.
+# The four figures (series, decomposition, differenced series, forecast) are
+# built once per process on the Agg canvas and reused: each series only
+# replaces the line data, rescales the axes and saves. Many series are split
+# across a process pool, each worker keeping its own set of figures.
+# matplotlib is only imported once something is drawn, so a run with plots
+# turned off never pays for it.
+#
+# Plot data per series is a dict:
+#   name      series name, used as file name prefix and in the titles
+#             (omit it for the plain time_series.py file names)
+#   index     timestamps of the observations
+#   values, trend, seasonal, resid, diff   arrays aligned with index
+#   forecast_index, forecast               the forecast horizon
+
+FILES = {
+    'series': 'time_series_plot.png',
+    'decomposition': 'decomposition.png',
+    'differenced': 'differenced_series.png',
+    'forecast': 'forecast.png',
+}
+
+
+def date_numbers(index):
+    import matplotlib.dates as mdates
+    return mdates.date2num(np.asarray(index, dtype='datetime64[ns]'))
+
+
+def new_figure(figsize, nrows=1):
+    # Figure on its own Agg canvas, outside pyplot's global state
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    axes = [fig.add_subplot(nrows, 1, i + 1) for i in range(nrows)]
+    for ax in axes:
+        ax.xaxis_date()
+    return fig, axes
+
+
+class SeriesFigures:
+    def __init__(self, quantity='Passengers', series_title=None, dpi=100):
+        # quantity is what is plotted, as in 'Number of Passengers'
+        self.quantity = quantity
+        self.series_title = series_title or quantity
+        self.dpi = dpi
+        empty = ([], [])
+
+        self.series_fig, (ax,) = new_figure((12, 6))
+        self.series_line, = ax.plot(*empty, label=quantity)
+        ax.set_xlabel('Date')
+        ax.set_ylabel(f'Number of {quantity}')
+        ax.legend()
+        self.series_ax = ax
+
+        self.decomposition_fig, self.decomposition_axes = new_figure((12, 8), nrows=4)
+        self.decomposition_lines = []
+        for ax, label in zip(self.decomposition_axes, ['Original', 'Trend', 'Seasonality', 'Residuals']):
+            line, = ax.plot(*empty, label=label)
+            ax.legend(loc='best')
+            self.decomposition_lines.append(line)
+        self.decomposition_fig.tight_layout()
+
+        self.differenced_fig, (ax,) = new_figure((12, 6))
+        self.differenced_line, = ax.plot(*empty)
+        ax.set_title('Differenced Series')
+        self.differenced_ax = ax
+
+        self.forecast_fig, (ax,) = new_figure((12, 6))
+        self.original_line, = ax.plot(*empty, label='Original')
+        self.forecast_line, = ax.plot(*empty, label='Forecast', color='red')
+        ax.set_xlabel('Date')
+        ax.set_ylabel(f'Number of {quantity}')
+        ax.legend()
+        self.forecast_ax = ax
+
+    @staticmethod
+    def _rescale(ax):
+        ax.relim()
+        ax.autoscale_view()
+
+    def _save(self, fig, output_dir, prefix, key):
+        fig.savefig(os.path.join(output_dir, prefix + FILES[key]), dpi=self.dpi)
+
+    def render(self, data, output_dir='.'):
+        name = data.get('name', '')
+        prefix = f'{name}_' if name else ''
+        label = f'{name}: ' if name else ''
+        x = date_numbers(data['index'])
+
+        self.series_line.set_data(x, data['values'])
+        self.series_ax.set_title(f'{label}{self.series_title}')
+        self._rescale(self.series_ax)
+        self._save(self.series_fig, output_dir, prefix, 'series')
+
+        if 'trend' in data:
+            for line, ax, key in zip(self.decomposition_lines, self.decomposition_axes,
+                                     ('values', 'trend', 'seasonal', 'resid')):
+                line.set_data(x, data[key])
+                self._rescale(ax)
+            self._save(self.decomposition_fig, output_dir, prefix, 'decomposition')
+
+        if 'diff' in data:
+            diff = np.asarray(data['diff'], dtype='float64')
+            keep = ~np.isnan(diff)
+            self.differenced_line.set_data(x[keep], diff[keep])
+            self._rescale(self.differenced_ax)
+            self._save(self.differenced_fig, output_dir, prefix, 'differenced')
+
+        if 'forecast' in data:
+            self.original_line.set_data(x, data['values'])
+            self.forecast_line.set_data(date_numbers(data['forecast_index']), data['forecast'])
+            self.forecast_ax.set_title(f'{label}Forecasted {self.quantity}')
+            self._rescale(self.forecast_ax)
+            self._save(self.forecast_fig, output_dir, prefix, 'forecast')
+
+
+_figures = None
+
+
+def _render_chunk(task):
+    # One SeriesFigures per worker process, reused for every chunk it gets
+    global _figures
+    items, output_dir, titles = task
+    if _figures is None or (_figures.quantity, _figures.series_title) != titles:
+        _figures = SeriesFigures(*titles)
+    for data in items:
+        _figures.render(data, output_dir)
+    return len(items)
+
+
+def render_all(items, output_dir='.', quantity='Passengers', series_title=None, n_jobs=None, chunk_size=50,
+               enabled=True):
+    # Render every series' plots into output_dir and return how many were
+    # rendered. enabled=False is the no-plots fast path: matplotlib is not
+    # even imported. n_jobs=1 renders in this process.
+    if not enabled or not items:
+        return 0
+    os.makedirs(output_dir, exist_ok=True)
+    titles = (quantity, series_title or quantity)
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(chunks))
+    if n_jobs == 1:
+        return sum(_render_chunk((chunk, output_dir, titles)) for chunk in chunks)
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return sum(pool.map(_render_chunk, [(chunk, output_dir, titles) for chunk in chunks]))
@@ -1,88 +1,92 @@
+import os
+import sys
+
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from statsmodels.tsa.seasonal import seasonal_decompose
 from statsmodels.tsa.stattools import adfuller
 from statsmodels.tsa.arima.model import ARIMA
 import warnings
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataIO'))
+from datasets import load_dataset  # noqa: E402
+from arima_search import search_order  # noqa: E402
+from online_forecast import OnlineForecaster  # noqa: E402
+from ts_features import difference  # noqa: E402
+from decomposition import decompose  # noqa: E402
+from rendering import render_all  # noqa: E402
+
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
-# Load the dataset
-url = 'https://raw.githubusercontent.com/jbrownlee/Datasets/master/airline-passengers.csv'
-df = pd.read_csv(url, index_col='Month', parse_dates=True)
-df.index.freq = 'MS'  # Set the frequency to monthly start
-
-# Display the first few rows
-print("Dataset:")
-print(df.head())
-print()
-
-# Plot the time series
-plt.figure(figsize=(12, 6))
-plt.plot(df, label='Passengers')
-plt.title('Monthly Airline Passengers')
-plt.xlabel('Date')
-plt.ylabel('Number of Passengers')
-plt.legend()
-plt.savefig('time_series_plot.png')
-plt.close()
-
-# Decompose the time series
-decomposition = seasonal_decompose(df['Passengers'], model='multiplicative')
-trend = decomposition.trend
-seasonal = decomposition.seasonal
-residual = decomposition.resid
-
-plt.figure(figsize=(12, 8))
-plt.subplot(411)
-plt.plot(df['Passengers'], label='Original')
-plt.legend(loc='best')
-plt.subplot(412)
-plt.plot(trend, label='Trend')
-plt.legend(loc='best')
-plt.subplot(413)
-plt.plot(seasonal, label='Seasonality')
-plt.legend(loc='best')
-plt.subplot(414)
-plt.plot(residual, label='Residuals')
-plt.legend(loc='best')
-plt.tight_layout()
-plt.savefig('decomposition.png')
-plt.close()
-
-# Check for stationarity with the Augmented Dickey-Fuller test
-result = adfuller(df['Passengers'])
-print("ADF Statistic:", result[0])
-print("p-value:", result[1])
-for key, value in result[4].items():
-    print('Critical Values:')
-    print(f'   {key}, {value}')
-
-# Differencing to make the series stationary
-df['Passengers_diff'] = df['Passengers'] - df['Passengers'].shift(1)
-df['Passengers_diff'].dropna().plot(figsize=(12, 6))
-plt.title('Differenced Series')
-plt.savefig('differenced_series.png')
-plt.close()
-
-# Fit ARIMA model
-model = ARIMA(df['Passengers'], order=(1, 1, 1))
-model_fit = model.fit()
-print(model_fit.summary())
-
-# Forecast
-forecast = model_fit.forecast(steps=12)
-forecast_series = pd.Series(forecast, index=pd.date_range(start='1961-01-01', periods=12, freq='MS'))
-
-plt.figure(figsize=(12, 6))
-plt.plot(df['Passengers'], label='Original')
-plt.plot(forecast_series, label='Forecast', color='red')
-plt.title('Forecasted Passengers')
-plt.xlabel('Date')
-plt.ylabel('Number of Passengers')
-plt.legend()
-plt.savefig('forecast.png')
-plt.close()
\ No newline at end of file
+# ARIMA order. With auto_order the order is searched instead (d from the ADF
+# test, (p, q) up to max_order) and fitted parameters are cached per series, so
+# an unchanged series is not refitted on the next run.
+order = (1, 1, 1)
+auto_order = False
+max_order = 3
+
+# Filter state of the fitted model; online_forecast.py adds new months to it
+# and forecasts again without refitting
+state_path = 'arima_state.json'
+
+# Plots are drawn after the analysis, headless, into output_dir. Set plots to
+# False to skip rendering altogether.
+plots = True
+output_dir = '.'
+
+
+def main():
+    # Load the dataset from the local registry (seed it once with
+    # `python DataIO/datasets.py airline`)
+    df = load_dataset('airline', report=True)
+    df.index.freq = 'MS'  # Set the frequency to monthly start
+
+    # Display the first few rows
+    print("Dataset:")
+    print(df.head())
+    print()
+
+    # Decompose the time series
+    # (trend extrapolated at both ends, so there are no NaN edges)
+    decomposition = decompose(df['Passengers'], period=12, model='multiplicative')
+
+    # Check for stationarity with the Augmented Dickey-Fuller test
+    result = adfuller(df['Passengers'])
+    print("ADF Statistic:", result[0])
+    print("p-value:", result[1])
+    for key, value in result[4].items():
+        print('Critical Values:')
+        print(f'   {key}, {value}')
+
+    # Differencing to make the series stationary
+    df['Passengers_diff'] = difference(df['Passengers'].to_numpy())
+
+    # Fit ARIMA model
+    if auto_order:
+        search = search_order(df['Passengers'], max_p=max_order, max_q=max_order)
+        print(f"Selected ARIMA{search['order']} (AIC {search['aic']:.2f}{', cached' if search['cached'] else ''})")
+        model_fit = search['results']
+    else:
+        model = ARIMA(df['Passengers'], order=order)
+        model_fit = model.fit()
+    print(model_fit.summary())
+    OnlineForecaster.from_results(model_fit).save(state_path)
+
+    # Forecast
+    forecast = model_fit.forecast(steps=12)
+    forecast_index = pd.date_range(start=df.index[-1], periods=13, freq='MS')[1:]
+
+    # Plot the series, its decomposition, the differenced series and the forecast
+    render_all([{
+        'index': df.index,
+        'values': df['Passengers'].to_numpy(),
+        'trend': decomposition.trend.to_numpy(),
+        'seasonal': decomposition.seasonal.to_numpy(),
+        'resid': decomposition.resid.to_numpy(),
+        'diff': df['Passengers_diff'].to_numpy(),
+        'forecast_index': forecast_index,
+        'forecast': forecast.to_numpy(),
+    }], output_dir, quantity='Passengers', series_title='Monthly Airline Passengers', n_jobs=1, enabled=plots)
+
+
+if __name__ == "__main__":
+    main()
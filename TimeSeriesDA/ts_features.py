@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+from scipy.ndimage import maximum_filter1d, minimum_filter1d
+from scipy.signal import lfilter
+
+# Time-series features (lags, differences, rolling statistics, EWMA) for one
+# series or many series stacked in a long frame. Every feature is computed
+# in O(n) over the whole stacked array at once:
+#   - lags and differences are shifted slices, not shifted copies of frames
+#   - rolling mean/std are differences of cumulative sums, restarted in
+#     blocks so they keep their precision (small-window std is computed
+#     from the values in each window, O(n * window) for window <= 64)
+#   - rolling min/max use scipy.ndimage's O(n) min/max filters
+#   - EWMA is an IIR filter (scipy.signal.lfilter), run on each series from
+#     a fresh filter state (series of equal length in one 2-D call)
+# Series boundaries are handled with pos, each row's position within its own
+# series: any window or lag reaching back past pos is NaN, exactly as a
+# groupby(id) would give. Results match pandas' shift/diff/rolling/ewm,
+# including on data with NaN.
+
+
+def series_positions(ids):
+    # Position of each row within its series; ids must be grouped (sorted)
+    ids = np.asarray(ids)
+    n = len(ids)
+    if n == 0:
+        return np.zeros(0, dtype='int64')
+    starts = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]]))
+    start_of_row = np.repeat(starts, np.diff(np.concatenate([starts, [n]])))
+    return np.arange(n) - start_of_row
+
+
+def lag(values, k=1, pos=None):
+    # values shifted k steps forward (NaN where there is no earlier value)
+    values = np.asarray(values, dtype='float64')
+    out = np.full(len(values), np.nan)
+    if k < len(values):
+        out[k:] = values[:len(values) - k]
+    if pos is not None:
+        out[pos < k] = np.nan
+    return out
+
+
+def difference(values, order=1, lag_steps=1, pos=None):
+    # order-th difference at lag_steps (lag_steps=12 is a seasonal
+    # difference of monthly data), like repeated Series.diff(lag_steps)
+    out = np.asarray(values, dtype='float64')
+    for _ in range(order):
+        out = out - lag(out, lag_steps, pos)
+    return out
+
+
+# Rows per block of the blocked cumulative sums, and the widest window whose
+# std is computed directly from the values in each window
+BLOCK_ROWS = 4096
+SMALL_WINDOW = 64
+
+
+def _valid_windows(values, window, pos):
+    # True where the trailing window is complete, NaN-free and in one series
+    missing = np.isnan(values)
+    valid = np.zeros(len(values), dtype=bool)
+    if len(values) >= window:
+        c = np.concatenate([[0], np.cumsum(missing)])
+        valid[window - 1:] = (c[window:] - c[:len(values) - window + 1]) == 0
+    if pos is not None:
+        valid &= pos >= window - 1
+    return valid
+
+
+def _window_sums(values, window, pos):
+    # Sums of values and values**2 over each trailing window, from
+    # cumulative sums. A single cumulative sum over the whole array loses
+    # the variance of a window to cancellation once the running total is
+    # large (long or trending series, series at very different levels), so
+    # the rows are cut into blocks of BLOCK_ROWS, each laid out with the
+    # window - 1 rows before it, the cumulative sums restart in every block
+    # and values are centred on the mean of their series within the block.
+    # The shift is returned too (it is constant within any valid window).
+    n = len(values)
+    block = max(BLOCK_ROWS, window)
+    n_blocks = max(-(-n // block), 1)
+    rows = np.arange(n_blocks)[:, None] * block + np.arange(1 - window, block)
+    inside = (rows >= 0) & (rows < n)
+    rows = np.where(inside, rows, 0)
+    x = np.where(inside, values[rows] if n else np.nan, np.nan)
+    labels = np.zeros(n, dtype='int64') if pos is None else np.cumsum(pos == 0) - 1
+    labels = np.where(inside, labels[rows] if n else -1, -1)
+    # one group per run of a series within a block
+    starts = np.ones(x.shape, dtype=bool)
+    starts[:, 1:] = labels[:, 1:] != labels[:, :-1]
+    groups = np.cumsum(starts.ravel()) - 1
+    present = ~np.isnan(x.ravel())
+    sums = np.bincount(groups, weights=np.where(present, x.ravel(), 0.0))
+    counts = np.bincount(groups, weights=present)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, 0.0)
+    shift = means[groups].reshape(x.shape)
+    centred = np.where(np.isnan(x), 0.0, x - shift)
+
+    def window_sum(a):
+        c = np.zeros((a.shape[0], a.shape[1] + 1))
+        np.cumsum(a, axis=1, out=c[:, 1:])
+        return (c[:, window:] - c[:, :-window]).ravel()[:n]
+
+    return (window_sum(centred), window_sum(centred * centred),
+            shift[:, window - 1:].ravel()[:n])
+
+
+def rolling_mean(values, window, pos=None):
+    values = np.asarray(values, dtype='float64')
+    sums, _, shift = _window_sums(values, window, pos)
+    out = sums / window + shift
+    out[~_valid_windows(values, window, pos)] = np.nan
+    return out
+
+
+def _window_var(values, window, ddof):
+    # Two-pass variance of every trailing window, read from a strided view
+    # of the values in slices of about a million elements. O(n * window),
+    # so only used for small windows.
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    views = np.lib.stride_tricks.sliding_window_view(values, window)
+    step = max(1, 2 ** 20 // window)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for start in range(0, len(views), step):
+            stop = start + step
+            out[window - 1 + start:window - 1 + stop] = views[start:stop].var(axis=1, ddof=ddof)
+    return out
+
+
+def rolling_std(values, window, pos=None, ddof=1):
+    # Small windows are computed from the values in each window; wider ones
+    # from the blocked sums of _window_sums
+    values = np.asarray(values, dtype='float64')
+    if window <= SMALL_WINDOW:
+        var = _window_var(values, window, ddof)
+    else:
+        sums, squares, _ = _window_sums(values, window, pos)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = (squares - sums * sums / window) / (window - ddof)
+    out = np.sqrt(np.maximum(var, 0.0))
+    out[~_valid_windows(values, window, pos)] = np.nan
+    return out
+
+
+def _rolling_extreme(values, window, pos, kind):
+    values = np.asarray(values, dtype='float64')
+    missing = np.isnan(values)
+    fill = np.inf if kind == 'min' else -np.inf
+    filter1d = minimum_filter1d if kind == 'min' else maximum_filter1d
+    # origin shifts the centred filter onto the trailing window [i - window + 1, i]
+    out = filter1d(np.where(missing, fill, values), size=window, mode='nearest', origin=(window - 1) // 2)
+    out[~_valid_windows(values, window, pos)] = np.nan
+    return out
+
+
+def rolling_min(values, window, pos=None):
+    return _rolling_extreme(values, window, pos, 'min')
+
+
+def rolling_max(values, window, pos=None):
+    return _rolling_extreme(values, window, pos, 'max')
+
+
+def _filter_series(b, a, x, starts, lengths, first=None):
+    # lfilter run on every series separately, each from a fresh state. Series
+    # of equal length are stacked into one 2-D call. first (adjust=False)
+    # sets each series' initial output to its first value.
+    out = np.empty(len(x))
+    for length in np.unique(lengths):
+        rows = starts[lengths == length][:, None] + np.arange(length)
+        if first is None:
+            out[rows] = lfilter(b, a, x[rows], axis=1)
+        else:
+            zi = -a[1] * first[rows[:, 0]][:, None]
+            out[rows] = lfilter(b, a, x[rows], axis=1, zi=zi)[0]
+    return out
+
+
+def ewma(values, span, pos=None, adjust=True):
+    # Series.ewm(span=span, adjust=adjust).mean() of every series. NaN is
+    # handled as pandas does (ignore_na=False): it adds no weight, but the
+    # older values keep decaying, and the output carries the last average.
+    values = np.asarray(values, dtype='float64')
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    if pos is None:
+        pos = np.arange(len(values))
+    starts = np.flatnonzero(pos == 0)
+    lengths = np.diff(np.concatenate([starts, [len(values)]]))
+    missing = np.isnan(values)
+
+    if adjust:
+        # Weighted sum over weight sum, both as IIR filters
+        b, a = np.array([1.0]), np.array([1.0, -decay])
+        sums = _filter_series(b, a, np.where(missing, 0.0, values), starts, lengths)
+        weights = _filter_series(b, a, (~missing).astype('float64'), starts, lengths)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(weights > 0, sums / weights, np.nan)
+    if missing.any():
+        # adjust=False renormalises after every gap, which no fixed filter
+        # does; leave those series to pandas
+        labels = np.cumsum(pos == 0)
+        grouped = pd.Series(values).groupby(labels, sort=False)
+        return grouped.transform(lambda x: x.ewm(span=span, adjust=False).mean()).to_numpy()
+    # adjust=False starts each series at its first value
+    return _filter_series(np.array([alpha]), np.array([1.0, -decay]), values, starts, lengths, first=values)
+
+
+def make_features(df, value_col, id_col=None, time_col=None, lags=(1,), diffs=((1, 1),),
+                  windows=(), stats=('mean', 'std', 'min', 'max'), spans=()):
+    # Feature frame aligned with df (same index and row order). diffs holds
+    # (order, lag_steps) pairs, e.g. ((1, 1), (2, 1), (1, 12)). Rows are
+    # ordered by (id, time) once for the computation and put back after.
+    sort_keys = [c for c in (id_col, time_col) if c is not None]
+    if sort_keys:
+        order = np.lexsort([df[c].to_numpy() for c in reversed(sort_keys)])
+    else:
+        order = np.arange(len(df))
+    values = df[value_col].to_numpy(dtype='float64')[order]
+    pos = series_positions(df[id_col].to_numpy()[order]) if id_col is not None else None
+
+    features = {}
+    for k in lags:
+        features[f'{value_col}_lag{k}'] = lag(values, k, pos)
+    for diff_order, lag_steps in diffs:
+        suffix = f'diff{diff_order}' if lag_steps == 1 else f'diff{diff_order}_s{lag_steps}'
+        features[f'{value_col}_{suffix}'] = difference(values, diff_order, lag_steps, pos)
+    rolling = {'mean': rolling_mean, 'std': rolling_std, 'min': rolling_min, 'max': rolling_max}
+    for window in windows:
+        for stat in stats:
+            features[f'{value_col}_roll{window}_{stat}'] = rolling[stat](values, window, pos)
+    for span in spans:
+        features[f'{value_col}_ewm{span}'] = ewma(values, span, pos)
+
+    # Undo the sort: row order[i] of df gets feature value i
+    result = np.empty((len(df), len(features)))
+    for j, column in enumerate(features.values()):
+        result[order, j] = column
+    return pd.DataFrame(result, index=df.index, columns=list(features))
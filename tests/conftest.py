@@ -0,0 +1,15 @@
+import os
+import sys
+
+import matplotlib
+
+# The modules under test are flat scripts in per-topic folders; put every
+# folder on the path so tests can import them by name, as the scripts do.
+# Plots are drawn headless.
+matplotlib.use('Agg')
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+for folder in ('DataIO', 'DataCleaning', 'DAPreprocessing', 'TimeSeriesDA', 'EDA'):
+    path = os.path.join(ROOT, folder)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,110 @@
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.arima.model import ARIMA
+
+import arima_search
+from arima_search import evict, search_order
+
+
+@pytest.fixture
+def series():
+    # ARIMA(1, 1, 0) with drift-free noise, monthly index
+    rng = np.random.default_rng(1)
+    e = rng.normal(size=150)
+    x = np.zeros(150)
+    for t in range(1, 150):
+        x[t] = 0.6 * x[t - 1] + e[t]
+    return pd.Series(100 + np.cumsum(x), index=pd.date_range('2000-01', periods=150, freq='MS'))
+
+
+def test_matches_a_direct_statsmodels_fit(tmp_path, series):
+    search = search_order(series, max_p=2, max_q=2, n_jobs=1, cache_dir=str(tmp_path))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        direct = ARIMA(series, order=search['order'], trend='n').fit()
+    assert search['order'][1] == 1
+    assert search['aic'] == pytest.approx(direct.aic, rel=1e-6)
+    assert search['results'].aic == pytest.approx(search['aic'], rel=1e-12)
+    np.testing.assert_allclose(search['results'].forecast(12), direct.forecast(12), rtol=1e-4)
+    assert search['candidates']['aic'].iloc[0] == search['aic']
+
+
+def test_cache_is_json_and_rerun_rebuilds_the_same_results(tmp_path, series):
+    first = search_order(series, max_p=2, max_q=2, n_jobs=1, cache_dir=str(tmp_path))
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].endswith('.json')
+    with open(tmp_path / files[0]) as f:
+        cache = json.load(f)
+    assert set(cache) == {'fits', 'best'}
+    assert all(set(entry) == {'aic', 'params', 'error'} for entry in cache['fits'].values())
+
+    second = search_order(series, max_p=2, max_q=2, n_jobs=1, cache_dir=str(tmp_path))
+    assert second['cached'] and second['order'] == first['order']
+    np.testing.assert_array_equal(second['results'].params, first['results'].params)
+    np.testing.assert_array_equal(second['results'].forecast(6), first['results'].forecast(6))
+    pd.testing.assert_frame_equal(second['candidates'], first['candidates'])
+
+
+def test_new_config_reuses_cached_fits(tmp_path, series, monkeypatch):
+    search_order(series, max_p=1, max_q=1, n_jobs=1, cache_dir=str(tmp_path))
+    fitted = []
+    original = arima_search.fit_order
+    monkeypatch.setattr(arima_search, 'fit_order', lambda task: fitted.append(task[1]) or original(task))
+    search = search_order(series, max_p=2, max_q=2, n_jobs=1, cache_dir=str(tmp_path))
+    assert not search['cached']
+    assert all(max(order[0], order[2]) == 2 for order in fitted)
+
+
+def test_changed_series_is_refitted(tmp_path, series):
+    search_order(series, max_p=1, max_q=1, n_jobs=1, cache_dir=str(tmp_path))
+    changed = series.copy()
+    changed.iloc[-1] += 5
+    assert not search_order(changed, max_p=1, max_q=1, n_jobs=1, cache_dir=str(tmp_path))['cached']
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_evict_keeps_the_most_recent(tmp_path):
+    for k in range(5):
+        path = tmp_path / f'{k}.json'
+        path.write_text('{}')
+        os.utime(path, (k, k))
+    evict(str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == ['3.json', '4.json']
+
+
+def test_evict_reads_the_cache_size_at_call_time(tmp_path, monkeypatch):
+    for k in range(4):
+        path = tmp_path / f'{k}.json'
+        path.write_text('{}')
+        os.utime(path, (k, k))
+    monkeypatch.setattr(arima_search, 'ARIMA_CACHE_SIZE', 1)
+    evict(str(tmp_path))
+    assert os.listdir(tmp_path) == ['3.json']
+
+
+def test_evict_skips_files_removed_by_another_process(tmp_path, monkeypatch):
+    for k in range(4):
+        path = tmp_path / f'{k}.json'
+        path.write_text('{}')
+        os.utime(path, (k, k))
+    getmtime, remove = os.path.getmtime, os.remove
+
+    def racing_getmtime(path):
+        # Another process evicts 0.json while this one lists the directory
+        if path.endswith('0.json') and os.path.exists(path):
+            remove(path)
+        return getmtime(path)
+
+    def racing_remove(path):
+        remove(path)
+        remove(path)
+
+    monkeypatch.setattr(arima_search.os.path, 'getmtime', racing_getmtime)
+    monkeypatch.setattr(arima_search.os, 'remove', racing_remove)
+    evict(str(tmp_path), keep=2)
+    assert sorted(os.listdir(tmp_path)) == ['2.json', '3.json']
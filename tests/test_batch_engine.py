@@ -0,0 +1,94 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.seasonal import seasonal_decompose
+from statsmodels.tsa.stattools import adfuller
+
+import arima_search
+from batch_engine import run_batch, split_series, strength
+
+
+@pytest.fixture
+def long_frame():
+    rng = np.random.default_rng(0)
+    frames = []
+    for k, n in enumerate([48, 60, 10]):
+        t = np.arange(n)
+        values = 100 + k * 20 + 0.5 * t + 8 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 2, n)
+        frames.append(pd.DataFrame({
+            'series_id': f's{k}',
+            'timestamp': pd.date_range('2015-01-01', periods=n, freq='MS').strftime('%Y-%m-%d'),
+            'value': values,
+        }))
+    return pd.concat(frames).sample(frac=1, random_state=0)
+
+
+def per_series(df):
+    for series_id, group in df.groupby('series_id'):
+        group = group.sort_values('timestamp')
+        yield series_id, group['value'].to_numpy()
+
+
+def test_split_series_matches_groupby(long_frame):
+    split = list(split_series(long_frame))
+    expected = list(per_series(long_frame))
+    assert [s for s, _, _ in split] == [s for s, _ in expected]
+    for (_, timestamps, values), (_, expected_values) in zip(split, expected):
+        np.testing.assert_array_equal(values, expected_values)
+        assert (np.diff(timestamps) > np.timedelta64(0)).all()
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_results_match_statsmodels(long_frame, n_jobs):
+    results, forecasts = run_batch(long_frame, n_jobs=n_jobs, batch_size=2, progress=False)
+    results = results.set_index('series_id')
+    for series_id, values in per_series(long_frame):
+        row = results.loc[series_id]
+        with warnings.catch_warnings():
+            # Newer statsmodels warns about the tuple result
+            warnings.simplefilter('ignore', FutureWarning)
+            adf = adfuller(values)
+        assert row['adf_statistic'] == pytest.approx(adf[0])
+        assert row['adf_pvalue'] == pytest.approx(adf[1])
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            fit = ARIMA(values, order=(1, 1, 1)).fit()
+        assert row['aic'] == pytest.approx(fit.aic)
+        np.testing.assert_allclose(forecasts.loc[forecasts['series_id'] == series_id, 'forecast'],
+                                   fit.forecast(12), rtol=1e-8)
+        if len(values) >= 24:
+            reference = seasonal_decompose(values, model='additive', period=12, extrapolate_trend=11)
+            assert row['trend_strength'] == pytest.approx(strength(reference.trend, reference.resid))
+            assert row['seasonal_strength'] == pytest.approx(strength(reference.seasonal, reference.resid))
+            assert row['status'] == 'ok'
+
+
+def test_failures_are_isolated(long_frame):
+    results, forecasts = run_batch(long_frame, n_jobs=1, progress=False)
+    short = results.set_index('series_id').loc['s2']
+    assert short['status'] == 'partial'
+    assert 'decompose: needs 24 observations' in short['error']
+    assert np.isnan(short['trend_strength'])
+    assert forecasts['series_id'].nunique() == 3
+    # Forecasts continue the monthly index
+    s0 = forecasts[forecasts['series_id'] == 's0']
+    assert s0['timestamp'].iloc[0] == pd.Timestamp('2019-01-01')
+    assert (s0['step'] == np.arange(1, 13)).all()
+
+
+def test_auto_order_evicts_once_per_batch(tmp_path, monkeypatch, long_frame):
+    monkeypatch.setattr(arima_search, 'ARIMA_CACHE_DIR', str(tmp_path))
+    calls = []
+    evict = arima_search.evict
+    monkeypatch.setattr('batch_engine.evict', lambda **kwargs: calls.append(kwargs) or evict(**kwargs))
+    frame = long_frame[long_frame['series_id'] != 's2']
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        results, _ = run_batch(frame, order='auto', n_jobs=1, batch_size=1, progress=False, cache_size=1)
+    assert (results['status'] == 'ok').all()
+    assert calls == [{'keep': 1}, {'keep': 1}]
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.json')]) == 1
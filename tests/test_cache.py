@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import cache
+from cache import ChunkWriter, cache_key, cached, publish, read_frame, write_frame
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'a': rng.integers(0, 9, 100), 'b': rng.normal(size=100), 'c': rng.choice(['x', 'y'], 100)})
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'feather'])
+def test_chunk_writer_round_trip(tmp_path, frame, fmt):
+    path = str(tmp_path / f'out.{fmt}')
+    writer = ChunkWriter(path)
+    for start in range(0, len(frame), 30):
+        writer.write(frame.iloc[start:start + 30])
+    writer.close()
+    pd.testing.assert_frame_equal(read_frame(path), frame)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_chunk_writer_first_chunk_all_missing(tmp_path, fmt):
+    # A column with no values in the first chunk must not fix its type as null
+    path = str(tmp_path / f'out.{fmt}')
+    writer = ChunkWriter(path)
+    writer.write(pd.DataFrame({'a': [1.0, 2.0], 'b': pd.Series([None, None], dtype=object)}))
+    writer.write(pd.DataFrame({'a': [3.0], 'b': pd.Series(['x'], dtype=object)}))
+    writer.close()
+    b = read_frame(path)['b']
+    assert b.isna().tolist() == [True, True, False] and b.iloc[2] == 'x'
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet', 'feather'])
+def test_chunk_writer_without_chunks_writes_an_empty_file(tmp_path, fmt):
+    path = str(tmp_path / f'out.{fmt}')
+    writer = ChunkWriter(path, schema=pa.schema([('a', pa.int64()), ('b', pa.string())]))
+    writer.close()
+    result = read_frame(path)
+    assert len(result) == 0 and list(result.columns) == ['a', 'b']
+    writer = ChunkWriter(str(tmp_path / f'bare.{fmt}'))
+    writer.close()
+    assert os.path.exists(str(tmp_path / f'bare.{fmt}'))
+
+
+def test_chunk_writer_rejects_unknown_formats(tmp_path):
+    with pytest.raises(ValueError):
+        ChunkWriter(str(tmp_path / 'out.txt'))
+
+
+def test_publish_copies(tmp_path, frame):
+    source, target = str(tmp_path / 'entry.csv'), str(tmp_path / 'output.csv')
+    write_frame(frame, source)
+    publish(source, target)
+    with open(target, 'a') as f:
+        f.write('edited in place\n')
+    pd.testing.assert_frame_equal(read_frame(source), frame)
+
+
+def test_cache_key_covers_schema_and_options(tmp_path, monkeypatch, frame):
+    path = str(tmp_path / 'in.csv')
+    frame.to_csv(path, index=False)
+    base = cache_key(path, {'v': 1}, 'titanic', {'engine': 'c'})
+    assert cache_key(path, {'v': 1}, 'titanic', {'engine': 'c'}) == base
+    assert cache_key(path, {'v': 1}, 'titanic', {'engine': 'pyarrow'}) != base
+    schema = dict(cache.SCHEMAS['titanic'], dtype={'Age': 'float64'})
+    monkeypatch.setitem(cache.SCHEMAS, 'titanic', schema)
+    assert cache_key(path, {'v': 1}, 'titanic', {'engine': 'c'}) != base
+
+
+def test_cached_hit_and_miss(tmp_path, frame):
+    path = str(tmp_path / 'in.csv')
+    frame.to_csv(path, index=False)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return frame
+
+    for expected_hit in (False, True):
+        result, hit = cached(path, {'v': 1}, compute, cache_dir=str(tmp_path / 'cache'))
+        assert hit is expected_hit
+        pd.testing.assert_frame_equal(result, frame)
+    assert len(calls) == 1
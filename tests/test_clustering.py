@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score, silhouette_score
+
+from clustering import best_k, elbow_k, fit_kmeans, predict_labels, sweep_k
+
+
+@pytest.fixture
+def blobs():
+    X, labels = make_blobs(n_samples=6000, centers=4, n_features=3, cluster_std=0.8, random_state=0)
+    return pd.DataFrame(X, columns=['a', 'b', 'c']), labels
+
+
+def test_small_data_is_the_full_batch_fit(blobs):
+    df, _ = blobs
+    model = fit_kmeans(df, n_clusters=4)
+    expected = KMeans(n_clusters=4, random_state=0).fit(df.to_numpy(dtype='float32'))
+    np.testing.assert_allclose(model.cluster_centers_, expected.cluster_centers_)
+    np.testing.assert_array_equal(predict_labels(model, df, chunk_size=1000), expected.labels_)
+
+
+@pytest.mark.parametrize('streamed', [False, True])
+def test_chunked_fit_finds_the_same_clusters(blobs, streamed):
+    df, labels = blobs
+    data = (df.iloc[start:start + 500] for start in range(0, len(df), 500)) if streamed else df
+    model = fit_kmeans(data, n_clusters=4, chunk_size=500, n_passes=3)
+    predicted = predict_labels(model, df, chunk_size=700)
+    assert adjusted_rand_score(labels, predicted) > 0.98
+    reference = KMeans(n_clusters=4, random_state=0).fit(df.to_numpy(dtype='float32'))
+    distances = np.linalg.norm(model.cluster_centers_[:, None] - reference.cluster_centers_[None], axis=2)
+    assert distances.min(axis=1).max() < 0.2
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_sweep_matches_kmeans_and_silhouette(blobs, n_jobs):
+    df, _ = blobs
+    sweep = sweep_k(df, ks=range(2, 6), sample_size=None, silhouette_size=2000, n_jobs=n_jobs)
+    X = df.to_numpy(dtype='float32')
+    silhouettes = {}
+    for k in range(2, 6):
+        reference = KMeans(n_clusters=k, random_state=0).fit(X)
+        assert sweep.loc[k, 'inertia'] == pytest.approx(reference.inertia_, rel=1e-4)
+        silhouettes[k] = silhouette_score(X, reference.labels_, sample_size=2000, random_state=0)
+        assert sweep.loc[k, 'silhouette'] == pytest.approx(silhouettes[k], rel=1e-4)
+    assert best_k(sweep) == max(silhouettes, key=silhouettes.get)
+    assert best_k(sweep, 'elbow') == 3
+
+
+def test_elbow_and_criteria():
+    sweep = pd.DataFrame({'inertia': [100.0, 40.0, 12.0, 10.0, 9.0, 8.5]}, index=pd.Index(range(2, 8), name='k'))
+    assert elbow_k(sweep) == 4
+    with pytest.raises(ValueError):
+        best_k(sweep, 'gap')
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache
+import data_cleaning
+from data_cleaning import titanic_pipeline
+from ingest import read_dataset
+
+
+@pytest.fixture
+def titanic(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({
+        'PassengerId': np.arange(1, n + 1),
+        'Survived': rng.integers(0, 2, n),
+        'Pclass': rng.integers(1, 4, n),
+        'Name': [f'{rng.choice(["smith", "JONES", "Brown"])}, mr. {k}' for k in range(n)],
+        'Sex': rng.choice(['male', 'Female', 'MALE'], n),
+        'Age': rng.normal(30, 12, n).round(1),
+        'SibSp': rng.integers(0, 4, n),
+        'Parch': rng.integers(0, 3, n),
+        'Ticket': [f'T{k}' for k in rng.integers(0, 200, n)],
+        'Fare': rng.gamma(2.0, 15.0, n).round(2),
+        'Cabin': np.where(rng.random(n) < 0.8, None, 'C85'),
+        'Embarked': rng.choice(['S', 's', 'C', 'Q'], n),
+    })
+    df.loc[rng.choice(n, 50, replace=False), 'Age'] = np.nan
+    df.loc[rng.choice(n, 5, replace=False), 'Embarked'] = np.nan
+    # Exact repeats of 20 rows, spread over the file
+    df = pd.concat([df, df.sample(20, random_state=1)]).sample(frac=1, random_state=2)
+    path = tmp_path / 'titanic.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def original_script(path):
+    # Steps 1-6 of the original data_cleaning.py
+    df = pd.read_csv(path)
+    df['Age'] = df['Age'].fillna(df['Age'].median())
+    df['Embarked'] = df['Embarked'].fillna(df['Embarked'].mode()[0])
+    df = df.drop(columns=['Cabin'])
+    df = df.drop_duplicates()
+    df['Name'] = df['Name'].str.title()
+    df['Sex'] = df['Sex'].str.lower()
+    df['Embarked'] = df['Embarked'].str.upper()
+    return df
+
+
+def assert_same_frame(df, expected):
+    # Schema dtypes (float32, category) differ from read_csv's defaults
+    assert list(df.columns) == list(expected.columns)
+    assert len(df) == len(expected)
+    for column in expected.columns:
+        if pd.api.types.is_numeric_dtype(expected[column]):
+            np.testing.assert_allclose(df[column].to_numpy(dtype='float64'), expected[column], rtol=1e-6)
+        else:
+            assert df[column].astype(str).tolist() == expected[column].astype(str).tolist()
+
+
+def test_in_memory_matches_the_original_script(titanic):
+    columns = [c for c in data_cleaning.SCHEMAS['titanic']['columns'] if c != 'Cabin']
+    df = titanic_pipeline().run(read_dataset(titanic, 'titanic', columns))
+    expected = original_script(titanic)
+    assert_same_frame(df, expected)
+    assert (df.index == expected.index).all()
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64, 1000])
+def test_chunked_matches_the_original_script(tmp_path, titanic, chunk_size):
+    pipeline = titanic_pipeline()
+    output = str(tmp_path / 'cleaned.csv')
+    rows = pipeline.run_chunked(titanic, output, chunk_size, **data_cleaning.read_options('titanic', chunked=True))
+    expected = original_script(titanic)
+    assert rows == len(expected)
+    assert sum(pipeline.removed_.values()) == 20
+    assert_same_frame(pd.read_csv(output), expected.reset_index(drop=True))
+
+
+@pytest.mark.parametrize('chunk_size', [None, 50])
+def test_main_writes_and_then_reuses_the_output(tmp_path, monkeypatch, capsys, titanic, chunk_size):
+    output = str(tmp_path / 'cleaned_titanic.parquet')
+    monkeypatch.setattr(cache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(data_cleaning, 'file_path', titanic)
+    monkeypatch.setattr(data_cleaning, 'output_path', output)
+    monkeypatch.setattr(data_cleaning, 'chunk_size', chunk_size)
+
+    data_cleaning.main()
+    assert 'Duplicates removed: 20' in capsys.readouterr().out
+    assert_same_frame(pd.read_parquet(output), original_script(titanic).reset_index(drop=True))
+
+    data_cleaning.main()
+    assert 'reusing' in capsys.readouterr().out
@@ -0,0 +1,95 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import datasets
+from datasets import fetch_dataset, load_dataset, read_manifest, source_sha256
+
+AIRLINE = 'Month,Passengers\n1949-01,112\n1949-02,118\n1949-03,132\n1949-04,129\n'
+TIPS = ('total_bill,tip,sex,smoker,day,time,size\n'
+        '16.99,1.01,Female,No,Sun,Dinner,2\n10.34,1.66,Male,No,Sat,Dinner,3\n'
+        '27.2,4.0,Male,Yes,Thur,Lunch,4\n8.77,2.0,Male,No,Fri,Dinner,2\n')
+
+
+@pytest.fixture
+def sources(tmp_path, monkeypatch):
+    # Registry URLs pointing at local files, and no seaborn cache
+    paths = {}
+    for name, text in (('airline', AIRLINE), ('tips', TIPS)):
+        path = tmp_path / f'{name}.csv'
+        path.write_text(text)
+        paths[name] = str(path)
+        monkeypatch.setitem(datasets.REGISTRY, name, {**datasets.REGISTRY[name], 'url': str(path)})
+    monkeypatch.setattr(datasets, 'seaborn_cache', lambda name: None)
+    return paths
+
+
+@pytest.fixture
+def pinned(sources, monkeypatch):
+    # The local sources pinned as the expected content
+    for name, path in sources.items():
+        monkeypatch.setitem(datasets.REGISTRY, name, {**datasets.REGISTRY[name], 'sha256': source_sha256(path)})
+    return sources
+
+
+def test_fetch_then_load_matches_read_csv(tmp_path, pinned):
+    data_dir = str(tmp_path / 'data')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        fetch_dataset('airline', data_dir=data_dir)
+    df = load_dataset('airline', data_dir=data_dir)
+    expected = pd.read_csv(pinned['airline'], parse_dates=['Month'], index_col='Month')
+    np.testing.assert_array_equal(df['Passengers'].to_numpy(), expected['Passengers'].to_numpy())
+    assert (df.index == expected.index).all()
+    assert 'airline' in read_manifest(data_dir)
+    # Later loads are local: the source can disappear
+    (tmp_path / 'airline.csv').unlink()
+    pd.testing.assert_frame_equal(load_dataset('airline', data_dir=data_dir), df)
+
+
+def test_tips_categories_follow_seaborn_order(tmp_path, pinned):
+    df = load_dataset('tips', data_dir=str(tmp_path / 'data'), fetch=True)
+    expected = pd.read_csv(pinned['tips'])
+    assert list(df['day'].cat.categories) == ['Thur', 'Fri', 'Sat', 'Sun']
+    pd.testing.assert_frame_equal(df.astype({c: 'object' for c in ['sex', 'smoker', 'day', 'time']}), expected,
+                                  check_dtype=False)
+
+
+def test_offline_first_load_raises_clear_error(tmp_path, monkeypatch, sources):
+    missing = (tmp_path / 'missing.csv').as_uri()
+    monkeypatch.setitem(datasets.REGISTRY, 'iris', {'url': missing})
+    with pytest.raises(FileNotFoundError, match='could not be downloaded.*fetch_dataset'):
+        load_dataset('iris', data_dir=str(tmp_path / 'data'), fetch=True)
+
+
+def test_load_does_not_fetch_by_default(tmp_path, sources):
+    data_dir = str(tmp_path / 'data')
+    with pytest.raises(FileNotFoundError, match='not in the local registry'):
+        load_dataset('tips', data_dir=data_dir)
+    assert read_manifest(data_dir) == {}
+    with pytest.raises(KeyError):
+        load_dataset('penguins', data_dir=data_dir)
+
+
+def test_source_not_matching_the_pin_is_refused(tmp_path, pinned):
+    data_dir = str(tmp_path / 'data')
+    with open(pinned['airline'], 'a') as f:
+        f.write('1949-05,121\n')
+    with pytest.raises(ValueError, match='pinned'):
+        fetch_dataset('airline', data_dir=data_dir)
+    assert read_manifest(data_dir) == {}
+    assert len(fetch_dataset('airline', data_dir=data_dir, force=True)) == 5
+
+
+def test_unpinned_source_is_trusted_on_first_use(tmp_path, sources, monkeypatch):
+    monkeypatch.setitem(datasets.REGISTRY, 'airline', {**datasets.REGISTRY['airline'], 'sha256': None})
+    data_dir = str(tmp_path / 'data')
+    with pytest.warns(UserWarning, match='No checksum is pinned'):
+        fetch_dataset('airline', data_dir=data_dir)
+    with open(sources['airline'], 'a') as f:
+        f.write('1949-05,121\n')
+    with pytest.raises(ValueError, match='checksum'):
+        fetch_dataset('airline', data_dir=data_dir)
+    assert len(fetch_dataset('airline', data_dir=data_dir, force=True)) == 5
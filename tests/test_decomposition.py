@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.seasonal import MSTL, seasonal_decompose
+
+from decomposition import OnlineDecomposer, decompose, multi_seasonal_decompose
+
+# decompose() extrapolates the trend over `period` points, which is
+# extrapolate_trend=period - 1 in seasonal_decompose
+
+
+def seasonal_series(n=96, level=200.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return level + 1.5 * t + 25 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 3, n)
+
+
+@pytest.mark.parametrize('model', ['additive', 'multiplicative'])
+@pytest.mark.parametrize('extrapolate', [False, True])
+def test_matches_seasonal_decompose(model, extrapolate):
+    values = pd.Series(seasonal_series(), index=pd.date_range('2000-01-01', periods=96, freq='MS'))
+    result = decompose(values, 12, model, extrapolate_trend=extrapolate)
+    expected = seasonal_decompose(values, model=model, period=12, extrapolate_trend=11 if extrapolate else 0)
+    for name in ('trend', 'seasonal', 'resid'):
+        pd.testing.assert_series_equal(getattr(result, name), getattr(expected, name), check_names=False,
+                                       rtol=1e-10)
+
+
+def test_batch_matches_each_series():
+    Y = np.stack([seasonal_series(seed=k) for k in range(5)])
+    batch = decompose(Y, 12)
+    assert batch.trend.shape == Y.shape
+    for k, row in enumerate(Y):
+        expected = seasonal_decompose(row, period=12, extrapolate_trend=11)
+        np.testing.assert_allclose(batch.trend[k], expected.trend, rtol=1e-10)
+        np.testing.assert_allclose(batch.seasonal[k], expected.seasonal, rtol=1e-10, atol=1e-10)
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError, match='at least 24'):
+        decompose(np.ones(20), 12)
+    values = seasonal_series()
+    values[5] = np.nan
+    with pytest.raises(ValueError, match='missing'):
+        decompose(values, 12)
+    with pytest.raises(ValueError, match='Multiplicative'):
+        decompose(seasonal_series() - 1000, 12, 'multiplicative')
+
+
+def test_multi_seasonal_recovers_both_periods():
+    t = np.arange(24 * 7 * 6)
+    daily = 10 * np.sin(2 * np.pi * t / 24)
+    weekly = 20 * np.sin(2 * np.pi * t / 168)
+    values = 100 + 0.01 * t + daily + weekly + np.random.default_rng(0).normal(0, 1, len(t))
+    result = multi_seasonal_decompose(values, (24, 168))
+    np.testing.assert_allclose(result.trend + result.seasonal[24] + result.seasonal[168] + result.resid, values)
+    assert np.corrcoef(result.seasonal[24], daily)[0, 1] > 0.98
+    assert np.corrcoef(result.seasonal[168], weekly)[0, 1] > 0.98
+
+
+def test_multi_seasonal_stl_matches_mstl():
+    t = np.arange(24 * 7 * 3)
+    values = 50 + 5 * np.sin(2 * np.pi * t / 24) + 8 * np.sin(2 * np.pi * t / 168) + \
+        np.random.default_rng(1).normal(0, 1, len(t))
+    result = multi_seasonal_decompose(values, (24, 168), method='stl')
+    expected = MSTL(values, periods=(24, 168)).fit()
+    np.testing.assert_allclose(result.trend, expected.trend)
+    np.testing.assert_allclose(result.seasonal[24], expected.seasonal[:, 0])
+    np.testing.assert_allclose(result.seasonal[168], expected.seasonal[:, 1])
+
+
+def test_online_blocks_match_single_steps():
+    Y = np.stack([seasonal_series(120, seed=k) for k in range(3)])
+    stepwise = OnlineDecomposer(12).initialize(Y[:, :48])
+    trends = [stepwise.update(Y[:, t]).trend for t in range(48, 120)]
+    blockwise = OnlineDecomposer(12).initialize(Y[:, :48])
+    block = blockwise.update(Y[:, 48:])
+    np.testing.assert_allclose(block.trend, np.column_stack(trends))
+    np.testing.assert_allclose(blockwise.level, stepwise.level)
+    # On a clean seasonal series the online components follow the classical ones
+    classical = decompose(Y, 12)
+    np.testing.assert_allclose(block.trend[:, -24:], classical.trend[:, -24:], rtol=0.03)
+    with pytest.raises(RuntimeError):
+        OnlineDecomposer(12).update(Y[:, 0])
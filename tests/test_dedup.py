@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dedup import FingerprintStore, drop_duplicates, drop_duplicates_chunked, row_fingerprints
+from pipeline import Pipeline, dedup, normalize_case
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'a': rng.integers(0, 4, size=300),
+        'b': rng.choice(['x', 'y'], size=300),
+        'c': rng.integers(0, 3, size=300).astype('float64'),
+    })
+
+
+def test_drop_duplicates_matches_pandas(frame):
+    result, removed = drop_duplicates(frame)
+    pd.testing.assert_frame_equal(result, frame.drop_duplicates())
+    assert removed == len(frame) - len(frame.drop_duplicates())
+    result, _ = drop_duplicates(frame, subset=['a', 'b'])
+    pd.testing.assert_frame_equal(result, frame.drop_duplicates(subset=['a', 'b']))
+
+
+def test_chunked_matches_whole_frame(frame):
+    chunks = [frame.iloc[i:i + 37] for i in range(0, len(frame), 37)]
+    result = pd.concat([chunk for chunk, _ in drop_duplicates_chunked(chunks)])
+    pd.testing.assert_frame_equal(result, frame.drop_duplicates())
+
+
+def test_store_file_is_fresh_per_store(tmp_path, frame):
+    path = str(tmp_path / 'store.sqlite')
+    for _ in range(2):
+        store = FingerprintStore(path)
+        assert len(store) == 0
+        chunks = [frame.iloc[:150], frame.iloc[150:]]
+        result = pd.concat([chunk for chunk, _ in drop_duplicates_chunked(chunks, store)])
+        assert len(result) == len(frame.drop_duplicates())
+        assert len(store) == len(result)
+        store.close()
+
+
+def test_chunked_fills_the_store_it_is_given(frame):
+    store = FingerprintStore()
+    chunks = [frame.iloc[:150], frame.iloc[150:]]
+    for _ in drop_duplicates_chunked(chunks, store, subset=['a', 'b']):
+        pass
+    assert len(store) == len(frame.drop_duplicates(subset=['a', 'b']))
+    # Still open: the caller owns it
+    assert store.add(row_fingerprints(frame, ['a', 'b'])).all()
+    store.close()
+
+
+def test_persistent_store_remembers_earlier_runs(tmp_path, frame):
+    path = str(tmp_path / 'store.sqlite')
+    store = FingerprintStore(path, 'seen', persist=True)
+    store.add(pd.util.hash_pandas_object(frame, index=False).to_numpy())
+    store.close()
+    store = FingerprintStore(path, 'seen', persist=True)
+    assert store.add(pd.util.hash_pandas_object(frame, index=False).to_numpy()).all()
+    store.close()
+
+
+def pipeline_output(pipeline, csv, out, **kwargs):
+    rows = pipeline.run_chunked(str(csv), str(out), chunk_size=50, **kwargs)
+    return rows, pd.read_csv(out)
+
+
+def test_run_chunked_twice_with_the_same_store(tmp_path, frame):
+    csv, out, store = tmp_path / 'in.csv', tmp_path / 'out.csv', str(tmp_path / 'store.sqlite')
+    frame.to_csv(csv, index=False)
+    expected = len(frame.drop_duplicates())
+    pipeline = Pipeline([dedup()])
+    assert pipeline_output(pipeline, csv, out, dedup_store=store)[0] == expected
+    assert pipeline_output(pipeline, csv, out, dedup_store=store)[0] == expected
+    # Opt-in persistence: the second run sees every row as already written
+    assert pipeline_output(pipeline, csv, out, dedup_store=store, persist_dedup=True)[0] == expected
+    assert pipeline_output(pipeline, csv, out, dedup_store=store, persist_dedup=True)[0] == 0
+
+
+def test_dedup_steps_do_not_share_fingerprints(tmp_path):
+    # The second dedup step sees rows the first one already passed through;
+    # with a shared table it would drop all of them
+    df = pd.DataFrame({'name': ['a', 'A', 'b', 'a']})
+    csv, out = tmp_path / 'in.csv', tmp_path / 'out.csv'
+    df.to_csv(csv, index=False)
+    pipeline = Pipeline([dedup(), normalize_case({'name': 'lower'}), dedup()])
+    rows, result = pipeline_output(pipeline, csv, out, dedup_store=str(tmp_path / 'store.sqlite'))
+    assert rows == 2
+    assert result['name'].tolist() == ['a', 'b']
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import features
+from features import BACKENDS, bin_codes, fused_column
+
+BINS = [0, 18.5, 24.9, 29.9, 100]
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    x = rng.normal(27, 7, 5000)
+    x[rng.choice(5000, 400, replace=False)] = np.nan
+    # Bin edges, a value below the bins and one above them
+    x[:6] = [0.0, 18.5, 24.9, 100.0, -3.0, 140.0]
+    return x
+
+
+def reference(x, fill, shift, scale, outliers, bins):
+    # The unfused pandas steps of the original preprocess.py
+    series = (pd.Series(x).fillna(fill) - shift) / scale
+    z_mean, z_std, threshold, replacement = outliers
+    series = series.where(~((series - z_mean).abs() / z_std > threshold), replacement)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        log = np.log(series + 1)
+    codes = pd.cut(series, bins=bins).cat.codes.to_numpy()
+    return series.to_numpy(), log.to_numpy(), codes
+
+
+def test_bin_codes_match_pd_cut(values):
+    expected = pd.cut(values, bins=BINS).codes
+    np.testing.assert_array_equal(bin_codes(values, np.asarray(BINS, dtype='float64')), expected)
+
+
+@pytest.mark.parametrize('backend', ['numba', 'numexpr', 'numpy'])
+@pytest.mark.parametrize('scaled', [False, True])
+def test_backends_match_the_pandas_steps(values, backend, scaled):
+    if backend not in BACKENDS:
+        pytest.skip(f'{backend} is not installed')
+    shift, scale = (27.0, 7.0) if scaled else (0.0, 1.0)
+    outliers = (0.1, 0.9, 2.0, -0.5) if scaled else (27.0, 7.0, 2.5, 26.0)
+    bins = [-5, -1, 0, 1, 5] if scaled else BINS
+    out, log, codes = fused_column(values, fill=26.5, shift=shift, scale=scale, outliers=outliers, log=True,
+                                   bins=bins, backend=backend)
+    expected = reference(values, 26.5, shift, scale, outliers, bins)
+    np.testing.assert_allclose(out, expected[0], rtol=1e-12)
+    np.testing.assert_allclose(log, expected[1], rtol=1e-12)
+    np.testing.assert_array_equal(codes, expected[2])
+    assert codes.dtype == np.int8
+
+
+def test_backends_agree_without_optional_steps(values):
+    results = [fused_column(values, fill=1.0, backend=backend) for backend in BACKENDS]
+    for out, log, codes in results:
+        np.testing.assert_array_equal(out, results[-1][0])
+        assert log is None and codes is None
+
+
+def test_unknown_backend(values):
+    with pytest.raises(ValueError):
+        fused_column(values, backend='cuda')
+    assert features.BACKEND in BACKENDS
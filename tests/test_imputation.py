@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from imputation import _fill_shared, impute_columns
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'a': rng.normal(size=200),
+        'b': rng.integers(0, 5, size=200).astype('float64'),
+        'c': rng.choice(['x', 'y', None], size=200),
+    })
+    df.loc[rng.choice(200, 40, replace=False), 'a'] = np.nan
+    df.loc[rng.choice(200, 40, replace=False), 'b'] = np.nan
+    df.loc[[0, 1, 199], 'a'] = np.nan
+    return df
+
+
+def expected(series, strategy):
+    if isinstance(strategy, tuple):
+        return series.fillna(strategy[1])
+    if strategy in ('mean', 'median'):
+        return series.fillna(getattr(series, strategy)())
+    if strategy == 'mode':
+        return series.fillna(series.mode()[0])
+    if strategy == 'ffill':
+        return series.ffill()
+    if strategy == 'bfill':
+        return series.bfill()
+    return series.interpolate()
+
+
+@pytest.mark.parametrize('backend', ['thread', 'process'])
+@pytest.mark.parametrize('strategy', ['mean', 'median', 'mode', 'ffill', 'bfill', 'interpolate', ('constant', -1.0)])
+def test_float_strategies_match_pandas(frame, strategy, backend):
+    result = impute_columns(frame, {'a': strategy, 'b': strategy}, n_jobs=2, backend=backend)
+    for column in ('a', 'b'):
+        pd.testing.assert_series_equal(result[column], expected(frame[column], strategy))
+    pd.testing.assert_series_equal(result['c'], frame['c'])
+
+
+def test_drop_and_text_columns(frame):
+    result = impute_columns(frame, {'a': 'drop', 'c': 'mode'})
+    kept = frame[frame['a'].notna()]
+    pd.testing.assert_index_equal(result.index, kept.index)
+    assert result['c'].notna().all()
+
+
+def test_unknown_strategy(frame):
+    with pytest.raises(ValueError):
+        impute_columns(frame, {'a': 'nearest'})
+
+
+def test_worker_reports_the_real_error():
+    # Attaching to a missing segment used to surface as UnboundLocalError
+    with pytest.raises(FileNotFoundError):
+        _fill_shared(('no_such_segment_in', 'no_such_segment_out', (3, 1), 0, 'mean'))
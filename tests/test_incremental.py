@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from incremental import IncrementalOneHotEncoder, IncrementalStandardScaler
+
+
+def chunks_of(df, size):
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+def test_scaler_matches_sklearn():
+    rng = np.random.default_rng(0)
+    values = rng.normal(5, 3, size=(1000, 3))
+    values[:, 2] = 7.0
+    scaler = IncrementalStandardScaler()
+    for start in range(0, len(values), 128):
+        scaler.partial_fit(values[start:start + 128])
+    reference = StandardScaler().fit(values)
+    np.testing.assert_allclose(scaler.mean_, reference.mean_)
+    np.testing.assert_allclose(scaler.scale_, reference.scale_)
+    np.testing.assert_allclose(scaler.transform(values), reference.transform(values), atol=1e-12)
+
+
+@pytest.mark.parametrize('drop_first', [False, True])
+def test_one_hot_matches_get_dummies(drop_first):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'a': rng.choice(['x', 'y', 'z'], 300), 'b': rng.integers(0, 4, 300)})
+    encoder = IncrementalOneHotEncoder(['a', 'b'], drop_first=drop_first)
+    for chunk in chunks_of(df, 70):
+        encoder.partial_fit(chunk)
+    expected = pd.get_dummies(df, columns=['a', 'b'], drop_first=drop_first)
+    assert encoder.feature_names_out() == list(expected.columns)
+    np.testing.assert_array_equal(encoder.transform(df, dense=True), expected.to_numpy(dtype='uint8'))
+
+
+def test_int_and_float_chunks_share_categories():
+    # A chunk with a missing value reads the column as float: 1.0 must be
+    # the same category as 1
+    first = pd.DataFrame({'Outcome': [0, 1, 1]})
+    second = pd.DataFrame({'Outcome': [1.0, np.nan, 0.0]})
+    encoder = IncrementalOneHotEncoder(['Outcome'])
+    encoder.partial_fit(first).partial_fit(second)
+    assert encoder.learned_categories() == {'Outcome': ['0', '1']}
+    np.testing.assert_array_equal(encoder.transform(second, dense=True), [[0, 1], [0, 0], [1, 0]])
+    as_text = pd.DataFrame({'Outcome': pd.Series(['1', '0'], dtype='category')})
+    np.testing.assert_array_equal(encoder.transform(as_text, dense=True), [[0, 1], [1, 0]])
+
+
+def test_unseen_values_encode_as_zeros():
+    encoder = IncrementalOneHotEncoder(['a']).partial_fit(pd.DataFrame({'a': ['x', 'y']}))
+    np.testing.assert_array_equal(encoder.transform(pd.DataFrame({'a': ['q', None, 'y']}), dense=True),
+                                  [[0, 0], [0, 0], [0, 1]])
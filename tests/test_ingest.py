@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ingest import HAVE_PYARROW, SCHEMAS, memory_report, read_dataset, read_options
+
+
+@pytest.fixture
+def diabetes(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame({
+        'Pregnancies': rng.integers(0, 15, n),
+        'Glucose': rng.integers(60, 200, n).astype('float64'),
+        'BloodPressure': rng.integers(40, 120, n).astype('float64'),
+        'SkinThickness': rng.integers(0, 60, n).astype('float64'),
+        'Insulin': rng.integers(0, 400, n).astype('float64'),
+        'BMI': rng.normal(32, 7, n).round(1),
+        'DiabetesPedigreeFunction': rng.gamma(2.0, 0.2, n).round(3),
+        'Age': rng.integers(21, 80, n),
+        'Outcome': rng.integers(0, 2, n),
+    })
+    df.loc[rng.choice(n, 30, replace=False), 'Glucose'] = np.nan
+    path = tmp_path / 'diabetes.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def spotify(tmp_path):
+    path = tmp_path / 'spotify.csv'
+    text = ('Track,Artist,Release Date,Spotify Streams,Track Score,Explicit Track\n'
+            'A,X,4/26/2024,"390,470,936",725.4,0\n'
+            'B\xe9,Y,5/4/2024,"1,024",545.9,1\n'
+            'C,X,3/19/2024,,538.4,0\n')
+    path.write_bytes(text.encode('latin1'))
+    return str(path)
+
+
+def test_schema_read_matches_default_read(diabetes):
+    df = read_dataset(diabetes, 'diabetes')
+    expected = pd.read_csv(diabetes)
+    assert list(df.columns) == list(expected.columns)
+    for column, dtype in SCHEMAS['diabetes']['dtype'].items():
+        assert str(df[column].dtype) == dtype
+        if dtype == 'category':
+            assert df[column].astype('int64').tolist() == expected[column].tolist()
+        else:
+            # float32 holds every value to 7 significant digits
+            np.testing.assert_allclose(df[column].to_numpy(dtype='float64'), expected[column], rtol=1e-6)
+
+
+def test_column_subset_and_memory_report(diabetes, capsys):
+    df = read_dataset(diabetes, 'diabetes', columns=['Glucose', 'Outcome'], report=True)
+    assert list(df.columns) == ['Glucose', 'Outcome']
+    assert 'less than default dtypes' in capsys.readouterr().out
+    report = memory_report(read_dataset(diabetes, 'diabetes'))
+    assert report['bytes'] < report['default_bytes']
+    assert report['default_bytes'] == pd.read_csv(diabetes).memory_usage(index=True, deep=True).sum()
+
+
+def test_read_options_pick_the_engine():
+    assert read_options('diabetes', chunked=True)['engine'] == 'c'
+    assert read_options('diabetes')['engine'] == ('pyarrow' if HAVE_PYARROW else 'c')
+    # thousands= is not supported by the pyarrow engine
+    assert read_options('spotify')['engine'] == 'c'
+    # The index column is always read
+    assert read_options('airline', columns=['Passengers'])['usecols'] == ['Passengers', 'Month']
+
+
+def test_spotify_options(spotify):
+    df = read_dataset(spotify, 'spotify')
+    expected = pd.read_csv(spotify, encoding='latin1', thousands=',', parse_dates=['Release Date'])
+    assert df['Spotify Streams'].tolist()[:2] == expected['Spotify Streams'].tolist()[:2] == [390470936, 1024]
+    assert df['Release Date'].equals(expected['Release Date'])
+    assert df['Track'].tolist() == expected['Track'].tolist()
+    assert df['Artist'].dtype == 'category'
+
+
+def test_airline_index(tmp_path):
+    path = tmp_path / 'airline.csv'
+    path.write_text('Month,Passengers\n1949-01,112\n1949-02,118\n')
+    df = read_dataset(str(path), 'airline')
+    expected = pd.read_csv(path, parse_dates=['Month'], index_col='Month')
+    assert df.index.equals(expected.index)
+    assert df['Passengers'].dtype == 'int32'
+    assert df['Passengers'].tolist() == expected['Passengers'].tolist()
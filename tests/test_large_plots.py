@@ -0,0 +1,67 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from large_plots import bin_index, density_scatter, histogram_pairgrid, pair_counts, stratified_sample
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 50_000
+    df = pd.DataFrame({'x': rng.normal(size=n), 'y': rng.gamma(2.0, size=n), 'hue': rng.choice(['a', 'b', 'c'], n)})
+    df.loc[rng.choice(n, 500, replace=False), 'x'] = np.nan
+    return df
+
+
+def test_bin_index_matches_np_histogram(frame):
+    x = frame['x'].to_numpy()
+    i, edges = bin_index(x, 32, limits=(-2, 2))
+    expected, expected_edges = np.histogram(x[np.isfinite(x)], bins=32, range=(-2, 2))
+    np.testing.assert_array_equal(np.bincount(i[i >= 0], minlength=32), expected)
+    np.testing.assert_allclose(edges, expected_edges)
+
+
+def test_default_limits_are_the_robust_range(frame):
+    x = frame['x'].to_numpy()
+    _, edges = bin_index(x)
+    np.testing.assert_allclose(edges[[0, -1]], np.nanpercentile(x, [0.5, 99.5]))
+
+
+def test_outlier_does_not_empty_the_grid(frame):
+    x = np.append(frame['y'].to_numpy(), 1e6)
+    i, _ = bin_index(x, 64)
+    assert (np.bincount(i[i >= 0], minlength=64) > 0).sum() == 64
+    assert i[-1] == -1
+
+
+def test_pair_counts_match_histogram2d_per_class(frame):
+    x, y = frame['x'].to_numpy(), frame['y'].to_numpy()
+    limits = {'x': (-3, 3), 'y': (0, 8)}
+    i, _ = bin_index(x, 20, limits['x'])
+    j, _ = bin_index(y, 20, limits['y'])
+    codes, names = pd.factorize(frame['hue'], sort=True)
+    counts = pair_counts(i, j, 20, codes.astype('int32'), len(names))
+    for k, name in enumerate(names):
+        mask = (frame['hue'] == name).to_numpy() & np.isfinite(x)
+        expected, _, _ = np.histogram2d(x[mask], y[mask], bins=20, range=[limits['x'], limits['y']])
+        np.testing.assert_array_equal(counts[k], expected)
+
+
+def test_stratified_sample_keeps_class_shares(frame):
+    sample = stratified_sample(frame, 'hue', 5000)
+    shares = sample['hue'].value_counts(normalize=True).sort_index()
+    expected = frame['hue'].value_counts(normalize=True).sort_index()
+    np.testing.assert_allclose(shares, expected, atol=1e-3)
+
+
+def test_plots_take_limits(frame):
+    fig = histogram_pairgrid(frame, columns=['x', 'y'], hue='hue', bins=16, limits={'x': (-1, 1)})
+    assert len(fig.axes) == 4
+    assert fig.axes[2].get_images()[0].get_extent()[:2] == [-1, 1]
+    plt.close(fig)
+    fig, ax = plt.subplots()
+    density_scatter(ax, frame['x'], frame['y'], bins=16, x_limits=(-1, 1), y_limits=(0, 4))
+    assert ax.get_images()[0].get_extent() == [-1, 1, 0, 4]
+    plt.close(fig)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from mode_estimation import MAX_BINS, HistogramMode, ModeCounter, discrete_mode, estimate_mode, histogram_mode, \
+    kde_mode
+
+
+@pytest.fixture
+def continuous():
+    # Skewed sample with a known mode: gamma(k=3, theta=2) peaks at 4
+    return np.random.default_rng(0).gamma(3.0, 2.0, 200_000)
+
+
+def test_discrete_mode_matches_stats_mode():
+    x = np.random.default_rng(1).poisson(4, 10_000)
+    expected = stats.mode(x)
+    assert discrete_mode(x) == (expected.mode, expected.count)
+    # Ties go to the smallest value, as in stats.mode
+    assert discrete_mode([3, 1, 3, 1, 2]) == (stats.mode([3, 1, 3, 1, 2]).mode, 2)
+
+
+def test_mode_counter_matches_value_counts():
+    s = pd.Series(np.random.default_rng(2).choice(['a', 'b', 'c', None], 5000, p=[0.3, 0.4, 0.2, 0.1]))
+    counter = ModeCounter()
+    for chunk in np.array_split(s, 7):
+        counter.update(chunk)
+    counts = s.value_counts()
+    assert counter.result() == (counts.idxmax(), counts.max())
+
+
+def test_histogram_mode_matches_np_histogram(continuous):
+    x = continuous[(continuous > 0.5) & (continuous < 15)]
+    counts, edges = np.histogram(x, bins=200, range=(0.5, 15))
+    peak = np.argmax(counts)
+    width = edges[1] - edges[0]
+    assert abs(histogram_mode(x, bins=200, limits=(0.5, 15)) - (edges[peak] + width / 2)) <= width
+    assert histogram_mode(continuous) == pytest.approx(4.0, abs=0.3)
+
+
+def test_kde_mode_matches_gaussian_kde(continuous):
+    sample = continuous[:5000]
+    grid = np.linspace(0, 15, 3001)
+    expected = grid[np.argmax(stats.gaussian_kde(sample, bw_method='silverman')(grid))]
+    assert kde_mode(sample) == pytest.approx(expected, abs=0.15)
+    assert kde_mode(continuous) == pytest.approx(4.0, abs=0.1)
+
+
+@pytest.mark.parametrize('outlier', [1e6, 1e12, 1e300, -1e12])
+def test_outliers_neither_allocate_nor_move_the_mode(continuous, outlier):
+    x = np.append(continuous[:1000], outlier)
+    clean = HistogramMode().update(continuous[:1000])
+    dirty = HistogramMode().update(x)
+    assert len(dirty.counts) <= MAX_BINS
+    assert dirty.mode() == pytest.approx(clean.mode(), abs=0.05)
+    assert dirty.below + dirty.above + dirty.counts.sum() == len(x)
+    assert histogram_mode(x) == pytest.approx(histogram_mode(continuous[:1000]), abs=0.5)
+
+
+def test_small_outlier_chunk_keeps_the_resolution(continuous):
+    mode = HistogramMode()
+    for chunk in np.array_split(continuous, 10):
+        mode.update(chunk)
+    before, width = mode.mode(), mode.width
+    mode.update([1e12, -1e12])
+    assert mode.width == width
+    assert mode.mode() == pytest.approx(before)
+
+
+def test_bin_cap_merges_bins(continuous):
+    mode = HistogramMode(max_bins=64)
+    for chunk in np.array_split(continuous, 10):
+        mode.update(chunk)
+    assert len(mode.counts) <= 64
+    assert mode.counts.sum() + mode.below + mode.above == len(continuous)
+    assert mode.mode() == pytest.approx(4.0, abs=0.5)
+
+
+def test_limits(continuous):
+    mode = HistogramMode(limits=(2.0, 8.0)).update(continuous)
+    assert mode.origin <= 2.0 and mode.origin + len(mode.counts) * mode.width >= 8.0
+    assert mode.below == (continuous < mode.origin).sum()
+    # With a fixed bandwidth, cutting the tails off does not move the peak
+    assert kde_mode(continuous, bandwidth=0.3, limits=(2.0, 8.0)) == pytest.approx(kde_mode(continuous, bandwidth=0.3))
+
+
+def test_streaming_matches_whole_array(continuous):
+    mode = HistogramMode()
+    for chunk in np.array_split(continuous, 20):
+        mode.update(chunk)
+    assert mode.mode() == pytest.approx(kde_mode(continuous), abs=0.1)
+    assert estimate_mode(continuous) == kde_mode(continuous)
+    assert estimate_mode(np.array([1, 2, 2, 3])) == 2
@@ -0,0 +1,61 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.arima.model import ARIMA
+
+from online_forecast import OnlineForecaster
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    t = np.arange(144)
+    values = 100 + 2 * t + 20 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 5, 144)
+    return pd.Series(values, index=pd.date_range('1949-01-01', periods=144, freq='MS'), name='Passengers')
+
+
+def fit(series, order, trend=None):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return ARIMA(series, order=order, trend=trend).fit()
+
+
+@pytest.mark.parametrize('order, trend', [((1, 1, 1), None), ((2, 0, 1), 'c')])
+def test_updates_match_results_append(series, order, trend):
+    history, new = series.iloc[:120], series.iloc[120:]
+    results = fit(history, order, trend)
+    forecaster = OnlineForecaster.from_results(results)
+    forecaster.update(new.iloc[:5]).update(new.iloc[5:])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = results.append(new, refit=False).get_forecast(12)
+    forecast, variance = forecaster.forecast(12, return_var=True)
+    np.testing.assert_allclose(forecast, expected.predicted_mean, rtol=1e-8)
+    np.testing.assert_allclose(variance, expected.var_pred_mean, rtol=1e-6)
+    assert forecast.index.equals(expected.predicted_mean.index)
+    assert forecaster.nobs == len(series)
+
+
+def test_save_and_load(tmp_path, series):
+    forecaster = OnlineForecaster.fit(series.iloc[:130])
+    path = str(tmp_path / 'state.json')
+    forecaster.save(path)
+    loaded = OnlineForecaster.load(path).update(series.iloc[130:])
+    forecaster.update(series.iloc[130:])
+    pd.testing.assert_series_equal(loaded.forecast(6), forecaster.forecast(6))
+    assert loaded.last_timestamp == series.index[-1]
+
+
+def test_plain_arrays_advance_the_timestamp(series):
+    forecaster = OnlineForecaster.fit(series.iloc[:130])
+    forecaster.update(series.iloc[130:].to_numpy())
+    assert forecaster.last_timestamp == series.index[-1]
+    assert forecaster.forecast(1).index[0] == pd.Timestamp('1961-01-01')
+
+
+def test_time_trend_is_rejected(series):
+    with pytest.raises(ValueError):
+        OnlineForecaster.fit(series, order=(1, 0, 0), trend='t')
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib import cbook
+from scipy import stats
+
+from outlier_detection import (box_stats, detect, iqr_mask, modified_zscore_mask, outlier_cells,
+                               StreamingZScoreDetector, zscore_mask)
+from pipeline import Pipeline, zscore_filter
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        'name': [f'p{i}' for i in range(200)],
+        'Age': rng.integers(20, 60, 200).astype('float64'),
+        'Income': rng.normal(50000, 10000, 200),
+    })
+    df.loc[3, 'Income'] = 150000
+    df.loc[7, 'Age'] = 140
+    return df
+
+
+def test_zscore_matches_scipy(frame):
+    values = frame[['Age', 'Income']].to_numpy()
+    expected = np.abs(stats.zscore(values)) > 2.5
+    np.testing.assert_array_equal(zscore_mask(values, 2.5), expected)
+
+
+def test_modified_zscore_and_iqr(frame):
+    values = frame[['Age', 'Income']]
+    median = values.median()
+    mad = (values - median).abs().median()
+    expected = 0.6745 * (values - median).abs() / mad > 3.5
+    np.testing.assert_array_equal(modified_zscore_mask(values), expected.to_numpy())
+    q1, q3 = values.quantile(0.25), values.quantile(0.75)
+    expected = (values < q1 - 1.5 * (q3 - q1)) | (values > q3 + 1.5 * (q3 - q1))
+    np.testing.assert_array_equal(iqr_mask(values), expected.to_numpy())
+
+
+def test_outlier_cells_with_text_columns(frame):
+    cells = outlier_cells(frame, 'zscore', threshold=3.0)
+    assert set(zip(cells['Row'], cells['Column'])) == {(3, 'Income'), (7, 'Age')}
+    for row, column, value in cells.itertuples(index=False):
+        assert frame.loc[row, column] == value
+
+
+def test_zscore_filter_keeps_the_original_rule(frame):
+    frame.loc[11, 'Age'] = np.nan
+    numeric = frame[['Age', 'Income']]
+    z_scores = np.abs((numeric - numeric.mean()) / numeric.std(ddof=0))
+    expected = frame[(z_scores < 2.5).all(axis=1)]
+    result = Pipeline([zscore_filter(threshold=2.5)]).run(frame)
+    pd.testing.assert_frame_equal(result, expected)
+    assert 11 not in result.index
+
+
+def test_box_stats_match_matplotlib(frame):
+    for ours, theirs in zip(box_stats(frame), cbook.boxplot_stats(frame[['Age', 'Income']].to_numpy())):
+        for key in ('q1', 'med', 'q3', 'whislo', 'whishi'):
+            assert ours[key] == pytest.approx(theirs[key])
+        np.testing.assert_allclose(np.sort(ours['fliers']), np.sort(theirs['fliers']))
+
+
+def test_streaming_zscore_final_chunk_matches_batch(frame):
+    values = frame[['Age', 'Income']].to_numpy()
+    detector = StreamingZScoreDetector(threshold=2.5)
+    for start in range(0, len(values), 50):
+        last = detector.update(values[start:start + 50])
+    np.testing.assert_array_equal(last, zscore_mask(values, 2.5)[150:])
+    assert detect(frame, 'zscore').shape == (200, 2)
+
+
+def test_render_boxplot_leaves_the_backend_alone(tmp_path, frame):
+    import matplotlib
+    import matplotlib.pyplot as plt
+    from outlier_detection import render_boxplot
+
+    backend = matplotlib.get_backend()
+    figures = plt.get_fignums()
+    render_boxplot(box_stats(frame), str(tmp_path / 'box.png'), title='Box')
+    assert (tmp_path / 'box.png').stat().st_size > 0
+    assert matplotlib.get_backend() == backend
+    assert plt.get_fignums() == figures
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from pipeline import Pipeline, drop_columns, dedup, impute, normalize_case, zscore_filter
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 200
+    df = pd.DataFrame({
+        'a': rng.normal(size=n),
+        'b': rng.integers(0, 5, n).astype('float64'),
+        'c': rng.choice(['x', 'Y', 'z'], n).astype(object),
+        'd': rng.normal(size=n),
+    })
+    df.loc[rng.choice(n, 20, replace=False), 'a'] = np.nan
+    df.loc[rng.choice(n, 10, replace=False), 'b'] = np.nan
+    df.loc[rng.choice(n, 10, replace=False), 'c'] = None
+    df.loc[3, 'd'] = 12.0
+    return pd.concat([df, df.iloc[:15]])
+
+
+def test_fused_column_steps_match_pandas(frame):
+    pipeline = Pipeline([
+        impute({'a': 'median', 'b': 'mean', 'c': 'mode', 'd': ('constant', 0.0)}),
+        drop_columns(['d']),
+        normalize_case({'c': 'upper'}),
+    ])
+    df = pipeline.run(frame)
+    expected = frame.assign(
+        a=frame['a'].fillna(frame['a'].median()),
+        b=frame['b'].fillna(frame['b'].mean()),
+        c=frame['c'].fillna(frame['c'].mode()[0]).str.upper(),
+    ).drop(columns=['d'])
+    pd.testing.assert_frame_equal(df, expected)
+    assert pipeline.statistics_[(0, 'a')] == frame['a'].median()
+    assert pipeline.statistics_[(0, 'd')] == 0.0
+
+
+def test_row_steps_match_pandas(frame):
+    pipeline = Pipeline([dedup(), zscore_filter(['a', 'd'], threshold=3.0)])
+    df = pipeline.run(frame)
+    unique = frame.drop_duplicates()
+    z = np.abs(stats.zscore(unique[['a', 'd']], nan_policy='omit'))
+    expected = unique[(z < 3.0).all(axis=1)]
+    pd.testing.assert_frame_equal(df, expected)
+    assert pipeline.removed_ == {0: 15, 1: len(unique) - len(expected)}
+
+
+def test_dedup_subset(frame):
+    df = Pipeline([dedup(subset=['c'])]).run(frame)
+    pd.testing.assert_frame_equal(df, frame.drop_duplicates(subset=['c']))
+
+
+def test_statistics_override_the_frame(frame):
+    df = Pipeline([impute({'a': 'median'})]).run(frame, statistics={(0, 'a'): -99.0})
+    assert (df['a'][frame['a'].isna()] == -99.0).all()
+
+
+def test_missing_column_raises(frame):
+    with pytest.raises(KeyError):
+        Pipeline([impute({'missing': 'median'})]).run(frame)
+    # Dropping a column that was never read is fine
+    pd.testing.assert_frame_equal(Pipeline([drop_columns(['missing'])]).run(frame), frame)
+
+
+def test_invalid_steps(tmp_path, frame):
+    with pytest.raises(ValueError):
+        normalize_case({'c': 'sentence'})
+    with pytest.raises(ValueError):
+        Pipeline([impute({'a': 'trimmed'})]).run(frame)
+    path = tmp_path / 'frame.csv'
+    frame.to_csv(path, index=False)
+    with pytest.raises(ValueError, match='chunked'):
+        Pipeline([zscore_filter()]).run_chunked(str(path), str(tmp_path / 'out.csv'), 50)
+
+
+def test_chunked_matches_in_memory(tmp_path, frame):
+    path = tmp_path / 'frame.csv'
+    frame.to_csv(path, index=False)
+    steps = [impute({'a': 'median', 'c': 'mode'}), dedup(), normalize_case({'c': 'lower'})]
+    expected = Pipeline(steps).run(pd.read_csv(path)).reset_index(drop=True)
+    pipeline = Pipeline(steps)
+    rows = pipeline.run_chunked(str(path), str(tmp_path / 'out.csv'), 37)
+    assert rows == len(expected)
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / 'out.csv'), expected, check_dtype=False)
+
+
+@pytest.mark.parametrize('fmt', ['parquet', 'feather'])
+def test_chunked_column_missing_in_the_first_chunk(tmp_path, fmt):
+    path = tmp_path / 'frame.csv'
+    pd.DataFrame({'a': range(100), 'b': [None] * 50 + ['x'] * 50}).to_csv(path, index=False)
+    output = str(tmp_path / f'out.{fmt}')
+    Pipeline([dedup()]).run_chunked(str(path), output, 20)
+    result = pd.read_parquet(output) if fmt == 'parquet' else pd.read_feather(output)
+    assert result['b'].isna().sum() == 50 and (result['b'].iloc[50:] == 'x').all()
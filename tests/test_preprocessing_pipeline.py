@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+from sklearn.preprocessing import StandardScaler
+
+from preprocessing_pipeline import DiabetesPreprocessor
+
+
+@pytest.fixture
+def diabetes():
+    rng = np.random.default_rng(0)
+    n = 800
+    df = pd.DataFrame({
+        'Pregnancies': rng.integers(0, 15, n),
+        'Glucose': rng.normal(120, 30, n).round(0),
+        'BloodPressure': rng.normal(70, 12, n).round(0),
+        'SkinThickness': rng.integers(0, 60, n),
+        'Insulin': rng.integers(0, 400, n),
+        'BMI': rng.normal(32, 6, n).round(1),
+        'DiabetesPedigreeFunction': rng.gamma(2.0, 0.2, n).round(3),
+        'Age': rng.integers(21, 80, n),
+        'Outcome': rng.integers(0, 2, n),
+    })
+    df.loc[rng.choice(n, 40, replace=False), 'Glucose'] = np.nan
+    df.loc[rng.choice(n, 40, replace=False), 'BMI'] = np.nan
+    df.loc[rng.choice(n, 4, replace=False), 'BMI'] = 75.0
+    return df
+
+
+def original_script(df):
+    # Steps 2-6 and 8 of the original preprocess.py
+    df = df.copy()
+    df['BMI'] = df['BMI'].fillna(df['BMI'].median())
+    df['Glucose'] = df['Glucose'].fillna(df['Glucose'].mean())
+    df = pd.get_dummies(df, columns=['Outcome'], drop_first=True)
+    columns = ['Pregnancies', 'Glucose', 'BloodPressure']
+    df[columns] = StandardScaler().fit_transform(df[columns])
+    outliers = np.abs(stats.zscore(df['BMI'])) > 3
+    df.loc[outliers, 'BMI'] = df['BMI'].median()
+    df['BMI_category'] = pd.cut(df['BMI'], bins=[0, 18.5, 24.9, 29.9, 100],
+                                labels=['Underweight', 'Normal', 'Overweight', 'Obese'])
+    with np.errstate(invalid='ignore'):
+        # Scaled values below -1 have no log, as in the original
+        df['Glucose_log'] = np.log(df['Glucose'] + 1)
+    return df
+
+
+def assert_same_frame(df, expected):
+    assert list(df.columns) == list(expected.columns)
+    for column in expected.columns:
+        if column == 'BMI_category':
+            assert df[column].equals(expected[column])
+        else:
+            np.testing.assert_allclose(df[column].to_numpy(dtype='float64'),
+                                       expected[column].to_numpy(dtype='float64'), rtol=1e-10, atol=1e-12)
+
+
+def test_fit_transform_matches_the_original_script(diabetes):
+    expected = original_script(diabetes)
+    assert expected['BMI'].max() < 75.0
+    assert_same_frame(DiabetesPreprocessor().fit_transform(diabetes), expected)
+
+
+def test_fit_chunks_matches_fit(diabetes):
+    whole = DiabetesPreprocessor().fit(diabetes)
+    chunked = DiabetesPreprocessor().fit_chunks(diabetes.iloc[start:start + 97] for start in range(0, 800, 97))
+    for key in ('fill', 'scale'):
+        for column, value in whole.params_[key].items():
+            np.testing.assert_allclose(chunked.params_[key][column], value, rtol=1e-12)
+    assert chunked.params_['bmi_replacement'] == whole.params_['bmi_replacement']
+    assert chunked.params_['categories'] == whole.params_['categories']
+
+
+def test_transform_reuses_the_fitted_parameters(tmp_path, diabetes):
+    train, test = diabetes.iloc[:600], diabetes.iloc[600:]
+    preprocessor = DiabetesPreprocessor().fit(train)
+    path = str(tmp_path / 'params.json')
+    preprocessor.save(path)
+    loaded = DiabetesPreprocessor.load(path)
+    out = loaded.transform(test)
+    pd.testing.assert_frame_equal(out, preprocessor.transform(test))
+
+    # New rows are filled and scaled with the training statistics
+    glucose = test['Glucose'].fillna(train['Glucose'].mean())
+    scaler = StandardScaler().fit(train[['Glucose']].fillna(train['Glucose'].mean()))
+    np.testing.assert_allclose(out['Glucose'], scaler.transform(glucose.to_frame()).ravel(), rtol=1e-10,
+                               atol=1e-12)
+
+
+def test_unfitted_preprocessor_raises(diabetes):
+    with pytest.raises(RuntimeError):
+        DiabetesPreprocessor().transform(diabetes)
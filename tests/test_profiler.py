@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from profiler import column_profile, profile
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 10_001
+    df = pd.DataFrame({
+        'normal': rng.normal(5, 2, n),
+        'skewed': rng.gamma(2.0, 3.0, n),
+        'ints': rng.integers(0, 100, n),
+        'nullable': pd.array(rng.integers(0, 10, n), dtype='Int64'),
+        'text': rng.choice(['a', 'b'], n),
+    })
+    df.loc[rng.choice(n, 500, replace=False), 'normal'] = np.nan
+    df.loc[rng.choice(n, 50, replace=False), 'nullable'] = pd.NA
+    return df
+
+
+@pytest.mark.parametrize('n_jobs', [1, 4])
+def test_matches_numpy_and_scipy(frame, n_jobs):
+    quantiles = (0.05, 0.25, 0.5, 0.75, 0.95)
+    result = profile(frame, quantiles=quantiles, n_jobs=n_jobs)
+    assert list(result.index) == ['normal', 'skewed', 'ints', 'nullable']
+    for column in result.index:
+        values = frame[column].to_numpy(dtype='float64', na_value=np.nan)
+        x = values[~np.isnan(values)]
+        row = result.loc[column]
+        assert row['count'] == len(x)
+        assert row['missing'] == frame[column].isna().sum()
+        assert row['mean'] == pytest.approx(np.mean(x), rel=1e-12)
+        assert row['variance'] == pytest.approx(np.var(x), rel=1e-12)
+        assert row['std'] == pytest.approx(np.std(x), rel=1e-12)
+        assert (row['min'], row['max']) == (x.min(), x.max())
+        assert row['skew'] == pytest.approx(stats.skew(x), rel=1e-9)
+        assert row['kurtosis'] == pytest.approx(stats.kurtosis(x), rel=1e-9)
+        expected = np.percentile(x, [q * 100 for q in quantiles])
+        np.testing.assert_allclose(row[['q5', 'q25', 'median', 'q75', 'q95']].to_numpy(dtype='float64'), expected,
+                                   rtol=1e-12)
+        assert row['iqr'] == pytest.approx(expected[3] - expected[1])
+        assert row['quartile_deviation'] == pytest.approx(row['iqr'] / 2)
+
+
+def test_describe_agrees(frame):
+    result = profile(frame, columns=['skewed'])
+    described = frame['skewed'].describe()
+    assert result.loc['skewed', 'median'] == pytest.approx(described['50%'])
+    assert result.loc['skewed', 'range'] == pytest.approx(described['max'] - described['min'])
+
+
+def test_edge_columns():
+    empty = column_profile(np.full(5, np.nan))
+    assert empty['count'] == 0 and empty['missing'] == 5 and np.isnan(empty['mean'])
+    constant = column_profile(np.full(5, 3.0))
+    assert constant['variance'] == 0 and np.isnan(constant['skew'])
+    single = column_profile(np.array([7.0]))
+    assert single['median'] == single['min'] == single['max'] == 7.0
+    # Input arrays are not reordered by the selection
+    values = np.array([3.0, 1.0, 2.0])
+    column_profile(values)
+    np.testing.assert_array_equal(values, [3.0, 1.0, 2.0])
+
+
+def test_quartile_columns_only_with_both_quartiles(frame):
+    result = profile(frame, quantiles=(0.5,))
+    assert 'iqr' not in result.columns and 'median' in result.columns
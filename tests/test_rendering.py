@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+import rendering
+from rendering import FILES, SeriesFigures, render_all
+
+
+def plot_data(name, seed):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('1949-01-01', periods=60, freq='MS')
+    values = 100 + np.cumsum(rng.normal(1, 5, 60))
+    return {
+        'name': name,
+        'index': index,
+        'values': values,
+        'trend': values - 1,
+        'seasonal': np.sin(np.arange(60)),
+        'resid': rng.normal(size=60),
+        'diff': np.concatenate([[np.nan], np.diff(values)]),
+        'forecast_index': pd.date_range('1954-01-01', periods=12, freq='MS'),
+        'forecast': values[-1] + np.arange(12.0),
+    }
+
+
+def test_reused_figures_draw_what_fresh_figures_draw(tmp_path):
+    reused, fresh = tmp_path / 'reused', tmp_path / 'fresh'
+    reused.mkdir()
+    fresh.mkdir()
+    figures = SeriesFigures()
+    figures.render(plot_data('a', 0), str(reused))
+    figures.render(plot_data('b', 1), str(reused))
+    SeriesFigures().render(plot_data('b', 1), str(fresh))
+    for file_name in FILES.values():
+        np.testing.assert_array_equal(mpimg.imread(reused / f'b_{file_name}'), mpimg.imread(fresh / f'b_{file_name}'))
+
+
+def test_line_data_matches_the_input(tmp_path):
+    figures = SeriesFigures()
+    data = plot_data('c', 2)
+    figures.render(data, str(tmp_path))
+    x = rendering.date_numbers(data['index'])
+    np.testing.assert_array_equal(figures.series_line.get_xdata(), x)
+    np.testing.assert_array_equal(figures.series_line.get_ydata(), data['values'])
+    # The differenced plot skips the leading NaN
+    np.testing.assert_array_equal(figures.differenced_line.get_ydata(), data['diff'][1:])
+    np.testing.assert_array_equal(figures.forecast_line.get_ydata(), data['forecast'])
+    assert figures.forecast_ax.get_title() == 'c: Forecasted Passengers'
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_render_all_writes_every_file(tmp_path, n_jobs):
+    items = [plot_data(f's{k}', k) for k in range(5)]
+    figures_before = plt.get_fignums()
+    assert render_all(items, str(tmp_path), n_jobs=n_jobs, chunk_size=2) == 5
+    assert sorted(os.listdir(tmp_path)) == sorted(f's{k}_{f}' for k in range(5) for f in FILES.values())
+    # pyplot's figure registry is left alone
+    assert plt.get_fignums() == figures_before
+
+
+def test_plain_names_and_partial_data(tmp_path):
+    data = {key: plot_data('', 3)[key] for key in ('index', 'values')}
+    render_all([data], str(tmp_path), n_jobs=1)
+    assert os.listdir(tmp_path) == [FILES['series']]
+
+
+def test_disabled_does_not_import_matplotlib(tmp_path):
+    code = ('import sys; from rendering import render_all; '
+            'assert render_all([{}], enabled=False) == 0; '
+            'assert "matplotlib" not in sys.modules')
+    folder = os.path.dirname(rendering.__file__)
+    subprocess.run([sys.executable, '-c', code], cwd=folder, check=True)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+
+from splitting import feature_columns, hash_split_mask, split_chunks, train_test_indices
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 5000
+    return pd.DataFrame({
+        'id': np.arange(n),
+        'x': rng.normal(size=n),
+        'Outcome': rng.choice([0, 1], n, p=[0.65, 0.35]),
+    })
+
+
+@pytest.mark.parametrize('stratify', [False, True])
+def test_indices_match_train_test_split(frame, stratify):
+    X = frame[feature_columns(frame, 'Outcome')]
+    y = frame['Outcome']
+    labels = y if stratify else None
+    X_train, X_test, _, _ = train_test_split(X, y, test_size=0.2, random_state=42, stratify=labels)
+    train_idx, test_idx = train_test_indices(len(frame), 0.2, 42, labels)
+    np.testing.assert_array_equal(train_idx, np.sort(X_train.index.to_numpy()))
+    np.testing.assert_array_equal(test_idx, np.sort(X_test.index.to_numpy()))
+    assert list(X.columns) == list(frame.drop('Outcome', axis=1).columns)
+
+
+def test_hash_split_is_stable_across_chunkings(frame):
+    whole = hash_split_mask(frame, 0.2, seed=7)
+    chunked = np.concatenate([mask for _, mask in split_chunks(
+        (frame.iloc[start:start + 333] for start in range(0, len(frame), 333)), 0.2, seed=7)])
+    np.testing.assert_array_equal(whole, chunked)
+    # Same rows in another order get the same assignment
+    shuffled = frame.sample(frac=1, random_state=0)
+    np.testing.assert_array_equal(hash_split_mask(shuffled, 0.2, seed=7), whole[shuffled.index.to_numpy()])
+    assert not np.array_equal(hash_split_mask(frame, 0.2, seed=8), whole)
+
+
+def test_hash_split_keeps_proportions(frame):
+    mask = hash_split_mask(frame, 0.2, key_columns=['id'])
+    assert mask.mean() == pytest.approx(0.2, abs=0.02)
+    by_class = pd.Series(mask).groupby(frame['Outcome']).mean()
+    np.testing.assert_allclose(by_class, 0.2, atol=0.03)
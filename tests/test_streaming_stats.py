@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_stats import HeavyHitters, QuantileSketch, RunningMoments, ValueCounts, fill_values, \
+    partitioned_fill_values
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    df = pd.DataFrame({
+        'age': rng.normal(30, 12, n).round(0),
+        'glucose': rng.gamma(9.0, 13.0, n),
+        'port': rng.choice(['S', 'C', 'Q'], n, p=[0.7, 0.2, 0.1]),
+    })
+    df.loc[rng.choice(n, 2000, replace=False), 'age'] = np.nan
+    df.loc[rng.choice(n, 50, replace=False), 'port'] = None
+    return df
+
+
+def chunks(df, size=1234):
+    return (df.iloc[start:start + size] for start in range(0, len(df), size))
+
+
+def test_running_moments_match_numpy(frame):
+    values = frame[['age', 'glucose']].to_numpy()
+    moments = RunningMoments()
+    for start in range(0, len(values), 999):
+        moments.update(values[start:start + 999])
+    np.testing.assert_allclose(moments.mean, np.nanmean(values, axis=0), rtol=1e-12)
+    np.testing.assert_allclose(moments.variance(ddof=1), np.nanvar(values, axis=0, ddof=1), rtol=1e-10)
+    merged = RunningMoments().update(values[:500]).merge(RunningMoments().update(values[500:]))
+    np.testing.assert_allclose(merged.std(), np.nanstd(values, axis=0), rtol=1e-10)
+    assert np.isnan(RunningMoments().mean)
+
+
+def test_value_counts_match_series(frame):
+    counts = ValueCounts()
+    for chunk in chunks(frame):
+        counts.update(chunk['age'])
+    assert counts.median() == frame['age'].median()
+    assert counts.mode() == frame['age'].mode()[0]
+    assert counts.mean() == pytest.approx(frame['age'].mean(), rel=1e-12)
+    # Even count: the median averages the two middle values
+    assert ValueCounts().update([1.0, 2.0, 3.0, 10.0]).median() == pd.Series([1.0, 2.0, 3.0, 10.0]).median()
+
+
+def test_fill_values_match_pandas(frame):
+    values = fill_values(chunks(frame), {'age': 'median', 'glucose': 'mean', 'port': 'mode'})
+    assert values['age'] == frame['age'].median()
+    assert values['glucose'] == pytest.approx(frame['glucose'].mean(), rel=1e-12)
+    assert values['port'] == frame['port'].mode()[0]
+
+
+def test_sketches_are_close(frame):
+    sketch = QuantileSketch(k=200, seed=0)
+    for chunk in chunks(frame):
+        sketch.update(chunk['glucose'].to_numpy())
+    for q in (0.1, 0.5, 0.9):
+        rank = (frame['glucose'] <= sketch.quantile(q)).mean()
+        assert abs(rank - q) < 0.02
+    hitters = HeavyHitters(capacity=2)
+    for chunk in chunks(frame):
+        hitters.update(chunk['port'])
+    assert hitters.mode() == frame['port'].mode()[0]
+    assert not hitters.exact
+    assert HeavyHitters(capacity=10).update(frame['port']).exact
+
+
+def test_partitioned_fill_values_match_pandas(tmp_path, frame):
+    paths = []
+    for k, start in enumerate(range(0, len(frame), 7000)):
+        part = frame.iloc[start:start + 7000]
+        path = tmp_path / f'part{k}.csv'
+        part.to_csv(path, index=False)
+        paths.append(str(path))
+    values = partitioned_fill_values(paths, {'age': 'median', 'port': 'mode'}, chunk_size=2000, n_jobs=2)
+    assert values == {'age': frame['age'].median(), 'port': frame['port'].mode()[0]}
+
+
+def test_partitioned_fill_values_with_caller_usecols(tmp_path, frame):
+    path = tmp_path / 'part.csv'
+    frame.to_csv(path, index=False)
+    strategies = {'age': 'median'}
+    expected = {'age': frame['age'].median()}
+    # As read_options() passes them: the index column listed in usecols
+    options = {'usecols': ['port'], 'index_col': 'port'}
+    assert partitioned_fill_values([str(path)], strategies, n_jobs=1, **options) == expected
+    assert partitioned_fill_values([str(path)], strategies, n_jobs=1, usecols='port'.__eq__) == expected
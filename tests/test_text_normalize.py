@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from text_normalize import normalize_case
+
+
+@pytest.fixture
+def low():
+    return pd.Series(['male', 'MALE', 'Female', None, 'female'] * 40, name='Sex')
+
+
+@pytest.fixture
+def high():
+    return pd.Series([f'mr. name {i}' for i in range(99)] + [np.nan], name='Name')
+
+
+@pytest.mark.parametrize('case', ['title', 'lower', 'upper'])
+def test_matches_str_methods(low, high, case):
+    for series in (low, high):
+        result = normalize_case(series, case)
+        expected = getattr(series.str, case)()
+        assert result.dtype == series.dtype
+        pd.testing.assert_series_equal(result, expected)
+
+
+def test_converted_dtypes(low, high):
+    result = normalize_case(low, 'lower', convert_dtype=True)
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert sorted(result.cat.categories) == ['female', 'male']
+    assert result.isna().sum() == low.isna().sum()
+    result = normalize_case(high, 'upper', convert_dtype=True)
+    assert str(result.dtype) == 'string'
+    assert result.astype(object).where(result.notna(), None).tolist()[:2] == ['MR. NAME 0', 'MR. NAME 1']
+
+
+def test_categorical_input_merges_categories():
+    series = pd.Series(['a', 'A', 'b', None], dtype='category')
+    result = normalize_case(series, 'lower')
+    assert isinstance(result.dtype, pd.CategoricalDtype)
+    assert result.tolist()[:3] == ['a', 'a', 'b'] and pd.isna(result.iloc[3])
+
+
+@pytest.mark.parametrize('values', [[None, None], [np.nan] * 3, []])
+def test_all_missing(values):
+    series = pd.Series(values, dtype=object)
+    result = normalize_case(series, 'title')
+    assert len(result) == len(series) and result.isna().all()
+    assert len(normalize_case(series, 'title', convert_dtype=True)) == len(series)
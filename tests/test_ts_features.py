@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ts_features import difference, ewma, lag, make_features, rolling_max, rolling_mean, rolling_min, \
+    rolling_std, series_positions
+
+
+@pytest.fixture
+def long_frame():
+    # Stacked series of unequal length, shuffled, with NaN at the start, in
+    # the middle, in long gaps and one series that is all NaN
+    rng = np.random.default_rng(0)
+    lengths = [40, 40, 25, 1, 60, 5]
+    ids = np.repeat(np.arange(len(lengths)), lengths)
+    time = np.concatenate([np.arange(n) for n in lengths])
+    values = rng.normal(size=len(ids)) * 10 + ids * 1000
+    values[rng.choice(len(ids), 30, replace=False)] = np.nan
+    values[:3] = np.nan
+    values[100:112] = np.nan
+    values[ids == 5] = np.nan
+    df = pd.DataFrame({'id': ids, 'time': time, 'value': values})
+    return df.sample(frac=1, random_state=0)
+
+
+def grouped(df):
+    return df.sort_values(['id', 'time']).groupby('id')['value']
+
+
+@pytest.mark.parametrize('adjust', [True, False])
+@pytest.mark.parametrize('span', [3, 12])
+def test_ewma_matches_groupby_ewm_with_nan(long_frame, span, adjust):
+    df = long_frame.sort_values(['id', 'time'])
+    pos = series_positions(df['id'].to_numpy())
+    expected = grouped(df).transform(lambda x: x.ewm(span=span, adjust=adjust).mean())
+    np.testing.assert_allclose(ewma(df['value'].to_numpy(), span, pos, adjust), expected.to_numpy(), rtol=1e-10)
+
+
+@pytest.mark.parametrize('adjust', [True, False])
+def test_ewma_does_not_leak_between_series(adjust):
+    # A huge series followed by a small one: the second must not see the first
+    values = np.concatenate([np.full(5, 1e12), [1.0, 2.0, 3.0]])
+    pos = np.array([0, 1, 2, 3, 4, 0, 1, 2])
+    expected = pd.Series([1.0, 2.0, 3.0]).ewm(span=4, adjust=adjust).mean().to_numpy()
+    np.testing.assert_allclose(ewma(values, 4, pos, adjust)[5:], expected, rtol=1e-15)
+
+
+def test_single_series_without_pos():
+    values = np.random.default_rng(1).normal(size=200)
+    values[[0, 50, 51]] = np.nan
+    for adjust in (True, False):
+        expected = pd.Series(values).ewm(span=7, adjust=adjust).mean().to_numpy()
+        np.testing.assert_allclose(ewma(values, 7, adjust=adjust), expected, rtol=1e-10)
+
+
+def test_lags_diffs_and_rolling_match_groupby(long_frame):
+    df = long_frame.sort_values(['id', 'time'])
+    values = df['value'].to_numpy()
+    pos = series_positions(df['id'].to_numpy())
+    g = grouped(df)
+    np.testing.assert_array_equal(lag(values, 2, pos), g.shift(2).to_numpy())
+    np.testing.assert_allclose(difference(values, 1, 1, pos), g.diff(1).to_numpy())
+    np.testing.assert_allclose(difference(values, 1, 12, pos), g.diff(12).to_numpy())
+    np.testing.assert_allclose(difference(values, 2, 1, pos), g.transform(lambda x: x.diff().diff()).to_numpy())
+    for window in (3, 7):
+        rolled = g.rolling(window)
+        np.testing.assert_allclose(rolling_mean(values, window, pos), rolled.mean().to_numpy(), rtol=1e-9)
+        np.testing.assert_allclose(rolling_std(values, window, pos), rolled.std().to_numpy(), rtol=1e-6, atol=1e-9)
+        np.testing.assert_array_equal(rolling_min(values, window, pos), rolled.min().to_numpy())
+        np.testing.assert_array_equal(rolling_max(values, window, pos), rolled.max().to_numpy())
+
+
+@pytest.mark.parametrize('window', [12, 100])
+def test_rolling_std_keeps_its_precision_on_stacked_level_shifts(window):
+    # Many stacked series with a level shift of 1e4 halfway and noise of sd
+    # 1, spanning several blocks: a single global cumulative sum lost the
+    # within-window variance to cancellation here
+    rng = np.random.default_rng(2)
+    n_series, length = 60, 300
+    ids = np.repeat(np.arange(n_series), length)
+    step = np.where(np.tile(np.arange(length), n_series) >= length // 2, 1e4, 0.0)
+    values = rng.normal(size=len(ids)) + step + ids * 1e3
+    pos = series_positions(ids)
+    expected = pd.Series(values).groupby(ids).rolling(window).std().to_numpy()
+    np.testing.assert_allclose(rolling_std(values, window, pos), expected, rtol=1e-5)
+
+
+@pytest.mark.parametrize('window', [12, 100])
+def test_rolling_std_on_a_long_trending_series(window):
+    values = np.arange(200_000) * 1.0 + np.random.default_rng(3).normal(size=200_000) * 8
+    windows = np.lib.stride_tricks.sliding_window_view(values, window)
+    expected = np.sqrt(((windows - windows.mean(axis=1, keepdims=True)) ** 2).sum(axis=1) / (window - 1))
+    out = rolling_std(values, window)
+    assert np.isnan(out[:window - 1]).all()
+    np.testing.assert_allclose(out[window - 1:], expected, rtol=1e-7)
+
+
+def test_make_features_keeps_the_row_order(long_frame):
+    features = make_features(long_frame, 'value', id_col='id', time_col='time', lags=(1,), diffs=((1, 1),),
+                             windows=(4,), stats=('mean',), spans=(6,))
+    assert features.index.equals(long_frame.index)
+    ordered = long_frame.sort_values(['id', 'time'])
+    expected = ordered.groupby('id')['value'].transform(lambda x: x.ewm(span=6).mean()).reindex(long_frame.index)
+    np.testing.assert_allclose(features['value_ewm6'], expected, rtol=1e-10)
+    expected_lag = ordered.groupby('id')['value'].shift(1).reindex(long_frame.index)
+    np.testing.assert_array_equal(features['value_lag1'], expected_lag)